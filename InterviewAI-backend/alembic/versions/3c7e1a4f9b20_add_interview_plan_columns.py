@@ -0,0 +1,32 @@
+"""add interview mode and question plan
+
+Revision ID: 3c7e1a4f9b20
+Revises: 2d9a2ce6d833
+Create Date: 2026-10-19 10:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1a4f9b20'
+down_revision: Union[str, Sequence[str], None] = '2d9a2ce6d833'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('interviews', sa.Column('mode', sa.String(), nullable=False, server_default='adaptive'))
+    op.add_column('interviews', sa.Column('question_plan', sa.Text(), nullable=True))
+    op.add_column('interviews', sa.Column('plan_cursor', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('interviews', 'plan_cursor')
+    op.drop_column('interviews', 'question_plan')
+    op.drop_column('interviews', 'mode')
@@ -0,0 +1,43 @@
+"""add question bank
+
+Revision ID: 5e1b7c9d2a44
+Revises: 8f2d6b0c41e7
+Create Date: 2026-10-19 11:40:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b7c9d2a44'
+down_revision: Union[str, Sequence[str], None] = '8f2d6b0c41e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'question_bank',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('qtype', sa.String(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('extra', sa.Text(), nullable=True),
+        sa.Column('features', sa.Text(), nullable=False),
+        sa.Column('minhash', sa.LargeBinary(), nullable=False),
+        sa.Column('times_served', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_question_bank_id'), 'question_bank', ['id'], unique=False)
+    op.create_index(op.f('ix_question_bank_qtype'), 'question_bank', ['qtype'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_question_bank_qtype'), table_name='question_bank')
+    op.drop_index(op.f('ix_question_bank_id'), table_name='question_bank')
+    op.drop_table('question_bank')
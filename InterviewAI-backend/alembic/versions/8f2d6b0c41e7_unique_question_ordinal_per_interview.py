@@ -0,0 +1,45 @@
+"""unique question ordinal per interview
+
+Revision ID: 8f2d6b0c41e7
+Revises: 3c7e1a4f9b20
+Create Date: 2026-10-19 11:02:17.540981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d6b0c41e7'
+down_revision: Union[str, Sequence[str], None] = '3c7e1a4f9b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent /next calls left duplicate ordinals. Renumber the questions of
+    # the affected interviews 1..n in (ordinal, id) order, i.e.
+    # ROW_NUMBER() OVER (PARTITION BY interview_id ORDER BY ordinal, id), so
+    # every question and its answers are kept. (Correlated COUNT rather than a
+    # window function in UPDATE ... FROM, which older SQLite lacks.)
+    op.execute(
+        """
+        UPDATE questions SET ordinal = (
+            SELECT COUNT(*) FROM questions q2
+            WHERE q2.interview_id = questions.interview_id
+              AND (q2.ordinal < questions.ordinal OR (q2.ordinal = questions.ordinal AND q2.id <= questions.id))
+        )
+        WHERE interview_id IN (
+            SELECT interview_id FROM questions GROUP BY interview_id, ordinal HAVING COUNT(*) > 1
+        )
+        """
+    )
+    op.create_unique_constraint('uq_questions_interview_ordinal', 'questions', ['interview_id', 'ordinal'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_questions_interview_ordinal', 'questions', type_='unique')
@@ -0,0 +1,28 @@
+"""index transcripts by interview
+
+Revision ID: b4a8e2f1c730
+Revises: 5e1b7c9d2a44
+Create Date: 2026-10-19 11:52:41.306127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4a8e2f1c730'
+down_revision: Union[str, Sequence[str], None] = '5e1b7c9d2a44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transcripts_interview_created', 'transcripts', ['interview_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transcripts_interview_created', table_name='transcripts')
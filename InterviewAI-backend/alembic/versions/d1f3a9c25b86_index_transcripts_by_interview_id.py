@@ -0,0 +1,30 @@
+"""index transcripts by interview and id
+
+Revision ID: d1f3a9c25b86
+Revises: b4a8e2f1c730
+Create Date: 2026-10-19 14:08:13.552904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f3a9c25b86'
+down_revision: Union[str, Sequence[str], None] = 'b4a8e2f1c730'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_transcripts_interview_created', table_name='transcripts')
+    op.create_index('ix_transcripts_interview_id_id', 'transcripts', ['interview_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transcripts_interview_id_id', table_name='transcripts')
+    op.create_index('ix_transcripts_interview_created', 'transcripts', ['interview_id', 'created_at'], unique=False)
@@ -0,0 +1,28 @@
+"""add interview ended_at
+
+Revision ID: e7c2b5d8a913
+Revises: d1f3a9c25b86
+Create Date: 2026-10-19 14:41:27.093518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2b5d8a913'
+down_revision: Union[str, Sequence[str], None] = 'd1f3a9c25b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('interviews', sa.Column('ended_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('interviews', 'ended_at')
@@ -14,6 +14,16 @@ else:
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+def create_tables():
+    """
+    Create missing tables from the models (dev/SQLite convenience). Deployed
+    databases are managed by Alembic (`alembic upgrade head`), run once per
+    release rather than by every worker on boot.
+    """
+    import app.models  # noqa: F401  registers every model on Base.metadata
+    Base.metadata.create_all(bind=engine)
+
+
 # Dependency for DB session
 def get_db():
     db = SessionLocal()
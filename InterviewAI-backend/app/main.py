@@ -1,15 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, resume, job, interview, history, feedback, code
+from app.routers import auth, resume, job, interview, history, feedback, code, match, transcript
 from app.config import settings
-from app.database import Base, engine
+from app.database import create_tables
+from app.services.expiry_sweeper import expiry_sweeper
+from app.services.llm_metrics import render_metrics
+from app.services.transcript_buffer import transcript_buffer
+from app.utils.compression import CompressionMiddleware
+from app.utils.responses import OrjsonResponse
 
 
-app = FastAPI(title="Interview Practice Bot MVP")
-
-
-# Create tables automatically
-Base.metadata.create_all(bind=engine)
+# Default(...) keeps FastAPI's Pydantic-to-bytes fast path for endpoints with a
+# response_model; orjson only serializes the ones that return plain dicts.
+app = FastAPI(title="Interview Practice Bot MVP", default_response_class=Default(OrjsonResponse))
 
 
 # Allow frontend
@@ -26,6 +30,12 @@ app.add_middleware(
     allow_methods=["*"],  # GET, POST, PUT, DELETE...
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+    compresslevel=settings.RESPONSE_GZIP_LEVEL,
+    brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+)
 
 # Register routes
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
@@ -35,8 +45,37 @@ app.include_router(interview.router, prefix="/interview", tags=["Interview"])
 app.include_router(history.router, prefix="/history", tags=["History"])
 app.include_router(feedback.router, prefix="/feedbacks", tags=["feedbacks"])
 app.include_router(code.router, prefix="/code", tags=["Code"])
+app.include_router(match.router, prefix="/match", tags=["Match"])
+app.include_router(transcript.router, prefix="/interview", tags=["Transcript"])
+
+
+@app.on_event("startup")
+def prepare_database():
+    # Explicit step, not an import side effect: importing the app (workers, tools,
+    # tests) touches no DB. Turn off where Alembic owns the schema.
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        create_tables()
+
+
+@app.on_event("startup")
+def start_background_workers():
+    expiry_sweeper.start()
+    transcript_buffer.start()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    expiry_sweeper.stop()
+    transcript_buffer.stop()  # flushes whatever is still buffered
 
 
 @app.get("/")
 def root():
     return {"message": "Interview Practice Bot API is running 🚀"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (LLM latency, tokens, fallbacks, parse failures)."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
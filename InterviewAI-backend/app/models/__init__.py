@@ -1,4 +1,5 @@
 # app/models/__init__.py
 from .content import Resume, JobDescription, Interview, Question, Answer, Transcript
 from .user import User
-from .feedback import Feedback
\ No newline at end of file
+from .feedback import Feedback
+from .question_bank import BankQuestion
@@ -1,6 +1,6 @@
 # app/models/content.py
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Boolean, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.database import Base
 
@@ -8,7 +8,7 @@ class Resume(Base):
     __tablename__ = "resumes"
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
-    raw_text = Column(Text, nullable=True)
+    raw_text = deferred(Column(Text, nullable=True))  # large: load with undefer() where it is used
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, nullable=True)
 
@@ -18,7 +18,7 @@ class JobDescription(Base):
     __tablename__ = "job_descriptions"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=True)
-    jd_text = Column(Text, nullable=False)
+    jd_text = deferred(Column(Text, nullable=False))  # large: load with undefer() where it is used
     uploaded_at = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, nullable=True)
 
@@ -32,9 +32,13 @@ class Interview(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime, nullable=True)
     expires_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)  # when /end or the expiry check closed it
     is_active = Column(Boolean, default=False)
     user_id = Column(Integer, nullable=True)
     total_score = Column(Integer, nullable=True)  # aggregate
+    mode = Column(String, nullable=False, default="adaptive")  # 'adaptive' or 'planned'
+    question_plan = deferred(Column(Text, nullable=True))  # planned mode: JSON list of questions from one LLM call
+    plan_cursor = Column(Integer, nullable=False, default=0)  # planned mode: next plan item to serve
 
     resume = relationship("Resume", back_populates="interviews")
     job_description = relationship("JobDescription", back_populates="interviews")
@@ -44,6 +48,10 @@ class Interview(Base):
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # one question per step: concurrent /next calls can't create duplicate ordinals
+        UniqueConstraint("interview_id", "ordinal", name="uq_questions_interview_ordinal"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
     qtype = Column(String, nullable=False)  # 'resume', 'behavioral', 'coding'
@@ -63,9 +71,9 @@ class Answer(Base):
     user_text = Column(Text, nullable=True)  # user's textual answer or transcribed speech
     created_at = Column(DateTime, default=datetime.utcnow)
     is_coding = Column(Boolean, default=False)
-    code = Column(Text, nullable=True)  # code submitted
+    code = deferred(Column(Text, nullable=True), group="code")  # code submitted
     code_language = Column(String, nullable=True)
-    code_result = Column(Text, nullable=True)  # test output or evaluation summary
+    code_result = deferred(Column(Text, nullable=True), group="code")  # test output or evaluation summary
     score = Column(Integer, nullable=True)  # per-answer score
 
     interview = relationship("Interview", back_populates="answers")
@@ -74,6 +82,10 @@ class Answer(Base):
 
 class Transcript(Base):
     __tablename__ = "transcripts"
+    __table_args__ = (
+        # playback reads one interview's segments in id order (the resume cursor is after_id)
+        Index("ix_transcripts_interview_id_id", "interview_id", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"))
     speaker = Column(String, nullable=False)  # 'interviewer' or 'candidate'
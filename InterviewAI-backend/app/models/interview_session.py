@@ -1,14 +1,129 @@
 # app/models/interview_session.py
-from typing import List, Dict, Optional
+import json
+from typing import List, Dict, Optional, Union
 from datetime import datetime
 
+
+def extra_references(extra: Union[str, Dict, None]) -> Optional[List[str]]:
+    """Reference answers stored in Question.extra (JSON text or dict), if any."""
+    if isinstance(extra, str):
+        try:
+            extra = json.loads(extra)
+        except ValueError:
+            return None
+    references = extra.get("references") if isinstance(extra, dict) else None
+    return list(references) if isinstance(references, list) else None
+
+
+def with_references(extra: Union[str, Dict, None], references: Optional[List[str]]) -> Union[str, Dict, None]:
+    """`extra` with the model's reference answers folded in (as extra["references"])."""
+    references = [r for r in (references or []) if isinstance(r, str) and r.strip()]
+    if not references:
+        return extra
+    if isinstance(extra, str):
+        try:
+            extra = json.loads(extra)
+        except ValueError:
+            extra = {"notes": extra}
+    if not isinstance(extra, dict):
+        extra = {} if extra is None else {"notes": extra}
+    return {**extra, "references": references}
+
+
 class InterviewSession:
-    def __init__(self, session_id: str, user_id: str, resume: str, jd: str):
-        self.session_id = session_id
+    """
+    Hot, in-memory state of an active interview.
+
+    Holds everything a turn needs (resume/JD text, current step, Q&A history)
+    so /next and /answer don't re-read large text columns from the DB.
+    The DB stays the source of truth; see services/session_store.py.
+    """
+    __slots__ = (
+        "interview_id", "user_id", "resume", "jd", "history",
+        "started_at", "expires_at", "current_index", "is_active",
+        "mode", "plan", "plan_cursor",
+    )
+
+    def __init__(
+        self,
+        interview_id: int,
+        user_id: Optional[int],
+        resume: str,
+        jd: str,
+        history: Optional[List[Dict]] = None,
+        started_at: Optional[datetime] = None,
+        expires_at: Optional[datetime] = None,
+        current_index: int = 0,
+        is_active: bool = True,
+        mode: str = "adaptive",
+        plan: Optional[List[Dict]] = None,
+        plan_cursor: int = 0,
+    ):
+        self.interview_id = interview_id
         self.user_id = user_id
         self.resume = resume
         self.jd = jd
-        self.history: List[Dict] = []  # [{q:..., a:..., qtype:...}]
-        self.started_at = datetime.utcnow()
-        self.current_index = 0
-        self.is_active = True
+        self.history: List[Dict] = history or []  # [{question_id:..., q:..., qtype:..., a:..., score:..., follow_up:..., references:...}]
+        self.started_at = started_at or datetime.utcnow()
+        self.expires_at = expires_at
+        self.current_index = current_index  # number of questions asked so far
+        self.is_active = is_active
+        self.mode = mode
+        self.plan: List[Dict] = plan or []  # planned mode: [{qtype:..., text:..., extra:...}]
+        self.plan_cursor = plan_cursor
+
+    @property
+    def is_expired(self) -> bool:
+        return bool(self.expires_at and datetime.utcnow() > self.expires_at)
+
+    def add_question(self, question_id: int, text: str, qtype: str, follow_up: bool = False,
+                     references: Optional[List[str]] = None):
+        self.history.append({
+            "question_id": question_id, "q": text, "qtype": qtype,
+            "a": "", "score": None, "follow_up": follow_up, "references": references,
+        })
+        self.current_index += 1
+
+    def find_question(self, question_id: int) -> Optional[Dict]:
+        return next((h for h in self.history if h["question_id"] == question_id), None)
+
+    def record_answer(self, question_id: int, answer_text: str, score: Optional[int] = None):
+        entry = self.find_question(question_id)
+        if entry is not None:
+            entry["a"] = answer_text
+            entry["score"] = score
+
+    def to_dict(self) -> Dict:
+        return {
+            "interview_id": self.interview_id,
+            "user_id": self.user_id,
+            "resume": self.resume,
+            "jd": self.jd,
+            "history": self.history,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "current_index": self.current_index,
+            "is_active": self.is_active,
+            "mode": self.mode,
+            "plan": self.plan,
+            "plan_cursor": self.plan_cursor,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "InterviewSession":
+        started_at = data.get("started_at")
+        expires_at = data.get("expires_at")
+        return cls(
+            interview_id=data["interview_id"],
+            user_id=data.get("user_id"),
+            resume=data.get("resume") or "",
+            jd=data.get("jd") or "",
+            history=data.get("history") or [],
+            started_at=datetime.fromisoformat(started_at) if started_at else None,
+            expires_at=datetime.fromisoformat(expires_at) if expires_at else None,
+            current_index=data.get("current_index", 0),
+            is_active=data.get("is_active", True),
+            mode=data.get("mode", "adaptive"),
+            plan=data.get("plan") or [],
+            plan_cursor=data.get("plan_cursor", 0),
+        )
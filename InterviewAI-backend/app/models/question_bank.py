@@ -0,0 +1,17 @@
+# app/models/question_bank.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary
+from datetime import datetime
+from app.database import Base
+
+class BankQuestion(Base):
+    """Reusable generated question (see services/question_bank.py)."""
+    __tablename__ = "question_bank"
+
+    id = Column(Integer, primary_key=True, index=True)
+    qtype = Column(String, nullable=False, index=True)
+    text = Column(Text, nullable=False)
+    extra = Column(Text, nullable=True)
+    features = Column(Text, nullable=False, default="")  # space-separated JD/profile terms it was generated for
+    minhash = Column(LargeBinary, nullable=False)  # uint32 MinHash signature of the text
+    times_served = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
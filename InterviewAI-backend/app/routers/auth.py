@@ -8,12 +8,9 @@ from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.utils.jwt_handler import create_access_token, create_refresh_token, decode_token
 from app.utils.auth import get_current_user
+from app.utils.google_certs import google_cert_cache
 from app.config import settings
 
-# For Google token verification
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-
 router = APIRouter()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -73,10 +70,8 @@ def google_login(id_token_str: str = Body(..., embed=True), db: Session = Depend
     Returns JWT tokens.
     """
     try:
-        # Verify token and get payload
-        request = google_requests.Request()
-        # This will validate signature and expiry using Google's public keys
-        id_info = id_token.verify_oauth2_token(id_token_str, request, audience=None)
+        # Validates signature, expiry and issuer against cached Google public keys
+        id_info = google_cert_cache.verify(id_token_str, audience=None)
         # id_info contains: email, email_verified, name, sub (google user id), picture, etc.
     except Exception as e:
         raise HTTPException(status_code=401, detail="Invalid Google ID token")
@@ -1,16 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, load_only, selectinload
 from app.database import get_db
-from app.models.content import Interview
+from app.models.content import Interview, Answer, Question
 from app.schemas.content import InterviewSummary, InterviewDetail
 from app.services.history_and_scores import calculate_scores, generate_feedback
+from app.services.read_cache import CachedBody, read_cache
+from app.utils.responses import conditional_response
 
 router = APIRouter()
 
+# calculate_scores walks interview.answers -> answer.question.qtype: load both in two
+# SELECTs per query instead of one per interview and answer, and skip the text columns.
+_SCORES_LOADED = selectinload(Interview.answers).options(
+    load_only(Answer.question_id, Answer.score),
+    selectinload(Answer.question).load_only(Question.qtype),
+)
+
 
 @router.get("/user/{user_id}", response_model=list[InterviewSummary])
 def list_history(user_id: int, db: Session = Depends(get_db)):
-    interviews = db.query(Interview).filter(Interview.user_id == user_id).order_by(Interview.created_at.desc()).all()
+    interviews = (
+        db.query(Interview).options(_SCORES_LOADED).filter(Interview.user_id == user_id)
+        .order_by(Interview.created_at.desc())
+        .all()
+    )
     results = []
     for i in interviews:
         scores = calculate_scores(i, db)
@@ -21,7 +34,7 @@ def list_history(user_id: int, db: Session = Depends(get_db)):
 @router.get("/user/{user_id}/last", response_model=InterviewSummary)
 def last_interview(user_id: int, db: Session = Depends(get_db)):
     interview = (
-        db.query(Interview).filter(Interview.user_id == user_id)
+        db.query(Interview).options(_SCORES_LOADED).filter(Interview.user_id == user_id)
         .order_by(Interview.created_at.desc())
         .first()
     )
@@ -32,10 +45,21 @@ def last_interview(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{interview_id}", response_model=InterviewDetail)
-def interview_detail(interview_id: int, db: Session = Depends(get_db)):
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
-    scores = calculate_scores(interview, db)
-    feedback = generate_feedback(interview, scores)
-    return InterviewDetail(id=interview.id, created_at=interview.created_at, feedback=feedback, **scores)
+def interview_detail(interview_id: int, request: Request, db: Session = Depends(get_db)):
+    key = ("history", interview_id)
+    entry = read_cache.get(key)
+    if entry is None:
+        interview = db.query(Interview).options(_SCORES_LOADED).filter(Interview.id == interview_id).first()
+        if not interview:
+            raise HTTPException(status_code=404, detail="Interview not found")
+        scores = calculate_scores(interview, db)
+        feedback = generate_feedback(interview, scores)
+        detail = InterviewDetail(id=interview.id, created_at=interview.created_at, feedback=feedback, **scores)
+        # Ended and finalized (total_score is stored last): the detail won't change any more,
+        # so it is cached and dated by the end of the interview
+        if not interview.is_active and interview.total_score is not None:
+            entry = read_cache.put(key, CachedBody.build(detail.model_dump_json().encode(),
+                                                         interview.ended_at or interview.expires_at))
+        else:
+            entry = CachedBody.build(detail.model_dump_json().encode())
+    return conditional_response(request, entry)
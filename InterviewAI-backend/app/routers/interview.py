@@ -1,38 +1,71 @@
 # app/routers/interview.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime, timedelta
-from app.database import get_db
+from typing import Optional
+from app.config import settings
+from app.database import get_db, SessionLocal
 from app.models.content import Interview, Question, Resume, JobDescription, Transcript, Answer
 from app.schemas.content import InterviewCreate, InterviewOut, AnswerCreate, AnswerOut
-from app.services.scoring import score_text_answer, aggregate_scores, score_with_llm
+from app.services.scoring import score_text_answer, aggregate_scores, score_with_llm, score_answer
 from app.services.code_runner import run_python_code, run_code
 from app.services.question_generator import generate_next_question
+from app.services.history_and_scores import finalize_interview_scores
+from app.services.interview_jobs import cancel_jobs, jobs_for
+from app.services.session_store import get_session, get_current_session, save_session, evict_sessions
+from app.services.transcript_buffer import transcript_buffer
+from app.models.interview_session import InterviewSession, extra_references
+from app.services.interview_plan import PLANNED, ADAPTIVE, prepare_interview, ensure_plan, next_planned_question
+from app.services.templated_questions import templated_question
+from app.services.llm_metrics import record_templated
 from app.utils.deactivate_interview import deactivate_if_expired
+from app.utils.single_flight import SingleFlight
+from app.utils.responses import FIELDS_QUERY, model_response, wants_field
+import asyncio
 import uuid
 import json
 
 router = APIRouter()
 
+# Concurrent /next calls for one interview (retries, double-clicks) share one generation
+_next_question_flight = SingleFlight()
+
+
+def _extra_json(extra):
+    """Question.extra is stored as text; plan items already carry JSON strings."""
+    if not extra:
+        return None
+    return extra if isinstance(extra, str) else json.dumps(extra)
+
+
 # ------------------------------
 # Interview Flow
 # ------------------------------
 
 @router.post("/start", response_model=InterviewOut)
-def start_interview(payload: InterviewCreate, db: Session = Depends(get_db)):
+def start_interview(payload: InterviewCreate, fields: Optional[str] = FIELDS_QUERY, db: Session = Depends(get_db)):
     """Start an interview session."""
+    mode = payload.mode or ADAPTIVE
+    if mode not in (ADAPTIVE, PLANNED):
+        raise HTTPException(status_code=400, detail=f"Unknown interview mode '{mode}'")
+
     # Fetch resume & JD text if available
     resume_text = ""
     jd_text = ""
 
     if payload.resume_id:
-        r = db.query(Resume).filter(Resume.id == payload.resume_id).first()
+        r = db.query(Resume).options(undefer(Resume.raw_text)).filter(Resume.id == payload.resume_id).first()
         if not r:
             raise HTTPException(status_code=404, detail="Resume not found")
         resume_text = r.raw_text or ""
 
     if payload.job_description_id:
-        j = db.query(JobDescription).filter(JobDescription.id == payload.job_description_id).first()
+        j = (db.query(JobDescription).options(undefer(JobDescription.jd_text))
+             .filter(JobDescription.id == payload.job_description_id).first())
         if not j:
             raise HTTPException(status_code=404, detail="Job description not found")
         jd_text = j.jd_text or ""
@@ -45,90 +78,136 @@ def start_interview(payload: InterviewCreate, db: Session = Depends(get_db)):
         created_at=datetime.utcnow(),
         started_at=datetime.utcnow(),
         is_active=True,
+        mode=mode,
     )
     timer = payload.timer_minutes or 30
     interview.expires_at = datetime.utcnow() + timedelta(minutes=timer)
 
-    db.add(interview)
-    db.commit()
-    db.refresh(interview)
-
-    # Generate the very first introduction question
-    q = generate_next_question(interview, resume_text, jd_text, step=0)
+    # The intro question is templated from the resume/JD skills (no LLM call), and interview
+    # and question go in one commit, so /start returns right away; the question plan (planned
+    # mode) or cache warm-up runs in the background while the candidate answers.
+    q = templated_question("intro", resume_text, jd_text)
+    record_templated("intro", "start")
     question = Question(
-        interview_id=interview.id,
         qtype=q.get("qtype", "intro"),
         text=q.get("text", "Tell me about yourself."),
-        extra=json.dumps(q.get("extra")) if q.get("extra") else None,
+        extra=_extra_json(q.get("extra")),
         ordinal=1
     )
-    db.add(question)
+    interview.questions.append(question)
+    db.add(interview)
     db.commit()
     db.refresh(interview)
 
-    return interview
+    session = InterviewSession(
+        interview_id=interview.id,
+        user_id=interview.user_id,
+        resume=resume_text,
+        jd=jd_text,
+        started_at=interview.started_at,
+        expires_at=interview.expires_at,
+        mode=mode,
+    )
+    session.add_question(question.id, question.text, question.qtype, references=extra_references(q.get("extra")))
+    save_session(session)
+    prepare_interview(interview.id, mode, resume_text, jd_text)
+
+    return model_response(InterviewOut, interview, fields)
 
 
 @router.get("/{interview_id}", response_model=InterviewOut)
-def get_interview(interview_id: int, db: Session = Depends(get_db)):
+def get_interview(interview_id: int, fields: Optional[str] = FIELDS_QUERY, db: Session = Depends(get_db)):
     """Fetch interview details (timer, status, etc.)"""
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    query = db.query(Interview).filter(Interview.id == interview_id)
+    if wants_field(InterviewOut, fields, "questions"):
+        query = query.options(selectinload(Interview.questions))
+    interview = query.first()
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
     deactivate_if_expired(interview, db)
 
+    return model_response(InterviewOut, interview, fields)
+
+
+def _active_interview(interview_id: int, db: Session) -> Interview:
+    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    if interview:
+        deactivate_if_expired(interview, db)
+    if not interview or not interview.is_active:
+        raise HTTPException(status_code=404, detail="Interview not found or inactive")
     return interview
 
 
 @router.post("/{interview_id}/next")
 def next_question(interview_id: int, db: Session = Depends(get_db)):
     """Generate and store the next question for an interview."""
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview or not interview.is_active:
-        raise HTTPException(status_code=404, detail="Interview not found or inactive")
+    interview = _active_interview(interview_id, db)
+    return _next_question_flight.do(interview_id, lambda: _generate_and_store_next(interview, db))
 
-    # Count how many questions already asked
-    existing_qs = db.query(Question).filter(Question.interview_id == interview_id).all()
-    step = len(existing_qs)
 
-    # Get resume + JD text for context
-    resume_text = ""
-    jd_text = ""
-    if interview.resume_id:
-        r = db.query(Resume).filter(Resume.id == interview.resume_id).first()
-        resume_text = r.raw_text or ""
-    if interview.job_description_id:
-        j = db.query(JobDescription).filter(JobDescription.id == interview.job_description_id).first()
-        jd_text = j.jd_text or ""
+def _generate_and_store_next(interview: Interview, db: Session) -> dict:
+    # Step, resume + JD text and Q&A history come from the hot session (reloaded if
+    # another worker served /next since this one cached it)
+    session = get_current_session(interview, db)
+    step = session.current_index
 
     # Generate next question
-    q = generate_next_question(interview, resume_text, jd_text, step=step)
+    consumed_plan_item = False
+    with jobs_for(interview.id):  # LLM attempts still queued when the interview ends are cancelled
+        if session.mode == PLANNED and ensure_plan(session, db):
+            q, consumed_plan_item = next_planned_question(session)
+        else:
+            q = generate_next_question(interview, session.resume, session.jd, step=step, history=session.history)
 
     question = Question(
         interview_id=interview.id,
         qtype=q.get("qtype", "general"),
         text=q.get("text", ""),
-        extra=json.dumps(q.get("extra")) if q.get("extra") else None,
+        extra=_extra_json(q.get("extra")),
         ordinal=step + 1
     )
     db.add(question)
-    db.commit()
+    if consumed_plan_item:
+        interview.plan_cursor = session.plan_cursor + 1
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker stored this ordinal first (unique interview_id + ordinal):
+        # serve its question instead of creating a duplicate.
+        db.rollback()
+        evict_sessions([interview.id])
+        latest = get_session(interview, db).history[-1]
+        return {"question_id": latest["question_id"], "text": latest["q"], "qtype": latest["qtype"]}
+
+    if consumed_plan_item:
+        session.plan_cursor += 1
+    session.add_question(question.id, question.text, question.qtype,
+                         follow_up=isinstance(q.get("extra"), dict) and "follow_up_to" in q["extra"],
+                         references=extra_references(q.get("extra")))
+    save_session(session)
     return {"question_id": question.id, "text": question.text, "qtype": question.qtype}
 
 
 @router.post("/{interview_id}/answer", response_model=AnswerOut)
 def answer_question(interview_id: int, payload: AnswerCreate, db: Session = Depends(get_db)):
     """Store an answer for the latest question."""
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview or not interview.is_active:
-        raise HTTPException(status_code=404, detail="Interview not found or inactive")
+    interview = _active_interview(interview_id, db)
+    return _store_answer(interview, payload, db)
 
-    # Ensure the question exists
-    question = db.query(Question).filter(Question.id == payload.question_id,
-                                         Question.interview_id == interview_id).first()
+
+def _store_answer(interview: Interview, payload: AnswerCreate, db: Session) -> Answer:
+    interview_id = interview.id
+    # Ensure the question exists (hot session first, DB otherwise)
+    session = get_session(interview, db)
+    question = session.find_question(payload.question_id)
     if not question:
-        raise HTTPException(status_code=404, detail="Question not found for this interview")
+        row = db.query(Question.id, Question.text, Question.qtype, Question.extra).filter(
+            Question.id == payload.question_id, Question.interview_id == interview_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Question not found for this interview")
+        question = {"question_id": row.id, "q": row.text, "qtype": row.qtype,
+                    "references": extra_references(row.extra)}
 
     ans = Answer(
         interview_id=interview_id,
@@ -147,20 +226,30 @@ def answer_question(interview_id: int, payload: AnswerCreate, db: Session = Depe
     # Scoring # Here I want to have a common function that will handle the scoring logic. 
     if payload.is_coding and payload.code:
         # success, output = run_python_code(payload.code, "")
-        success, output = run_code(payload.language_code, payload.code)
+        success, output = run_code(payload.code_language or "python", payload.code)
         ans.code_result = output
         ans.score = 10 if success else 0
     else:
         # ans.score = score_text_answer(payload.user_text or "")
-        ans.score = score_with_llm(
-            question.text,
-            payload.user_text or "",
-            qtype=question.qtype,
-        )
+        with jobs_for(interview_id):
+            ans.score = score_answer(
+                question["q"],
+                payload.user_text or "",
+                qtype=question["qtype"],
+                profile=f"{session.resume or ''}\n{session.jd or ''}",
+                references=question.get("references"),
+            )
 
+    code_result = ans.code_result
     db.add(ans)
     db.commit()
     db.refresh(ans)
+    # code/code_result are deferred: keep the values we just wrote instead of reading them back
+    set_committed_value(ans, "code", payload.code)
+    set_committed_value(ans, "code_result", code_result)
+
+    session.record_answer(payload.question_id, payload.user_text or "", ans.score)
+    save_session(session)
     return ans
 
 
@@ -171,15 +260,165 @@ def end_interview(interview_id: int, db: Session = Depends(get_db)):
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
 
-    answers = db.query(Answer).filter(Answer.interview_id == interview_id).all()
-    tech_scores = [a.score for a in answers if a and not a.is_coding]
-    coding_scores = [a.score for a in answers if a and a.is_coding]
-    behavioral_scores = [a.score for a in answers if a and not a.is_coding]  # refine later
+    return {"interview_id": interview_id, "total_score": _end(interview, db)}
 
-    total = aggregate_scores(tech_scores, behavioral_scores, coding_scores)
-    interview.total_score = total
-    interview.is_active = False
 
+def _end(interview: Interview, db: Session) -> int:
+    interview.is_active = False
+    interview.ended_at = interview.ended_at or datetime.utcnow()
     db.commit()
+    # Scores deferred answers (one batched pass) and stores the total
+    total = finalize_interview_scores([interview.id], db)[interview.id]
+    cancel_jobs([interview.id])
+    evict_sessions([interview.id])
+    transcript_buffer.flush()
     db.refresh(interview)
-    return {"interview_id": interview_id, "total_score": total}
+    return total
+
+
+# ------------------------------
+# WebSocket channel
+# ------------------------------
+
+def _db_step(fn, *args):
+    """Run one blocking router step with its own DB session (socket handlers call this in the threadpool)."""
+    db = SessionLocal()
+    try:
+        return fn(*args, db)
+    finally:
+        db.close()
+
+
+def _record_transcript(interview_id: int, speaker: str, text: Optional[str]):
+    if text:
+        transcript_buffer.append(interview_id, speaker, text)
+
+
+def _ws_open(interview_id: int, db: Session) -> dict:
+    interview = _active_interview(interview_id, db)
+    session = get_session(interview, db)
+    current = session.history[-1] if session.history else None
+    question = None
+    if current is not None:
+        question = {"question_id": current["question_id"], "text": current["q"], "qtype": current["qtype"]}
+        # First connection: the intro question was created by /start
+        if not (transcript_buffer.pending(interview_id)
+                or db.query(Transcript.id).filter(Transcript.interview_id == interview_id).first()):
+            _record_transcript(interview_id, "interviewer", current["q"])
+    return {"expires_at": interview.expires_at, "question": question}
+
+
+def _ws_next(interview_id: int, db: Session) -> dict:
+    interview = _active_interview(interview_id, db)
+    q = _next_question_flight.do(interview_id, lambda: _generate_and_store_next(interview, db))
+    _record_transcript(interview_id, "interviewer", q["text"])
+    return q
+
+
+def _ws_answer(interview_id: int, payload: AnswerCreate, db: Session) -> dict:
+    interview = _active_interview(interview_id, db)
+    ans = _store_answer(interview, payload, db)
+    _record_transcript(interview_id, "candidate", payload.user_text or payload.code)
+    return AnswerOut.model_validate(ans).model_dump(mode="json")
+
+
+def _ws_end(interview_id: int, db: Session) -> int:
+    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return _end(interview, db)
+
+
+def _ws_expire(interview_id: int, db: Session):
+    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    if interview:
+        deactivate_if_expired(interview, db)
+
+
+@router.websocket("/{interview_id}/ws")
+async def interview_socket(websocket: WebSocket, interview_id: int):
+    """
+    The whole interview loop on one connection, instead of /next and /answer
+    calls plus polling GET /interview/{id} for the timer.
+
+    Client -> server: {"type": "next"}, {"type": "answer", <AnswerCreate fields>},
+                      {"type": "end"}, {"type": "ping"}
+    Server -> client: question, answer_ack, score_ready, timer_tick, expired,
+                      ended, pong, error ({"type": ..., **data})
+
+    Steps run the same code as the HTTP endpoints; questions and answers are
+    also stored as Transcript rows.
+    """
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+
+    async def send(event: str, **data):
+        async with send_lock:
+            await websocket.send_json({"type": event, **data})
+
+    try:
+        state = await run_in_threadpool(_db_step, _ws_open, interview_id)
+    except HTTPException as e:
+        await send("error", status=e.status_code, detail=e.detail)
+        await websocket.close(code=4404)
+        return
+    if state["question"]:
+        await send("question", **state["question"])
+
+    async def tick():
+        expires_at = state["expires_at"]
+        try:
+            while True:
+                remaining = (expires_at - datetime.utcnow()).total_seconds() if expires_at else None
+                if remaining is not None and remaining <= 0:
+                    await run_in_threadpool(_db_step, _ws_expire, interview_id)
+                    await send("expired", interview_id=interview_id)
+                    await websocket.close()
+                    return
+                await send("timer_tick", remaining_seconds=None if remaining is None else int(remaining))
+                await asyncio.sleep(min(settings.INTERVIEW_WS_TICK_SECONDS, remaining or settings.INTERVIEW_WS_TICK_SECONDS))
+        except Exception:
+            return  # connection gone; the receive loop notices too
+
+    ticker = asyncio.create_task(tick())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                kind = message.get("type")
+            except (ValueError, KeyError, AttributeError):
+                # Not JSON, a binary frame, or JSON that isn't an object
+                await send("error", status=400, detail="Messages must be JSON objects with a 'type'")
+                continue
+            try:
+                if kind == "next":
+                    await send("question", **await run_in_threadpool(_db_step, _ws_next, interview_id))
+                elif kind == "answer":
+                    payload = AnswerCreate(**{k: v for k, v in message.items() if k != "type"})
+                    await send("answer_ack", question_id=payload.question_id)
+                    answer = await run_in_threadpool(_db_step, _ws_answer, interview_id, payload)
+                    await send("score_ready", answer_id=answer["id"], question_id=answer["question_id"],
+                               score=answer["score"], code_result=answer["code_result"])
+                elif kind == "end":
+                    total = await run_in_threadpool(_db_step, _ws_end, interview_id)
+                    await send("ended", interview_id=interview_id, total_score=total)
+                    await websocket.close()
+                    break
+                elif kind == "ping":
+                    await send("pong")
+                else:
+                    await send("error", status=400, detail=f"Unknown message type '{kind}'")
+            except HTTPException as e:
+                await send("error", status=e.status_code, detail=e.detail)
+            except ValidationError as e:
+                await send("error", status=422, detail=json.loads(e.json()))
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                # e.g. a provider or DB error inside a step: report it, keep the session open
+                print(f"Interview socket step '{kind}' failed for interview {interview_id}: {e}")
+                await send("error", status=500, detail="Internal error, please retry")
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # client went away, or the ticker closed the socket on expiry
+    finally:
+        ticker.cancel()
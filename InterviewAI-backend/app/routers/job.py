@@ -1,23 +1,37 @@
 # app/routers/job.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from app.database import get_db
 from app.models.content import JobDescription
 from app.schemas.content import JobDescriptionCreate, JobDescriptionResponse
+from app.services.match_index import job_index
+from app.services.read_cache import CachedBody, read_cache
+from app.utils.responses import FIELDS_QUERY, model_json, model_response, conditional_response, wants_field
 
 router = APIRouter()
 
 @router.post("/", response_model=JobDescriptionResponse)
-def create_jd(payload: JobDescriptionCreate, db: Session = Depends(get_db)):
+def create_jd(payload: JobDescriptionCreate, fields: str | None = FIELDS_QUERY, db: Session = Depends(get_db)):
     jd = JobDescription(title=payload.title, jd_text=payload.jd_text, user_id=payload.user_id)
     db.add(jd)
     db.commit()
     db.refresh(jd)
-    return jd
+    set_committed_value(jd, "jd_text", payload.jd_text)  # deferred: don't read back the text we just wrote
+    job_index.upsert(jd.id, jd.jd_text, jd.user_id, jd.title)
+    return model_response(JobDescriptionResponse, jd, fields)
 
 @router.get("/{jd_id}", response_model=JobDescriptionResponse)
-def get_jd(jd_id: int, db: Session = Depends(get_db)):
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
-    if not jd:
-        raise HTTPException(404, "JD not found")
-    return jd
+def get_jd(jd_id: int, request: Request, fields: str | None = FIELDS_QUERY, db: Session = Depends(get_db)):
+    # JDs never change once created: serve (or 304) from the read cache
+    key = ("job", jd_id, fields or "")
+    entry = read_cache.get(key)
+    if entry is None:
+        query = db.query(JobDescription).filter(JobDescription.id == jd_id)
+        if wants_field(JobDescriptionResponse, fields, "jd_text"):
+            query = query.options(undefer(JobDescription.jd_text))
+        jd = query.first()
+        if not jd:
+            raise HTTPException(404, "JD not found")
+        entry = read_cache.put(key, CachedBody.build(model_json(JobDescriptionResponse, jd, fields), jd.uploaded_at))
+    return conditional_response(request, entry)
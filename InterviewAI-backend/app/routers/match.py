@@ -0,0 +1,39 @@
+# app/routers/match.py
+from fastapi import APIRouter, HTTPException
+from app.config import settings
+from app.schemas.match import MatchRequest, MatchResponse, MatchOut
+from app.services.match_index import resume_index, job_index, overlapping_skills
+
+router = APIRouter()
+
+@router.post("/", response_model=MatchResponse)
+def match(payload: MatchRequest):
+    """
+    Rank one resume against many job descriptions, or one job description
+    against many resumes (TF-IDF cosine over the precomputed term index).
+    """
+    if (payload.resume_id is None) == (payload.job_description_id is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of resume_id or job_description_id")
+    k = max(1, min(payload.k, settings.MATCH_MAX_K))
+
+    if payload.resume_id is not None:
+        source, target, source_id = resume_index, job_index, payload.resume_id
+    else:
+        source, target, source_id = job_index, resume_index, payload.job_description_id
+
+    doc = source.get(source_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found or has no text")
+
+    ranked = target.rank_vector(doc.indices, doc.values, k=k,
+                                candidate_ids=payload.candidate_ids, user_id=payload.user_id)
+    return MatchResponse(
+        resume_id=payload.resume_id,
+        job_description_id=payload.job_description_id,
+        indexed=len(target),
+        matches=[
+            MatchOut(id=d.id, label=d.label, score=round(score, 4),
+                     overlapping_skills=overlapping_skills(doc, d))
+            for d, score in ranked
+        ],
+    )
@@ -1,10 +1,15 @@
 # app/routers/resume.py
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy.orm.attributes import set_committed_value
 from app.database import get_db
 from app.models.content import Resume
 from app.schemas.content import ResumeCreate, ResumeResponse
 from app.services.parse_and_ai import parse_file
+from app.services.match_index import resume_index
+from app.services.read_cache import CachedBody, read_cache
+from app.utils.responses import FIELDS_QUERY, model_json, model_response, conditional_response, wants_field
 
 import os
 from pathlib import Path
@@ -15,7 +20,8 @@ UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 @router.post("/upload", response_model=ResumeResponse)
-async def upload_resume(file: UploadFile = File(...), user_id: int | None = None, db: Session = Depends(get_db)):
+async def upload_resume(file: UploadFile = File(...), user_id: int | None = None, fields: str | None = FIELDS_QUERY,
+                        db: Session = Depends(get_db)):
     # Save file bytes
     contents = await file.read()
     filename = file.filename
@@ -27,6 +33,14 @@ async def upload_resume(file: UploadFile = File(...), user_id: int | None = None
     while save_path.exists():
         save_path = UPLOAD_DIR / f"{base}_{counter}{ext}"
         counter += 1
+
+    # Parsing (CPU) and the DB write (blocking) run off the event loop; doing them
+    # inline stalls every other request and can deadlock the connection pool.
+    db_resume = await run_in_threadpool(_save_and_parse, save_path, filename, contents, user_id, db)
+    return model_response(ResumeResponse, db_resume, fields)
+
+
+def _save_and_parse(save_path: Path, filename: str, contents: bytes, user_id: int | None, db: Session) -> Resume:
     with open(save_path, "wb") as f:
         f.write(contents)
 
@@ -38,11 +52,21 @@ async def upload_resume(file: UploadFile = File(...), user_id: int | None = None
     db.add(db_resume)
     db.commit()
     db.refresh(db_resume)
+    set_committed_value(db_resume, "raw_text", raw_text)  # deferred: don't read back the text we just wrote
+    resume_index.upsert(db_resume.id, raw_text, user_id, str(save_path))
     return db_resume
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
-def get_resume(resume_id: int, db: Session = Depends(get_db)):
-    r = db.query(Resume).filter(Resume.id == resume_id).first()
-    if not r:
-        raise HTTPException(404, "Resume not found")
-    return r
+def get_resume(resume_id: int, request: Request, fields: str | None = FIELDS_QUERY, db: Session = Depends(get_db)):
+    # Resumes never change once uploaded: serve (or 304) from the read cache
+    key = ("resume", resume_id, fields or "")
+    entry = read_cache.get(key)
+    if entry is None:
+        query = db.query(Resume).filter(Resume.id == resume_id)
+        if wants_field(ResumeResponse, fields, "raw_text"):
+            query = query.options(undefer(Resume.raw_text))
+        r = query.first()
+        if not r:
+            raise HTTPException(404, "Resume not found")
+        entry = read_cache.put(key, CachedBody.build(model_json(ResumeResponse, r, fields), r.uploaded_at))
+    return conditional_response(request, entry)
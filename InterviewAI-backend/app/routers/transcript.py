@@ -0,0 +1,65 @@
+# app/routers/transcript.py
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db, SessionLocal
+from app.models.content import Interview, Transcript
+from app.schemas.content import TranscriptIngest, TranscriptOut
+from app.services.transcript_buffer import transcript_buffer
+
+router = APIRouter()
+
+
+def _ensure_interview(interview_id: int, db: Session):
+    if not db.query(Interview.id).filter(Interview.id == interview_id).first():
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+
+@router.post("/{interview_id}/transcript", status_code=202)
+def ingest_transcript(interview_id: int, payload: TranscriptIngest, db: Session = Depends(get_db)):
+    """
+    Accept a batch of transcript segments. They are written behind (bulk
+    INSERTs by the transcript buffer), so 202 means queued, not yet committed.
+    """
+    _ensure_interview(interview_id, db)
+    now = datetime.utcnow()
+    rows = [
+        {"interview_id": interview_id, "speaker": s.speaker, "text": s.text, "created_at": s.created_at or now}
+        for s in payload.segments if s.text
+    ]
+    transcript_buffer.extend(rows)
+    return {"interview_id": interview_id, "accepted": len(rows)}
+
+
+@router.get("/{interview_id}/transcript")
+def stream_transcript(interview_id: int, after_id: int = 0, db: Session = Depends(get_db)):
+    """
+    Transcript playback as NDJSON (one TranscriptOut per line), streamed from
+    the DB in chunks. `after_id` resumes a playback.
+
+    Rows come in id (arrival) order, not by the client-supplied created_at: a
+    segment posted late with an earlier created_at still gets a higher id, so
+    resuming after the last id seen never skips it.
+    """
+    _ensure_interview(interview_id, db)
+    transcript_buffer.flush()  # include segments still waiting in the buffer
+
+    def rows():
+        # Own session: the request's is closed once the response starts streaming
+        stream_db = SessionLocal()
+        try:
+            query = (
+                stream_db.query(Transcript)
+                .filter(Transcript.interview_id == interview_id, Transcript.id > after_id)
+                .order_by(Transcript.id)
+                .yield_per(500)
+            )
+            for t in query:
+                yield TranscriptOut.model_validate(t).model_dump_json() + "\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
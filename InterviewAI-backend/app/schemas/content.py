@@ -1,8 +1,23 @@
 # app/schemas/content.py
-from pydantic import BaseModel
-from typing import Optional, List
+import json
+from pydantic import BaseModel, field_validator
+from typing import Optional, List, Literal
 from datetime import datetime
 
+
+def public_extra(extra: Optional[str]) -> Optional[str]:
+    """Question.extra as shown to the candidate: without the reference answers (scoring only)."""
+    if not extra or '"references"' not in extra:
+        return extra
+    try:
+        data = json.loads(extra)
+    except ValueError:
+        return extra
+    if not isinstance(data, dict):
+        return extra
+    data.pop("references", None)
+    return json.dumps(data) if data else None
+
 class ResumeCreate(BaseModel):
     filename: str
     raw_text: Optional[str] = None
@@ -40,6 +55,8 @@ class QuestionOut(BaseModel):
     extra: Optional[str]
     ordinal: int
 
+    _public_extra = field_validator("extra", mode="before")(public_extra)
+
     class Config:
         from_attributes = True
 
@@ -48,6 +65,7 @@ class InterviewCreate(BaseModel):
     job_description_id: Optional[int] = None
     user_id: Optional[int] = None
     timer_minutes: Optional[int] = 30
+    mode: Optional[str] = "adaptive"  # 'adaptive' (one LLM call per step) or 'planned'
 
 
 class InterviewOut(BaseModel):
@@ -60,6 +78,7 @@ class InterviewOut(BaseModel):
     is_active: bool
     user_id: Optional[int]
     total_score: Optional[int]
+    mode: Optional[str] = "adaptive"
     questions: List[QuestionOut] = []
 
     class Config:
@@ -124,3 +143,13 @@ class CodeRunRequest(BaseModel):
 class CodeRunResponse(BaseModel):
     success: bool
     output: str
+
+
+class TranscriptSegment(BaseModel):
+    speaker: Literal["interviewer", "candidate"]
+    text: str
+    created_at: Optional[datetime] = None  # when it was spoken; defaults to arrival time
+
+
+class TranscriptIngest(BaseModel):
+    segments: List[TranscriptSegment]
@@ -0,0 +1,37 @@
+# app/schemas/llm.py
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Any
+
+# Shapes of the JSON replies we ask LLMs for (see services/structured_output.py)
+
+class NextQuestionReply(BaseModel):
+    qtype: Optional[str] = None  # defaults to the category we asked for
+    text: str
+    extra: Optional[Any] = None
+    references: Optional[List[str]] = None  # key points of a strong answer, for local scoring
+
+class FollowUpReply(BaseModel):
+    text: str
+
+class ScoreReply(BaseModel):
+    score: int
+
+class ScoredAnswer(BaseModel):
+    id: int
+    score: int
+
+class BatchScoreReply(BaseModel):
+    scores: List[ScoredAnswer]
+
+class PlannedQuestion(BaseModel):
+    model_config = ConfigDict(extra="allow")  # models sometimes add "metadata" etc.
+
+    qtype: str
+    text: str
+    extra: Optional[Any] = None
+    references: Optional[List[str]] = None
+    ordinal: Optional[int] = None
+
+class QuestionPlanReply(BaseModel):
+    # Tool calling needs an object at the top level; the prompt asks for a bare array
+    questions: List[PlannedQuestion]
@@ -0,0 +1,23 @@
+# app/schemas/match.py
+from pydantic import BaseModel
+from typing import Optional, List
+
+class MatchRequest(BaseModel):
+    # Exactly one of resume_id (rank job descriptions) or job_description_id (rank resumes)
+    resume_id: Optional[int] = None
+    job_description_id: Optional[int] = None
+    candidate_ids: Optional[List[int]] = None  # restrict ranking to these documents
+    user_id: Optional[int] = None  # only documents owned by this user
+    k: int = 10
+
+class MatchOut(BaseModel):
+    id: int
+    label: Optional[str]  # JD title or resume filename
+    score: float
+    overlapping_skills: List[str]
+
+class MatchResponse(BaseModel):
+    resume_id: Optional[int]
+    job_description_id: Optional[int]
+    indexed: int  # documents in the ranked index
+    matches: List[MatchOut]
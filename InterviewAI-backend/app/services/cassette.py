@@ -0,0 +1,270 @@
+# app/services/cassette.py
+"""
+Record/replay of external traffic (LLM calls and Judge0 submissions).
+
+settings.CASSETTE_MODE:
+  - "off":    normal operation
+  - "record": real calls go out; request keys, responses and latencies are
+              appended to settings.CASSETTE_PATH (JSONL, gzip if it ends in .gz)
+  - "replay": no network; responses are served from the cassette, either with
+              their original latency or as fast as possible
+              (settings.CASSETTE_REPLAY_TIMING = "original" | "fast")
+
+Requests are matched by a SHA-256 of their content (the prompt for LLM calls,
+the submission payload for Judge0), not by provider, so replay works whichever
+provider the router picks. Repeated identical requests are replayed in the
+order they were recorded.
+
+LLM calls are recorded on the path structured_output takes in production
+(settings.LLM_STRUCTURED_OUTPUT): plain invoke ("llm"), with_structured_output
+("llm_structured": raw message + parsed reply) and stream ("llm_stream": the
+chunks the caller consumed). On replay a client only offers the paths its
+cassette has recordings for, so structured_output falls back exactly as it
+did while recording.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+LLM = "llm"
+LLM_STRUCTURED = "llm_structured"
+LLM_STREAM = "llm_stream"
+JUDGE0 = "judge0"
+
+
+class CassetteMiss(RuntimeError):
+    """Replay mode and the cassette has no recording for this request."""
+
+
+def request_key(data: Any) -> str:
+    if not isinstance(data, str):
+        data = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str, timing: str = "original"):
+        self.path = Path(path)
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, deque] = defaultdict(deque)
+        self._last: Dict[tuple, Dict] = {}
+        if mode == "replay":
+            self._load()
+        elif mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self):
+        with _open(self.path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[(entry["kind"], entry["key"])].append(entry)
+
+    def _append(self, entry: Dict):
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            with _open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def has_kind(self, kind: str) -> bool:
+        """Replay: whether anything of `kind` was recorded."""
+        return any(k == kind for k, _ in self._entries)
+
+    def record(self, kind: str, request: Any, latency: float, response: Any = None,
+               error: Optional[str] = None, meta: Optional[Dict] = None):
+        """Append one entry (record mode), for calls that don't fit through(), e.g. streams."""
+        entry = {"kind": kind, "key": request_key(request), "meta": meta or {}, "latency": round(latency, 4)}
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["response"] = response
+        self._append(entry)
+
+    def replay(self, kind: str, key: str) -> Dict:
+        with self._lock:
+            queue = self._entries.get((kind, key))
+            if queue:
+                entry = queue.popleft()
+                self._last[(kind, key)] = entry
+            else:
+                entry = self._last.get((kind, key))  # more calls than recorded: repeat the last one
+        if entry is None:
+            raise CassetteMiss(f"No {kind} recording for request {key[:12]}")
+        if self.timing == "original":
+            time.sleep(entry.get("latency", 0.0))
+        if entry.get("error"):
+            raise RuntimeError(entry["error"])
+        return entry["response"]
+
+    def through(self, kind: str, request: Any, call: Callable[[], Any],
+                encode: Callable[[Any], Any] = lambda r: r, meta: Optional[Dict] = None) -> Any:
+        """
+        Run `call` and record it (record mode), or serve the recording (replay).
+        `encode` turns the live result into the JSON-able form stored on disk;
+        replay returns that stored form.
+        """
+        key = request_key(request)
+        if self.mode == "replay":
+            return self.replay(kind, key)
+
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            if self.mode == "record":
+                self._append({"kind": kind, "key": key, "meta": meta or {}, "error": str(e),
+                              "latency": round(time.perf_counter() - start, 4)})
+            raise
+        if self.mode == "record":
+            self._append({"kind": kind, "key": key, "meta": meta or {}, "response": encode(result),
+                          "latency": round(time.perf_counter() - start, 4)})
+        return result
+
+
+class CassetteMessage:
+    """Replayed LLM reply; quacks like a LangChain AIMessage."""
+
+    def __init__(self, content: str, usage_metadata: Optional[Dict] = None):
+        self.content = content
+        self.usage_metadata = usage_metadata
+        self.response_metadata = {"cassette": True}
+
+
+def _encode_message(message: Any) -> Dict:
+    content = getattr(message, "content", None)
+    if content is None:
+        content = str(message)
+    elif not isinstance(content, (str, list)):  # keep Anthropic-style content blocks as they are
+        content = str(content)
+    return {"content": content, "usage": getattr(message, "usage_metadata", None)}
+
+
+def _encode_structured(out: Dict) -> Dict:
+    parsed = out.get("parsed")
+    if hasattr(parsed, "model_dump"):
+        parsed = parsed.model_dump(mode="json", exclude_unset=True)
+    raw = out.get("raw")
+    return {"raw": _encode_message(raw) if raw is not None else None, "parsed": parsed}
+
+
+class _CassetteStructured:
+    """with_structured_output(...) runnable: records/replays {"raw", "parsed"} per prompt and schema."""
+
+    def __init__(self, llm: "CassetteLLM", tool_model: type, inner: Any):
+        self.llm = llm
+        self.tool_model = tool_model
+        self.inner = inner
+
+    def invoke(self, prompt, *args, **kwargs):
+        request = {"prompt": str(prompt), "schema": self.tool_model.__name__}
+        result = self.llm.cassette.through(LLM_STRUCTURED, request,
+                                           lambda: self.inner.invoke(prompt, *args, **kwargs),
+                                           encode=_encode_structured, meta=self.llm.meta)
+        if self.llm.cassette.mode != "replay":
+            return result
+        raw, parsed = result.get("raw"), result.get("parsed")
+        return {
+            "raw": CassetteMessage(raw["content"], raw.get("usage")) if raw else None,
+            "parsed": self.tool_model.model_validate(parsed) if parsed is not None else None,
+            "parsing_error": None,
+        }
+
+
+class CassetteLLM:
+    """Wraps an LLM client (record) or stands in for one (replay, inner=None)."""
+
+    def __init__(self, cassette: Cassette, inner: Any, provider: str, model: Optional[str]):
+        self.cassette = cassette
+        self.inner = inner
+        self.provider = provider
+        self.model = model
+        self.meta = {"provider": provider, "model": model}
+
+    def _supports(self, kind: str, attr: str) -> bool:
+        if self.cassette.mode == "replay":
+            return self.cassette.has_kind(kind)
+        return hasattr(self.inner, attr)
+
+    def invoke(self, prompt, *args, **kwargs):
+        prompt_text = str(prompt)
+
+        def call():
+            return self.inner.invoke(prompt, *args, **kwargs) if hasattr(self.inner, "invoke") else self.inner(prompt)
+
+        result = self.cassette.through(LLM, prompt_text, call, encode=_encode_message, meta=self.meta)
+        if self.cassette.mode == "replay":
+            return CassetteMessage(result["content"], result.get("usage"))
+        return result
+
+    __call__ = invoke
+
+    # Properties, so hasattr() (structured_output's capability check) is false for
+    # paths the wrapped client, or the replayed cassette, doesn't have.
+    @property
+    def with_structured_output(self):
+        if not self._supports(LLM_STRUCTURED, "with_structured_output"):
+            raise AttributeError("with_structured_output")
+        return self._with_structured_output
+
+    @property
+    def stream(self):
+        if not self._supports(LLM_STREAM, "stream"):
+            raise AttributeError("stream")
+        return self._stream
+
+    def _with_structured_output(self, tool_model: type, **kwargs) -> _CassetteStructured:
+        inner = self.inner.with_structured_output(tool_model, **kwargs) if self.cassette.mode != "replay" else None
+        return _CassetteStructured(self, tool_model, inner)
+
+    def _stream(self, prompt, *args, **kwargs):
+        prompt_text = str(prompt)
+        if self.cassette.mode == "replay":
+            # Original timing: the whole recorded latency is paid before the first chunk
+            for chunk in self.cassette.replay(LLM_STREAM, request_key(prompt_text)):
+                yield CassetteMessage(chunk["content"], chunk.get("usage"))
+            return
+        chunks, error = [], None
+        start = time.perf_counter()
+        try:
+            for chunk in self.inner.stream(prompt, *args, **kwargs):
+                chunks.append(_encode_message(chunk))
+                yield chunk
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            # Also reached when the caller stops early (close()): record what it consumed
+            if self.cassette.mode == "record":
+                self.cassette.record(LLM_STREAM, prompt_text, time.perf_counter() - start,
+                                     response=None if error else chunks, error=error, meta=self.meta)
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """The process-wide cassette, or None when CASSETTE_MODE is off."""
+    global _cassette
+    if settings.CASSETTE_MODE not in ("record", "replay"):
+        return None
+    if _cassette is None:
+        with _cassette_lock:
+            if _cassette is None:
+                _cassette = Cassette(settings.CASSETTE_PATH, settings.CASSETTE_MODE, settings.CASSETTE_REPLAY_TIMING)
+    return _cassette
@@ -3,8 +3,8 @@ import subprocess
 import tempfile
 import uuid
 from typing import Tuple, Optional
-import requests
 from app.config import settings
+from app.services.cassette import get_cassette, JUDGE0
 
 HEADERS = {
     "X-RapidAPI-Host": settings.RAPIDAPI_HOST,
@@ -56,6 +56,12 @@ def run_code(language: str, code: str, stdin: Optional[str] = "") -> Tuple[bool,
     if language not in LANGUAGE_MAP:
         return False, f"Language '{language}' not supported."
 
+    # Local runner for dev, CI and benchmarks (no Judge0 round-trip); python only
+    if settings.CODE_RUNNER_BACKEND == "local":
+        if language != "python":
+            return False, f"Language '{language}' not supported by the local runner."
+        return run_python_code(code, stdin or "")
+
     url = f"https://{settings.RAPIDAPI_HOST}/submissions?base64_encoded=false&wait=true"
 
     payload = {
@@ -64,10 +70,16 @@ def run_code(language: str, code: str, stdin: Optional[str] = "") -> Tuple[bool,
         "stdin": stdin
     }
 
-    try:
+    def submit():
+        import requests  # only the Judge0 backend needs it; keeps it out of app start-up
+
         response = requests.post(url, json=payload, headers=HEADERS, timeout=15)
         response.raise_for_status()
-        result = response.json()
+        return response.json()
+
+    try:
+        cassette = get_cassette()
+        result = cassette.through(JUDGE0, payload, submit) if cassette else submit()
 
         # Judge0 returns output fields
         stdout = result.get("stdout")
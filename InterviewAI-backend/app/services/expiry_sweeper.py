@@ -0,0 +1,125 @@
+# app/services/expiry_sweeper.py
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.content import Interview
+from app.services.history_and_scores import finalize_interview_scores
+from app.services.interview_jobs import cancel_jobs
+from app.services.session_store import evict_sessions
+from app.services.transcript_buffer import transcript_buffer
+
+
+def sweep_expired_interviews(db: Session, now: Optional[datetime] = None) -> List[int]:
+    """
+    Deactivate every expired interview in one bulk UPDATE, then finalize their
+    scores, cancel pending jobs and evict their hot sessions.
+
+    Safe to run from several workers at once: the UPDATE only matches rows that
+    are still active and RETURNING hands each id to exactly one caller, so only
+    the worker that flipped a row finalizes it. If finalizing fails, the rows
+    stay inactive without a total_score and finalize_stragglers picks them up.
+    """
+    now = now or datetime.utcnow()
+    stmt = (
+        update(Interview)
+        .where(
+            Interview.is_active.is_(True),
+            Interview.expires_at.is_not(None),
+            Interview.expires_at < now,
+        )
+        .values(is_active=False, ended_at=now)
+        .returning(Interview.id)
+        .execution_options(synchronize_session=False)
+    )
+    expired_ids = [row[0] for row in db.execute(stmt)]
+    db.commit()
+
+    if expired_ids:
+        finalize_interview_scores(expired_ids, db)
+        cancel_jobs(expired_ids)
+        evict_sessions(expired_ids)
+        transcript_buffer.flush()
+    return expired_ids
+
+
+def finalize_stragglers(db: Session, now: Optional[datetime] = None, limit: int = 100) -> List[int]:
+    """
+    Finalize interviews that ended over INTERVIEW_FINALIZE_RETRY_SECONDS ago
+    but still have no total_score (finalizing failed, or its worker died).
+    Finalizing is idempotent, so a retry racing a late original is harmless.
+    """
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.INTERVIEW_FINALIZE_RETRY_SECONDS)
+    ids = [
+        row[0]
+        for row in db.query(Interview.id)
+        .filter(
+            Interview.is_active.is_(False),
+            Interview.total_score.is_(None),
+            Interview.ended_at.is_not(None),
+            Interview.ended_at < cutoff,
+        )
+        .order_by(Interview.id)
+        .limit(limit)
+    ]
+    finalized = []
+    for interview_id in ids:  # one at a time: an interview that keeps failing doesn't hold up the rest
+        try:
+            finalize_interview_scores([interview_id], db)
+            finalized.append(interview_id)
+        except Exception as e:
+            db.rollback()
+            print(f"Finalizing interview {interview_id} failed again: {e}")
+    return finalized
+
+
+class ExpirySweeper:
+    """Runs sweep_expired_interviews every `interval` seconds in a daemon thread."""
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="interview-expiry-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        # Jitter the first run so workers booted together don't sweep in lockstep.
+        if self._stop.wait(random.uniform(0, self.interval)):
+            return
+        while True:
+            db = SessionLocal()
+            try:
+                expired = sweep_expired_interviews(db)
+                if expired:
+                    print(f"Expiry sweeper deactivated interviews: {expired}")
+                retried = finalize_stragglers(db)
+                if retried:
+                    print(f"Expiry sweeper finalized interviews again: {retried}")
+            except Exception as e:
+                db.rollback()
+                print(f"Expiry sweeper failed: {e}")
+            finally:
+                db.close()
+            if self._stop.wait(self.interval):
+                return
+
+
+expiry_sweeper = ExpirySweeper(settings.INTERVIEW_SWEEP_INTERVAL_SECONDS)
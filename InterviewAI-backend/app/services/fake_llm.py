@@ -0,0 +1,186 @@
+# app/services/fake_llm.py
+"""
+Deterministic fake LLM for load tests and CI (get_llm(provider="fake")).
+
+- Replies are schema-conforming JSON for every prompt the app sends
+  (next question, follow-up, question plan, scoring) and depend only on
+  the prompt text, so the same prompt always gets the same reply.
+- Latency follows settings.FAKE_LLM_LATENCY: "fixed", "lognormal" or
+  "replay" (sampled from a Prometheus-style histogram file).
+- settings.FAKE_LLM_ERROR_RATE of calls raise, to exercise failover/fallbacks.
+"""
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from app.config import settings
+
+QUESTION_BANK = {
+    "intro": [
+        "Tell me about yourself and what drew you to this role.",
+        "Walk me through your background and your most recent position.",
+    ],
+    "resume": [
+        "Which project on your resume had the hardest technical trade-offs, and how did you decide?",
+        "Describe the architecture of a system you built and the part you owned.",
+        "How did you measure the impact of the most recent feature you shipped?",
+    ],
+    "behavioral": [
+        "Tell me about a time you disagreed with a teammate and how it was resolved.",
+        "Describe a deadline you almost missed. What did you change afterwards?",
+        "Tell me about feedback that changed the way you work.",
+    ],
+    "coding": [
+        "Write a function that returns the first non-repeating character in a string.",
+        "Implement an LRU cache with O(1) get and put.",
+        "Given an array of integers, return the indices of two numbers that add up to a target.",
+    ],
+}
+REFERENCES = {
+    "intro": ["Current role and main responsibilities", "Relevant experience and why this role fits"],
+    "resume": ["Concrete system and the candidate's own part in it", "Trade-offs considered and how they were measured"],
+    "behavioral": ["Situation and task", "Actions the candidate took personally", "Result and what they learned"],
+    "coding": ["Correct algorithm with its time and space complexity", "Edge cases: empty input, duplicates"],
+}
+FOLLOW_UPS = [
+    "Can you give a concrete example of that, with numbers if possible?",
+    "What would you do differently if you did it again?",
+    "What was your personal contribution, as opposed to the team's?",
+]
+
+
+class FakeMessage:
+    """Quacks like a LangChain AIMessage (content + usage_metadata)."""
+
+    def __init__(self, content: str, prompt: str):
+        self.content = content
+        self.usage_metadata = {
+            "input_tokens": max(1, len(prompt) // 4),
+            "output_tokens": max(1, len(content) // 4),
+            "total_tokens": max(1, len(prompt) // 4) + max(1, len(content) // 4),
+        }
+        self.response_metadata = {"model_name": "fake"}
+
+
+def load_histogram(path: str) -> List[Tuple[float, float]]:
+    """
+    Read [[upper_bound_seconds, cumulative_count], ...] (the shape of a
+    Prometheus histogram's _bucket series). "+Inf" is allowed as a bound.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = sorted(data.items(), key=lambda kv: float(kv[0]))
+    return [(float(le), float(count)) for le, count in data]
+
+
+class LatencyModel:
+    def __init__(self, kind: str, median_ms: float, sigma: float,
+                 histogram: Optional[List[Tuple[float, float]]] = None, seed: int = 0):
+        self.kind = kind
+        self.median = median_ms / 1000.0
+        self.sigma = sigma
+        self.histogram = histogram or []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            u = self._rng.random()
+            g = self._rng.gauss(0.0, 1.0)
+        if self.kind == "lognormal":
+            return self.median * math.exp(self.sigma * g)
+        if self.kind == "replay" and self.histogram:
+            return self._sample_histogram(u)
+        return self.median
+
+    def _sample_histogram(self, u: float) -> float:
+        total = self.histogram[-1][1]
+        if total <= 0:
+            return self.median
+        target = u * total
+        prev_le, prev_count = 0.0, 0.0
+        for le, count in self.histogram:
+            if count >= target and count > prev_count:
+                if math.isinf(le):
+                    return prev_le * 1.5 or self.median  # open-ended top bucket
+                frac = (target - prev_count) / (count - prev_count)
+                return prev_le + frac * (le - prev_le)
+            if not math.isinf(le):
+                prev_le = le
+            prev_count = count
+        return prev_le
+
+
+def _pick(options: List[str], key: str) -> str:
+    h = int(hashlib.sha1(key.encode("utf-8")).hexdigest(), 16)
+    return options[h % len(options)]
+
+
+def fake_reply(prompt: str) -> str:
+    """Schema-conforming JSON reply for any prompt the app sends."""
+    if "Score each candidate answer" in prompt:
+        blocks = re.findall(r"### Answer id=(\d+)\n(.*?)(?=\n### Answer id=|\Z)", prompt, re.S)
+        scores = []
+        for answer_id, block in blocks:
+            words = len(block.split("Candidate Answer:", 1)[-1].split())
+            scores.append({"id": int(answer_id), "score": max(0, min(10, words // 8))})
+        return json.dumps(scores)
+
+    if "interview evaluator" in prompt:
+        answer = prompt.split("Candidate Answer:", 1)[-1].split("Reference Context", 1)[0]
+        words = len(answer.split())
+        return json.dumps({"score": max(0, min(10, words // 8))})
+
+    if "JSON array of interview questions" in prompt:
+        counts = [int(n) for n in re.findall(r"Produce exactly (\d+)", prompt)] + [3, 2, 2]
+        items = []
+        for qtype, n in zip(("resume", "behavioral", "coding"), counts[:3]):
+            bank = QUESTION_BANK[qtype]
+            for i in range(n):
+                extra = {"difficulty": "easy"} if qtype == "coding" else None
+                items.append({"qtype": qtype, "text": bank[(i + len(prompt)) % len(bank)], "extra": extra,
+                              "references": REFERENCES[qtype], "ordinal": len(items)})
+        return json.dumps(items)
+
+    if "shallow answer" in prompt:
+        return json.dumps({"text": _pick(FOLLOW_UPS, prompt)})
+
+    m = re.search(r"Current target category:\s*(\w+)", prompt)
+    qtype = m.group(1) if m and m.group(1) in QUESTION_BANK else "resume"
+    return json.dumps({"qtype": qtype, "text": _pick(QUESTION_BANK[qtype], prompt), "extra": None,
+                       "references": REFERENCES[qtype]})
+
+
+class FakeLLM:
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or "fake"
+        histogram = None
+        if settings.FAKE_LLM_LATENCY == "replay" and settings.FAKE_LLM_LATENCY_HISTOGRAM:
+            histogram = load_histogram(settings.FAKE_LLM_LATENCY_HISTOGRAM)
+        self.latency = LatencyModel(
+            settings.FAKE_LLM_LATENCY,
+            settings.FAKE_LLM_LATENCY_MS,
+            settings.FAKE_LLM_LATENCY_SIGMA,
+            histogram=histogram,
+            seed=settings.FAKE_LLM_SEED,
+        )
+        self.error_rate = settings.FAKE_LLM_ERROR_RATE
+        self._rng = random.Random(settings.FAKE_LLM_SEED + 1)
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt) -> FakeMessage:
+        prompt = str(prompt)
+        time.sleep(self.latency.sample())
+        with self._lock:
+            fail = self._rng.random() < self.error_rate
+        if fail:
+            raise RuntimeError("fake LLM injected error")
+        return FakeMessage(fake_reply(prompt), prompt)
+
+    __call__ = invoke
@@ -1,5 +1,10 @@
+from collections import defaultdict
+from typing import Dict, Iterable
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from app.models.content import Interview, Answer
+from app.models.content import Interview, Answer, Question
+from app.services.scoring import aggregate_scores, score_answers_batch
+from app.services.read_cache import read_cache
 
 def calculate_scores(interview: Interview, db: Session):
     """
@@ -52,3 +57,60 @@ def generate_feedback(interview: Interview, scores: dict) -> str:
         fb.append("Your coding skills are good.")
 
     return " ".join(fb)
+
+
+def total_score_for(answers) -> int:
+    """Weighted total (see scoring.aggregate_scores) over an interview's answers."""
+    tech_scores = [a.score for a in answers if not a.is_coding and a.score is not None]
+    coding_scores = [a.score for a in answers if a.is_coding and a.score is not None]
+    behavioral_scores = tech_scores  # refine later
+    return aggregate_scores(tech_scores, behavioral_scores, coding_scores)
+
+
+def score_deferred_answers(interview_ids: Iterable[int], db: Session) -> Dict[int, int]:
+    """
+    Score text answers left unscored (settings.SCORING_DEFERRED) for these
+    interviews: batched LLM prompts, then one bulk UPDATE of Answer.score.
+    Returns {answer_id: score}; caller commits.
+    """
+    rows = (
+        db.query(Answer.id, Answer.user_text, Question.text, Question.qtype)
+        .outerjoin(Question, Question.id == Answer.question_id)
+        .filter(Answer.interview_id.in_(list(interview_ids)), Answer.score.is_(None), Answer.is_coding.isnot(True))
+        .all()
+    )
+    if not rows:
+        return {}
+    scores = score_answers_batch([
+        {"id": r.id, "question": r.text or "", "answer": r.user_text or "", "qtype": r.qtype} for r in rows
+    ])
+    db.execute(update(Answer), [{"id": answer_id, "score": score} for answer_id, score in scores.items()])
+    return scores
+
+
+def finalize_interview_scores(interview_ids: Iterable[int], db: Session) -> Dict[int, int]:
+    """
+    Compute and store `total_score` for several interviews at once:
+    deferred answers are scored first, then one SELECT over their answers
+    and one bulk UPDATE.
+    """
+    interview_ids = list(interview_ids)
+    if not interview_ids:
+        return {}
+
+    score_deferred_answers(interview_ids, db)
+    rows = (
+        db.query(Answer.interview_id, Answer.is_coding, Answer.score)
+        .filter(Answer.interview_id.in_(interview_ids))
+        .all()
+    )
+    by_interview = defaultdict(list)
+    for row in rows:
+        by_interview[row.interview_id].append(row)
+
+    totals = {i: total_score_for(by_interview.get(i, [])) for i in interview_ids}
+    db.execute(update(Interview), [{"id": i, "total_score": t} for i, t in totals.items()])
+    db.commit()
+    for i in interview_ids:
+        read_cache.invalidate(("history", i))
+    return totals
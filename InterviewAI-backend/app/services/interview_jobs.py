@@ -0,0 +1,70 @@
+# app/services/interview_jobs.py
+"""
+Registry of pending background work (LLM calls, code runs) per interview.
+
+Anything submitted to an executor on behalf of an interview should be
+registered here, so it can be cancelled when the interview ends or expires.
+Code that doesn't know the interview (the LLM router) uses register_current()
+inside a jobs_for(interview_id) block. Only jobs that haven't started yet can
+be cancelled; code runs are one synchronous Judge0 request and aren't tracked.
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Set
+
+_lock = threading.Lock()
+_jobs: Dict[int, Set[Future]] = defaultdict(set)
+_current: ContextVar[Optional[int]] = ContextVar("interview_jobs_current", default=None)
+
+
+def register_job(interview_id: int, future: Future) -> Future:
+    """Track `future` under `interview_id`; it is forgotten once done."""
+    with _lock:
+        _jobs[interview_id].add(future)
+
+    def _forget(f: Future):
+        with _lock:
+            jobs = _jobs.get(interview_id)
+            if jobs is not None:
+                jobs.discard(f)
+                if not jobs:
+                    _jobs.pop(interview_id, None)
+
+    future.add_done_callback(_forget)
+    return future
+
+
+@contextmanager
+def jobs_for(interview_id: int):
+    """Work submitted through register_current() inside this block belongs to `interview_id`."""
+    token = _current.set(interview_id)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def register_current(future: Future) -> Future:
+    """register_job under the interview of the enclosing jobs_for block, if any."""
+    interview_id = _current.get()
+    return register_job(interview_id, future) if interview_id is not None else future
+
+
+def cancel_jobs(interview_ids: Iterable[int]) -> int:
+    """Cancel every pending job of the given interviews. Returns how many were cancelled."""
+    cancelled = 0
+    for interview_id in interview_ids:
+        with _lock:
+            jobs = list(_jobs.pop(interview_id, ()))
+        for f in jobs:
+            if f.cancel():
+                cancelled += 1
+    return cancelled
+
+
+def pending_jobs(interview_id: int) -> int:
+    with _lock:
+        return len(_jobs.get(interview_id, ()))
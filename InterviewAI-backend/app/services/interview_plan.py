@@ -0,0 +1,189 @@
+# app/services/interview_plan.py
+"""
+"Planned" interview mode.
+
+At /start the whole question set is generated with ONE LLM call
+(parse_and_ai.generate_questions_from_resume_and_jd) in the background
+(prepare_interview) while the candidate answers the templated intro, and is
+stored on the interview. /next then serves plan items in order and only
+calls the LLM for a follow-up when the previous answer was shallow.
+"""
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.content import Interview
+from app.models.interview_session import InterviewSession
+from app.services.interview_jobs import jobs_for, register_job
+from app.services.local_scoring import cached_vector
+from app.services.parse_and_ai import generate_questions_from_resume_and_jd
+from app.services.question_generator import generate_follow_up_question, generate_next_question
+from app.services.question_bank import question_bank, profile_features
+from app.services.session_store import session_store, save_session
+from app.services.skill_extractor import extract_profile
+
+PLANNED = "planned"
+ADAPTIVE = "adaptive"
+
+_background = ThreadPoolExecutor(max_workers=settings.PLAN_BACKGROUND_WORKERS, thread_name_prefix="plan")
+_plans_lock = threading.Lock()
+_pending_plans: Dict[int, Future] = {}
+
+
+def build_plan(resume_text: str, jd_text: str) -> List[Dict]:
+    """
+    Ordered list of {"qtype", "text", "extra"}: banked questions where the
+    question bank has good matches, one LLM call for the rest (if any).
+    """
+    features = profile_features(resume_text or "", jd_text or "")
+    wanted = {
+        "resume": settings.PLAN_NUM_RESUME_QUESTIONS,
+        "behavioral": settings.PLAN_NUM_BEHAVIORAL_QUESTIONS,
+        "coding": settings.PLAN_NUM_CODING_QUESTIONS,
+    }
+    banked = {qtype: question_bank.draw_many(qtype, features, n) for qtype, n in wanted.items()}
+    missing = {qtype: n - len(banked[qtype]) for qtype, n in wanted.items()}
+
+    raw = []
+    if any(missing.values()):
+        raw = generate_questions_from_resume_and_jd(
+            resume_text,
+            jd_text,
+            num_resume_q=missing["resume"],
+            num_behavioral=missing["behavioral"],
+            num_coding=missing["coding"],
+        )
+    generated = []
+    for item in sorted(raw, key=lambda x: x.get("ordinal", 0)):
+        if not isinstance(item, dict) or not item.get("text"):
+            continue
+        extra = item.get("extra")
+        generated.append({
+            "qtype": item.get("qtype") or "resume",
+            "text": item["text"],
+            "extra": extra if extra is None or isinstance(extra, str) else json.dumps(extra),
+        })
+        if not item.get("templated"):
+            question_bank.add(generated[-1]["qtype"], item["text"], generated[-1]["extra"], features)
+
+    # Keep the resume -> behavioral -> coding order whichever source a question came from
+    plan = []
+    for qtype in wanted:
+        plan += [{"qtype": e.qtype, "text": e.text, "extra": e.extra} for e in banked[qtype]]
+        plan += [g for g in generated if g["qtype"] == qtype]
+    plan += [g for g in generated if g["qtype"] not in wanted]
+    return plan
+
+
+def _warm_up(resume_text: str, jd_text: str):
+    """Fill the per-profile caches the first turns hit (skills, bank features, scoring profile vector)."""
+    extract_profile(resume_text or "", jd_text or "")
+    profile_features(resume_text or "", jd_text or "")
+    cached_vector(f"{resume_text or ''}\n{jd_text or ''}")
+
+
+def _build_and_store_plan(interview_id: int, resume_text: str, jd_text: str) -> List[Dict]:
+    _warm_up(resume_text, jd_text)
+    with jobs_for(interview_id):
+        plan = build_plan(resume_text, jd_text)
+    db = SessionLocal()
+    try:
+        db.execute(update(Interview).where(Interview.id == interview_id).values(question_plan=json.dumps(plan)))
+        db.commit()
+    finally:
+        db.close()
+    # Mirror into the hot session if /start has already cached it (otherwise ensure_plan reads the DB)
+    session = session_store.get(interview_id)
+    if session is not None and not session.plan:
+        session.plan = plan
+        save_session(session)
+    return plan
+
+
+def prepare_interview(interview_id: int, mode: str, resume_text: str, jd_text: str) -> Future:
+    """
+    Background work for a just-started interview, so /start doesn't wait on it:
+    the question plan (planned mode) or cache warm-up (adaptive mode).
+    Registered with interview_jobs, so ending the interview cancels it if it hasn't run yet.
+    """
+    if mode != PLANNED:
+        return register_job(interview_id, _background.submit(_warm_up, resume_text, jd_text))
+
+    future = _background.submit(_build_and_store_plan, interview_id, resume_text, jd_text)
+    with _plans_lock:
+        _pending_plans[interview_id] = future
+
+    def _forget(f: Future):
+        with _plans_lock:
+            if _pending_plans.get(interview_id) is f:
+                _pending_plans.pop(interview_id, None)
+
+    future.add_done_callback(_forget)
+    return register_job(interview_id, future)
+
+
+def ensure_plan(session: InterviewSession, db: Session) -> bool:
+    """
+    Make sure a planned session has its plan: wait (up to PLAN_WAIT_SECONDS)
+    for a build still running in this process, else read what another worker
+    stored. False if there is still no plan (/next then goes adaptive).
+    """
+    if session.mode != PLANNED or session.plan:
+        return True
+    with _plans_lock:
+        future = _pending_plans.get(session.interview_id)
+    plan = None
+    if future is not None:
+        try:
+            plan = future.result(timeout=settings.PLAN_WAIT_SECONDS)
+        except Exception as e:
+            print(f"question plan for interview {session.interview_id} not ready: {e!r}")
+    if not plan:
+        stored = db.query(Interview.question_plan).filter(Interview.id == session.interview_id).scalar()
+        plan = json.loads(stored) if stored else None
+    if not plan:
+        return False
+    session.plan = plan
+    save_session(session)
+    return True
+
+
+def is_shallow(entry: Dict) -> bool:
+    """An answered, non-coding question whose answer is short or scored low."""
+    if entry.get("qtype") in ("coding", "intro") or entry.get("follow_up"):
+        return False
+    answer = (entry.get("a") or "").strip()
+    if not answer:
+        return False  # unanswered/skipped: move on rather than nag
+    score = entry.get("score")
+    if score is not None and score < settings.PLAN_FOLLOW_UP_SCORE_THRESHOLD:
+        return True
+    return len(answer.split()) < settings.PLAN_FOLLOW_UP_MIN_WORDS
+
+
+def next_planned_question(session: InterviewSession) -> Tuple[Dict, bool]:
+    """
+    Pick the next question for a planned interview.
+    Returns (question dict, consumed_plan_item).
+    """
+    step = session.current_index
+    last: Optional[Dict] = session.history[-1] if session.history else None
+
+    if last and is_shallow(last):
+        q = generate_follow_up_question(last["q"], last["a"], last["qtype"], step=step)
+        q["extra"] = {"follow_up_to": last["question_id"]}
+        return q, False
+
+    if session.plan_cursor < len(session.plan):
+        item = session.plan[session.plan_cursor]
+        return {**item, "ordinal": step + 1}, True
+
+    # Plan exhausted: keep the interview going adaptively until the timer ends.
+    q = generate_next_question(None, session.resume, session.jd, step=step, history=session.history)
+    return q, False
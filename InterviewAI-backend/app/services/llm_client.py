@@ -7,9 +7,22 @@ def get_llm(provider: str = "openai", api_key: Optional[str] = None, model: Opti
     """
     Factory that returns a simple LLM client object with a consistent .invoke() interface.
     Supports multiple providers. Imports are lazy to avoid hard dependencies.
+    With settings.CASSETTE_MODE on, calls are recorded to / replayed from a cassette.
     """
     provider = (provider or "openai").lower()
 
+    from app.services.cassette import get_cassette, CassetteLLM
+    cassette = get_cassette()
+    if cassette is None:
+        return _create_llm(provider, api_key, model)
+    if cassette.mode == "replay":
+        # No provider client (or credentials) needed to replay
+        return CassetteLLM(cassette, None, provider, model)
+    return CassetteLLM(cassette, _create_llm(provider, api_key, model), provider, model)
+
+
+def _create_llm(provider: str, api_key: Optional[str], model: Optional[str]):
+
     if provider == "openai":
         try:
             # Preferred: modern langchain-openai Chat wrapper
@@ -57,4 +70,9 @@ def get_llm(provider: str = "openai", api_key: Optional[str] = None, model: Opti
         except Exception as e:
             raise RuntimeError("Anthropic wrapper not installed.") from e
 
+    if provider == "fake":
+        # Deterministic offline stand-in for load tests / CI (see services/fake_llm.py)
+        from app.services.fake_llm import FakeLLM
+        return FakeLLM(model=model)
+
     raise ValueError(f"Unsupported provider {provider}")
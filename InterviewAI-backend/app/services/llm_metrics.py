@@ -0,0 +1,151 @@
+# app/services/llm_metrics.py
+"""
+Prometheus metrics for LLM usage, exposed on GET /metrics.
+
+Two levels are recorded:
+  - per call site (generate_next_question, score_with_llm, ...): end-to-end
+    latency including hedging/failover, canned-fallback use, parse failures
+  - per provider attempt: latency, outcome and prompt/completion tokens
+
+With several gunicorn workers set PROMETHEUS_MULTIPROC_DIR so /metrics
+aggregates across processes.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds",
+    "End-to-end LLM call latency per call site (includes hedging and failover)",
+    ["call_site", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_PROVIDER_SECONDS = Histogram(
+    "llm_provider_request_duration_seconds",
+    "Latency of a single provider attempt",
+    ["task", "provider", "model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Prompt and completion tokens reported by providers",
+    ["task", "provider", "model", "kind"],
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallback_total",
+    "Calls that ended on the deterministic (canned) fallback",
+    ["call_site"],
+)
+LLM_PARSE_FAILURES = Counter(
+    "llm_parse_failures_total",
+    "LLM replies that could not be parsed as the expected JSON",
+    ["call_site"],
+)
+QUESTIONS_TEMPLATED = Counter(
+    "questions_templated_total",
+    "Questions served from local templates instead of the LLM (fallback, or shed under load)",
+    ["qtype", "reason"],
+)
+SCORING_DECISIONS = Counter(
+    "scoring_decisions_total",
+    "Answers scored, by tier (local or llm) and the local scorer's reason",
+    ["tier", "reason"],
+)
+SCORING_ABS_ERROR = Histogram(
+    "scoring_local_llm_abs_error",
+    "|local estimate - LLM score| where both exist (borderline and shadowed answers)",
+    ["qtype", "reason"],
+    buckets=(0, 1, 2, 3, 5, 10),
+)
+
+
+def token_usage(response: Any) -> Tuple[int, int]:
+    """(prompt_tokens, completion_tokens) from a LangChain message, 0s if unknown."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+    meta = getattr(response, "response_metadata", None) or {}
+    usage = meta.get("token_usage") or meta.get("usage") or {}
+    return (
+        int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0),
+        int(usage.get("completion_tokens") or usage.get("output_tokens") or 0),
+    )
+
+
+def record_attempt(task: Optional[str], provider: str, model: Optional[str], seconds: float,
+                   ok: bool, response: Any = None):
+    labels = {"task": task or "untagged", "provider": provider, "model": model or "default"}
+    LLM_PROVIDER_SECONDS.labels(outcome="ok" if ok else "error", **labels).observe(seconds)
+    if ok and response is not None:
+        prompt_tokens, completion_tokens = token_usage(response)
+        if prompt_tokens:
+            LLM_TOKENS.labels(kind="prompt", **labels).inc(prompt_tokens)
+        if completion_tokens:
+            LLM_TOKENS.labels(kind="completion", **labels).inc(completion_tokens)
+
+
+def record_fallback(call_site: str):
+    LLM_FALLBACKS.labels(call_site=call_site).inc()
+
+
+def record_parse_failure(call_site: str):
+    LLM_PARSE_FAILURES.labels(call_site=call_site).inc()
+
+
+def record_templated(qtype: str, reason: str, n: int = 1):
+    QUESTIONS_TEMPLATED.labels(qtype=qtype, reason=reason).inc(n)
+
+
+def record_scoring(tier: str, reason: str):
+    SCORING_DECISIONS.labels(tier=tier, reason=reason).inc()
+
+
+def record_agreement(qtype: Optional[str], reason: str, local: int, llm: int):
+    SCORING_ABS_ERROR.labels(qtype=qtype or "general", reason=reason).observe(abs(local - llm))
+
+
+class CallTimer:
+    """Handed out by timed_call(); mark the outcome before the block exits."""
+
+    def __init__(self):
+        self.outcome = "ok"
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+    def parse_failure(self):
+        self.outcome = "parse_failure"
+
+
+@contextmanager
+def timed_call(call_site: str):
+    """Time one LLM call site; fallback/parse-failure counters follow the marked outcome."""
+    timer = CallTimer()
+    start = time.perf_counter()
+    try:
+        yield timer
+    except Exception:
+        timer.outcome = "error"
+        raise
+    finally:
+        LLM_CALL_SECONDS.labels(call_site=call_site, outcome=timer.outcome).observe(time.perf_counter() - start)
+        if timer.outcome == "parse_failure":
+            record_parse_failure(call_site)
+        if timer.outcome in ("fallback", "parse_failure"):
+            record_fallback(call_site)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition payload and content type for GET /metrics."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,314 @@
+# app/services/llm_router.py
+"""
+Provider router for LLM calls.
+
+- Ordered provider chain from settings.LLM_PROVIDER_CHAIN ("provider:model,...").
+- Per-provider circuit breaker: after N consecutive failures the provider is
+  skipped for a cooldown, then one trial call is let through (half-open).
+- Per-provider latency tracking over a sliding window.
+- Hedged requests: if the primary hasn't answered within its p95 latency, the
+  same prompt is fired at the next provider and whichever answers first wins.
+  A failure fails over to the next provider immediately.
+- Attempts still queued when a call returns or times out are cancelled; ones
+  already running can't be, so each provider is capped at
+  LLM_MAX_IN_FLIGHT_PER_PROVIDER calls and a stalled one is skipped at the cap.
+
+Call sites use invoke_llm(prompt, ...) instead of get_llm(...).invoke(prompt).
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.interview_jobs import register_current
+from app.services.llm_client import get_llm
+from app.services.model_routing import route_task, parse_provider_chain
+from app.services.llm_metrics import record_attempt
+from app.services.structured_output import ReplySchema, structured_invoke
+
+PROVIDER_KEYS = {
+    "openai": "OPENAI_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "google": "GEMINI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+}
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, max(0, int(round(p / 100.0 * (len(samples) - 1)))))
+        return samples[idx]
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ProviderSlot:
+    """One provider:model in the chain, with its breaker, latency stats and cached client."""
+
+    def __init__(self, provider: str, model: Optional[str], api_key: Optional[str] = None):
+        self.provider = provider
+        self.model = model
+        self.api_key = api_key
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_COOLDOWN_SECONDS)
+        self.latency = LatencyTracker()
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._structured = {}  # schema name -> with_structured_output runnable
+        self._in_flight = 0  # submitted to the router's executor and not finished (or cancelled) yet
+        self._in_flight_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model or 'default'}"
+
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = get_llm(self.provider, self.api_key, self.model)
+        return self._client
+
+    def acquire(self) -> bool:
+        """Reserve an in-flight slot; False at LLM_MAX_IN_FLIGHT_PER_PROVIDER."""
+        with self._in_flight_lock:
+            if self._in_flight >= settings.LLM_MAX_IN_FLIGHT_PER_PROVIDER:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self, _future=None):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before hedging: p95 once we have enough samples."""
+        if self.latency.count() < settings.LLM_HEDGE_MIN_SAMPLES:
+            return settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return self.latency.percentile(settings.LLM_HEDGE_PERCENTILE) or settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+
+    def invoke(self, prompt: str, task: Optional[str] = None, schema: Optional[ReplySchema] = None) -> Any:
+        start = time.perf_counter()
+        try:
+            llm = self.client()
+            if schema is not None:
+                result = structured_invoke(llm, prompt, schema, self._structured)
+            else:
+                result = llm.invoke(prompt) if hasattr(llm, "invoke") else llm(prompt)
+        except Exception:
+            self.breaker.record_failure()
+            record_attempt(task, self.provider, self.model, time.perf_counter() - start, ok=False)
+            raise
+        elapsed = time.perf_counter() - start
+        self.latency.record(elapsed)
+        self.breaker.record_success()
+        record_attempt(task, self.provider, self.model, elapsed, ok=True, response=result)
+        return result
+
+
+class LLMRouter:
+    def __init__(self, chain: List[Tuple[str, Optional[str]]], max_workers: int = 32):
+        self._slots: Dict[Tuple[str, Optional[str], Optional[str]], ProviderSlot] = {}
+        self._lock = threading.Lock()
+        self.chain = [self._slot(p, m) for p, m in chain]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Routed calls currently waiting on a provider (a load signal for callers that can skip the LLM)."""
+        return self._in_flight
+
+    def _slot(self, provider: str, model: Optional[str], api_key: Optional[str] = None) -> ProviderSlot:
+        key = (provider, model, api_key)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = ProviderSlot(provider, model, api_key)
+            return slot
+
+    def candidates(self, provider: Optional[str] = None, model: Optional[str] = None,
+                   api_key: Optional[str] = None,
+                   chain: Optional[List[Tuple[str, Optional[str]]]] = None) -> List[ProviderSlot]:
+        """
+        Preferred provider first, then `chain` (e.g. a model tier), then the
+        default chain as a last resort; only providers with credentials.
+        """
+        ordered = []
+        if provider:
+            provider = provider.lower()
+            if api_key and api_key == getattr(settings, PROVIDER_KEYS.get(provider, ""), None):
+                api_key = None  # default key: share the chain slot's breaker and stats
+            ordered.append(self._slot(provider, model, api_key))
+        routed = [self._slot(p, m) for p, m in chain or []]
+        for slot in routed + self.chain:
+            if slot not in ordered:  # other models of a forced provider still serve as failover
+                ordered.append(slot)
+
+        def has_credentials(slot: ProviderSlot) -> bool:
+            key_name = PROVIDER_KEYS.get(slot.provider)
+            return bool(slot.api_key or key_name is None or getattr(settings, key_name, None))
+
+        usable = [s for s in ordered if has_credentials(s)]
+        # Nothing configured (dev): still try the preferred provider so callers fall back as before
+        return usable or ordered[:1]
+
+    def invoke(self, prompt: str, provider: Optional[str] = None, model: Optional[str] = None,
+               api_key: Optional[str] = None, timeout: Optional[float] = None,
+               chain: Optional[List[Tuple[str, Optional[str]]]] = None, task: Optional[str] = None,
+               schema: Optional[ReplySchema] = None) -> Any:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._invoke(prompt, provider, model, api_key, timeout, chain, task, schema)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _invoke(self, prompt, provider, model, api_key, timeout, chain, task, schema) -> Any:
+        # Breakers are consulted only when a slot is actually launched, so a
+        # half-open trial is never claimed without being used.
+        queue = deque(self.candidates(provider, model, api_key, chain))
+        deadline = time.monotonic() + (timeout or settings.LLM_TIMEOUT_SECONDS)
+        pending = {}
+        errors = []
+
+        def launch() -> Optional[ProviderSlot]:
+            while queue:
+                slot = queue.popleft()
+                if not slot.acquire():
+                    errors.append(f"{slot.name}: too many calls in flight")
+                    continue
+                if slot.breaker.allow():
+                    future = self._executor.submit(slot.invoke, prompt, task, schema)
+                    future.add_done_callback(slot.release)  # also runs when the attempt is cancelled
+                    # Registered with the calling interview (if any): ending it cancels attempts still queued
+                    pending[register_current(future)] = slot
+                    return slot
+                slot.release()
+                errors.append(f"{slot.name}: circuit open")
+            return None
+
+        first = launch()
+        if first is None:
+            raise RuntimeError("No LLM provider available: " + "; ".join(errors))
+        hedge_at = time.monotonic() + first.hedge_delay()
+
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutError(f"LLM call timed out after trying {[s.name for s in pending.values()]}")
+                wait_for = max(0.0, hedge_at - now) if queue else deadline - now
+                done, _ = wait(list(pending), timeout=min(wait_for, deadline - now), return_when=FIRST_COMPLETED)
+
+                failed = False
+                for f in done:
+                    slot = pending.pop(f)
+                    try:
+                        return f.result()
+                    except CancelledError:
+                        raise  # the interview ended (interview_jobs.cancel_jobs): don't fail over
+                    except Exception as e:
+                        errors.append(f"{slot.name}: {e}")
+                        failed = True
+
+                # Fail over immediately, or hedge once the in-flight call is past its p95
+                if queue and (failed or (not done and time.monotonic() >= hedge_at)):
+                    slot = launch()
+                    if slot is not None:
+                        hedge_at = time.monotonic() + slot.hedge_delay()
+        finally:
+            # Hedge losers and timed-out attempts: drop the ones still queued (running ones finish
+            # on their own and count against their provider's in-flight cap until they do)
+            for f in pending:
+                f.cancel()
+
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            slots = list(self._slots.values())
+        return {
+            s.name: {
+                "breaker": s.breaker.state,
+                "samples": s.latency.count(),
+                "p50": s.latency.percentile(50),
+                "p95": s.latency.percentile(95),
+            }
+            for s in slots
+        }
+
+
+llm_router = LLMRouter(parse_provider_chain(settings.LLM_PROVIDER_CHAIN), settings.LLM_MAX_CONCURRENCY)
+
+
+def invoke_llm(prompt: str, provider: Optional[str] = None, model: Optional[str] = None,
+               api_key: Optional[str] = None, task: Optional[str] = None,
+               input_size: Optional[int] = None, schema: Optional[ReplySchema] = None) -> Any:
+    """
+    Route one prompt through the provider chain (hedged, with failover).
+    With a `task` (see model_routing.TASKS) and no explicit provider, the
+    model tier is picked by the task routing policy and the input size.
+    With a `schema` (see structured_output) the reply is a StructuredReply.
+    """
+    chain = None
+    if task and not provider:
+        chain = route_task(task, input_size if input_size is not None else len(prompt)).chain
+    return llm_router.invoke(prompt, provider=provider, model=model, api_key=api_key, chain=chain, task=task,
+                             schema=schema)
@@ -0,0 +1,125 @@
+# app/services/local_scoring.py
+"""
+Local (no-LLM) answer scoring with hashed n-gram vectors.
+
+Texts become L2-normalised bags of hashed word uni/bigrams (NumPy, fixed
+dimension, sublinear tf), so similarity is one dot product. An answer is
+compared with the question, the candidate's resume/JD profile and any
+reference answers (the key points the question prompts ask the model for,
+kept in Question.extra["references"]), and gets an estimated 0-10 score plus
+a decision:
+
+  - settled locally: empty / too short, clearly off-topic, or (with reference
+    answers) clearly matching a reference
+  - borderline: everything else, left to the LLM
+
+Thresholds are settings.SCORING_LOCAL_*; see scoring.score_answer for the
+tiering and benchmarks/scoring_agreement.py for checking them against LLM scores.
+"""
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from app.config import settings
+
+DIM = 1 << 14
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been being both but by can could
+did do does doing during each few for from further had has have having he her here hers him his how i if
+in into is it its just me more most my no nor not now of off on once only or other our out over own same
+she should so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your yours
+experience work working years year team teams role strong ability using use used including etc
+""".split())
+
+
+def tokenize(text: str):
+    return _TOKEN.findall((text or "").lower())
+
+
+def term_counts(text: str, weight: int = 1) -> Counter:
+    """Content-term frequencies (no stopwords, numbers or 1-2 letter tokens)."""
+    counts = Counter()
+    for tok in tokenize(text):
+        if len(tok) > 2 and tok not in STOPWORDS and not tok.isdigit():
+            counts[tok] += weight
+    return counts
+
+
+def _vector(tokens) -> np.ndarray:
+    grams = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    vec = np.zeros(DIM, dtype=np.float32)
+    if not grams:
+        return vec
+    idx = np.fromiter((zlib.crc32(g.encode()) & (DIM - 1) for g in grams), dtype=np.int64, count=len(grams))
+    np.add.at(vec, idx, 1.0)
+    np.log1p(vec, out=vec)  # sublinear tf: repeating a keyword doesn't keep paying
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def text_vector(text: str) -> np.ndarray:
+    return _vector(tokenize(text))
+
+
+@lru_cache(maxsize=512)
+def cached_vector(text: str) -> np.ndarray:
+    """For texts seen over and over (questions, resume/JD profiles, references)."""
+    return text_vector(text)
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(a @ b)  # both already unit length (or zero)
+
+
+@dataclass
+class LocalScore:
+    score: int
+    settled: bool  # True: confident enough to skip the LLM
+    reason: str  # too_short | off_topic | matches_reference | borderline
+    features: Dict[str, float] = field(default_factory=dict)
+
+
+def local_score(question: str, answer: str, profile: Optional[str] = None,
+                references: Optional[Iterable[str]] = None) -> LocalScore:
+    tokens = tokenize(answer)
+    n_words = len(tokens)
+    if n_words == 0:
+        return LocalScore(0, True, "too_short", {"words": 0})
+
+    a = _vector(tokens)
+    q_sim = cosine(a, cached_vector(question or ""))
+    p_sim = cosine(a, cached_vector(profile)) if profile else 0.0
+    refs = [r for r in (references or []) if r]
+    if len(refs) > 1:
+        refs.append("\n".join(refs))  # key points: a good answer covers all of them
+    r_sim = max((cosine(a, cached_vector(r)) for r in refs), default=None)
+
+    # Estimated 0-10 score: enough substance, on topic, and close to a reference if we have one
+    length = min(1.0, n_words / settings.SCORING_LOCAL_FULL_WORDS)
+    relevance = min(1.0, max(q_sim, p_sim) / settings.SCORING_LOCAL_FULL_RELEVANCE)
+    if r_sim is None:
+        est = 10 * (0.5 * length + 0.5 * relevance)
+    else:
+        est = 10 * (0.3 * length + 0.2 * relevance + 0.5 * min(1.0, r_sim / settings.SCORING_LOCAL_HIGH_SIMILARITY))
+    est = int(round(est))
+
+    features = {"words": n_words, "question_sim": round(q_sim, 4), "profile_sim": round(p_sim, 4)}
+    if r_sim is not None:
+        features["reference_sim"] = round(r_sim, 4)
+
+    if n_words < settings.SCORING_LOCAL_MIN_WORDS:
+        return LocalScore(min(est, 2), True, "too_short", features)
+    if max(q_sim, p_sim) < settings.SCORING_LOCAL_LOW_RELEVANCE:
+        return LocalScore(min(est, 2), True, "off_topic", features)
+    if r_sim is not None and r_sim >= settings.SCORING_LOCAL_HIGH_SIMILARITY and length >= 0.5:
+        return LocalScore(max(est, 7), True, "matches_reference", features)
+    return LocalScore(est, False, "borderline", features)
@@ -0,0 +1,219 @@
+# app/services/match_index.py
+"""
+In-memory TF-IDF term-vector indexes over resumes and job descriptions, for
+ranking one document against many (see routers/match.py).
+
+Each document is stored once as a sparse vector of hashed content-term
+uni/bigrams (sublinear tf). Document frequencies are kept per hashed term, so
+IDF is always current; ranking is a handful of NumPy ops over the
+concatenated sparse rows (a CSR mat-vec via np.add.reduceat), no per-document
+Python loop.
+
+The indexes load lazily from the database on first use and are updated
+incrementally: uploads call upsert(), and rows written by other workers are
+picked up every MATCH_INDEX_REFRESH_SECONDS; get() of an id the index hasn't
+seen yet loads that one row right away.
+"""
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.content import Resume, JobDescription
+from app.services.local_scoring import STOPWORDS, tokenize, term_counts
+from app.services.skill_extractor import extract_skills
+
+DIM = 1 << 18
+KEY_TERMS = 60
+
+
+def sparse_terms(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(hashed term ids, sublinear tf) for content-term uni/bigrams."""
+    tokens = [t for t in tokenize(text) if len(t) > 2 and t not in STOPWORDS and not t.isdigit()]
+    grams = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    if not grams:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    ids = np.fromiter((zlib.crc32(g.encode()) & (DIM - 1) for g in grams), dtype=np.int64, count=len(grams))
+    uniq, counts = np.unique(ids, return_counts=True)
+    return uniq, (1.0 + np.log(counts)).astype(np.float32)
+
+
+def key_terms(text: str) -> Dict[str, int]:
+    """Most frequent content terms, used to explain a match."""
+    return dict(term_counts(text).most_common(KEY_TERMS))
+
+
+@dataclass
+class Doc:
+    id: int
+    user_id: Optional[int]
+    label: Optional[str]
+    indices: np.ndarray
+    values: np.ndarray
+    terms: Dict[str, int]
+    skills: Counter
+
+
+class TermIndex:
+    def __init__(self, name: str, loader: Callable):
+        self.name = name
+        self._loader = loader  # (db, after_id, doc_id=None) -> rows of (id, text, user_id, label)
+        self._lock = threading.RLock()
+        self._docs: Dict[int, Doc] = {}
+        self._df = np.zeros(DIM, dtype=np.float32)
+        self._loaded = False
+        self._max_id = 0
+        self._refreshed_at = 0.0
+        self._compiled = None  # (ids, indices, values, offsets, user_ids), rebuilt lazily after changes
+
+    def __len__(self):
+        return len(self._docs)
+
+    # ---------- updates ----------
+    def _put(self, doc_id: int, text: str, user_id: Optional[int], label: Optional[str]):
+        old = self._docs.pop(doc_id, None)
+        if old is not None:
+            self._df[old.indices] -= 1
+        indices, values = sparse_terms(text or "")
+        if len(indices):
+            self._docs[doc_id] = Doc(doc_id, user_id, label, indices, values, key_terms(text),
+                                     extract_skills(text))
+            self._df[indices] += 1
+        self._compiled = None
+
+    def upsert(self, doc_id: int, text: str, user_id: Optional[int] = None, label: Optional[str] = None):
+        """Index a new/changed document. No-op until the index is first used (the load picks it up)."""
+        with self._lock:
+            if self._loaded:
+                self._put(doc_id, text, user_id, label)
+
+    def _ensure_loaded(self):
+        if self._loaded and time.monotonic() - self._refreshed_at < settings.MATCH_INDEX_REFRESH_SECONDS:
+            return
+        with self._lock:
+            db = SessionLocal()
+            try:
+                for doc_id, text, user_id, label in self._loader(db, self._max_id):
+                    if doc_id not in self._docs:
+                        self._put(doc_id, text, user_id, label)
+                    self._max_id = max(self._max_id, doc_id)
+            finally:
+                db.close()
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+    def _load_one(self, doc_id: int):
+        """Index one row now, e.g. uploaded through another worker since the last refresh."""
+        with self._lock:
+            db = SessionLocal()
+            try:
+                for _, text, user_id, label in self._loader(db, 0, doc_id=doc_id):
+                    self._put(doc_id, text, user_id, label)
+            finally:
+                db.close()
+
+    def _compile(self):
+        if self._compiled is None:
+            docs = list(self._docs.values())
+            lengths = np.array([len(d.indices) for d in docs], dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if docs else np.empty(0, dtype=np.int64)
+            self._compiled = (
+                np.array([d.id for d in docs], dtype=np.int64),
+                np.concatenate([d.indices for d in docs]) if docs else np.empty(0, dtype=np.int64),
+                np.concatenate([d.values for d in docs]) if docs else np.empty(0, dtype=np.float32),
+                offsets,
+                np.array([d.user_id if d.user_id is not None else -1 for d in docs], dtype=np.int64),
+            )
+        return self._compiled
+
+    # ---------- queries ----------
+    def get(self, doc_id: int) -> Optional[Doc]:
+        self._ensure_loaded()
+        doc = self._docs.get(doc_id)
+        if doc is None:
+            self._load_one(doc_id)  # _max_id is left alone: the next refresh still covers ids below it
+            doc = self._docs.get(doc_id)
+        return doc
+
+    def rank(self, text: str, k: int = 10, candidate_ids: Optional[Iterable[int]] = None,
+             user_id: Optional[int] = None) -> List[Tuple[Doc, float]]:
+        """Top-k documents by TF-IDF cosine similarity to `text`."""
+        q_idx, q_val = sparse_terms(text or "")
+        return self.rank_vector(q_idx, q_val, k, candidate_ids, user_id)
+
+    def rank_vector(self, q_idx: np.ndarray, q_val: np.ndarray, k: int = 10,
+                    candidate_ids: Optional[Iterable[int]] = None,
+                    user_id: Optional[int] = None) -> List[Tuple[Doc, float]]:
+        """rank() for an already-vectorised query, e.g. a Doc from the other index."""
+        self._ensure_loaded()
+        with self._lock:
+            ids, indices, values, offsets, user_ids = self._compile()
+            docs = self._docs
+            n_docs = len(ids)
+            if not n_docs:
+                return []
+            idf = np.log((n_docs + 1) / (self._df + 1)).astype(np.float32) + 1.0
+
+        if not len(q_idx):
+            return []
+        query = np.zeros(DIM, dtype=np.float32)
+        query[q_idx] = q_val * idf[q_idx]
+        query /= np.linalg.norm(query)
+
+        weights = values * idf[indices]
+        dots = np.add.reduceat(weights * query[indices], offsets)
+        norms = np.sqrt(np.add.reduceat(weights * weights, offsets))
+        scores = dots / np.maximum(norms, 1e-12)
+
+        mask = np.ones(n_docs, dtype=bool)
+        if candidate_ids is not None:
+            mask &= np.isin(ids, np.fromiter(candidate_ids, dtype=np.int64))
+        if user_id is not None:
+            mask &= user_ids == user_id
+        scores = np.where(mask, scores, -np.inf)
+
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        hits = [(docs.get(int(ids[i])), float(scores[i])) for i in top]
+        return [(d, s) for d, s in hits if d is not None]
+
+
+def _load_resumes(db, after_id: int, doc_id: Optional[int] = None):
+    q = db.query(Resume.id, Resume.raw_text, Resume.user_id, Resume.filename)
+    if doc_id is not None:
+        return q.filter(Resume.id == doc_id).all()
+    return q.filter(Resume.id > after_id).order_by(Resume.id).yield_per(500)
+
+
+def _load_jobs(db, after_id: int, doc_id: Optional[int] = None):
+    q = db.query(JobDescription.id, JobDescription.jd_text, JobDescription.user_id, JobDescription.title)
+    if doc_id is not None:
+        return q.filter(JobDescription.id == doc_id).all()
+    return q.filter(JobDescription.id > after_id).order_by(JobDescription.id).yield_per(500)
+
+
+resume_index = TermIndex("resumes", _load_resumes)
+job_index = TermIndex("jobs", _load_jobs)
+
+
+def overlapping_terms(a: Dict[str, int], b: Dict[str, int], limit: int = 15) -> List[str]:
+    """Terms prominent in both documents, most prominent first."""
+    shared = set(a) & set(b)
+    return sorted(shared, key=lambda t: -(a[t] * b[t]))[:limit]
+
+
+def overlapping_skills(a: Doc, b: Doc, limit: int = 15) -> List[str]:
+    """Dictionary skills (skill_extractor) found in both documents; shared key terms if there are none."""
+    shared = set(a.skills) & set(b.skills)
+    if not shared:
+        return overlapping_terms(a.terms, b.terms, limit)
+    return sorted(shared, key=lambda s: (-(a.skills[s] * b.skills[s]), s))[:limit]
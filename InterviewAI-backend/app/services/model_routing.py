@@ -0,0 +1,75 @@
+# app/services/model_routing.py
+"""
+Task-aware model routing.
+
+Each LLM task maps to a model tier (fast / standard / heavy) in
+settings.LLM_TASK_TIERS; each tier is a "provider:model" chain in
+settings.LLM_TIER_CHAINS. When the variable part of the input (the answer,
+the resume + JD, ...) exceeds the task's threshold in
+settings.LLM_TASK_ESCALATE_CHARS, the call is escalated one tier.
+
+Every decision is logged on the "app.llm.routing" logger for tuning.
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger("app.llm.routing")
+
+# Tasks known to the policy
+SCORE = "score"
+FOLLOW_UP = "follow_up"
+QUESTION_GENERATION = "question_generation"
+PROFILE_EXTRACTION = "profile_extraction"
+FEEDBACK = "feedback"
+TASKS = (SCORE, FOLLOW_UP, QUESTION_GENERATION, PROFILE_EXTRACTION, FEEDBACK)
+
+TIERS = ("fast", "standard", "heavy")
+
+
+@dataclass
+class RouteDecision:
+    task: str
+    tier: str
+    escalated: bool
+    input_size: int
+    chain: List[Tuple[str, Optional[str]]]
+
+
+def parse_provider_chain(chain: str) -> List[Tuple[str, Optional[str]]]:
+    """'gemini:gemini-2.5-flash,openai' -> [("gemini", "gemini-2.5-flash"), ("openai", None)]"""
+    out = []
+    for part in (chain or "").split(","):
+        part = part.strip()
+        if part:
+            provider, _, model = part.partition(":")
+            out.append((provider.strip().lower(), model.strip() or None))
+    return out
+
+
+def route_task(task: str, input_size: int = 0) -> RouteDecision:
+    """Pick the model tier (and its provider chain) for one call."""
+    tier = settings.LLM_TASK_TIERS.get(task, "standard")
+    if tier not in TIERS:
+        tier = "standard"
+
+    escalated = False
+    threshold = settings.LLM_TASK_ESCALATE_CHARS.get(task)
+    if threshold and input_size > threshold and tier != TIERS[-1]:
+        tier = TIERS[TIERS.index(tier) + 1]
+        escalated = True
+
+    decision = RouteDecision(
+        task=task,
+        tier=tier,
+        escalated=escalated,
+        input_size=input_size,
+        chain=parse_provider_chain(settings.LLM_TIER_CHAINS.get(tier, "")),
+    )
+    logger.info(
+        "llm route task=%s tier=%s escalated=%s input_chars=%d chain=%s",
+        task, tier, escalated, input_size, settings.LLM_TIER_CHAINS.get(tier, ""),
+    )
+    return decision
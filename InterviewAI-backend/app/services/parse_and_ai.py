@@ -1,16 +1,24 @@
 # app/services/parse_and_ai.py
 import io
-import pdfplumber
-import docx
 import json
 import os
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
-from app.services.llm_client import get_llm  # factory that returns a langchain-compatible LLM or None
+from app.models.interview_session import with_references
+from app.services.llm_router import invoke_llm  # provider chain with hedging + failover
+from app.services.model_routing import QUESTION_GENERATION
+from app.services.llm_metrics import timed_call, record_templated
+from app.services.structured_output import QUESTION_PLAN
+from app.services.templated_questions import templated_plan, under_load
+from app.utils.json_stream import parse_json_reply
 
 # ---------- Parsing helpers ----------
+# pdfplumber and python-docx are imported on first use: they are slow to import
+# and only the resume upload path needs them.
 def parse_pdf(file_bytes: bytes) -> str:
+    import pdfplumber
+
     text_chunks = []
     with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
         for page in pdf.pages:
@@ -20,6 +28,8 @@ def parse_pdf(file_bytes: bytes) -> str:
     return "\n\n".join(text_chunks).strip()
 
 def parse_docx(file_bytes: bytes) -> str:
+    import docx
+
     f = io.BytesIO(file_bytes)
     doc = docx.Document(f)
     paragraphs = [p.text for p in doc.paragraphs if p.text]
@@ -38,37 +48,33 @@ def parse_file(filename: str, file_bytes: bytes) -> str:
             return ""
 
 # ---------- Question generation ----------
+def extract_json_array(raw_text: str) -> List[Dict]:
+    """First complete [...] in an LLM reply."""
+    return parse_json_reply(raw_text, "array")
+
 def generate_questions_from_resume_and_jd(
     resume_text: str,
     jd_text: str,
     num_resume_q: int = 3,
     num_behavioral: int = 2,
     num_coding: int = 2,
-    provider: str = "openai",
+    provider: Optional[str] = None,
     provider_api_key: Optional[str] = None,
     model: Optional[str] = None,
 ) -> List[Dict]:
     """
     Returns list of dicts: {"qtype":..., "text":..., "extra":..., "ordinal":...}
-    Uses LLM via factory if available, else returns deterministic fallback.
+    Uses the LLM provider chain if available, else (or under load) questions
+    templated from the skills found locally in the resume and JD.
     """
-    # Build LLM client (LangChain style); may return None if not configured
-    llm = None
-    try:
-        llm = get_llm(provider=provider, api_key=provider_api_key, model=model)
-    except Exception:
-        llm = None
-
-    # Simple fallback deterministic questions if no llm or if quota exhausted
-    if not llm:
-        questions = []
-        for i in range(num_resume_q):
-            questions.append({"qtype": "resume", "text": f"Resume-based question {i+1}: Describe a project you worked on related to skill X.", "extra": None, "ordinal": i})
-        for j in range(num_behavioral):
-            questions.append({"qtype": "behavioral", "text": f"Behavioral question {j+1}: Tell me about a time you resolved a conflict.", "extra": None, "ordinal": num_resume_q + j})
-        for k in range(num_coding):
-            questions.append({"qtype": "coding", "text": f"Coding question {k+1}: Implement function to reverse a string and describe complexity.", "extra": json.dumps({"difficulty":"easy/medium"}), "ordinal": num_resume_q + num_behavioral + k})
-        return questions
+    def templated(reason: str) -> List[Dict]:
+        plan = templated_plan(resume_text, jd_text, num_resume_q, num_behavioral, num_coding)
+        for qtype in ("resume", "behavioral", "coding"):
+            record_templated(qtype, reason, sum(q["qtype"] == qtype for q in plan))
+        return plan
+
+    if under_load():
+        return templated("load")
 
     # Build prompt
     # Use a clean, structured prompt that requests JSON output
@@ -79,7 +85,8 @@ Requirements:
 - Produce exactly {num_resume_q} resume-based technical questions referencing the resume.
 - Produce exactly {num_behavioral} behavioral questions aligned with the JD.
 - Produce exactly {num_coding} coding questions (easy/medium) with a short spec in metadata.
-Return a JSON array where each element has keys: qtype (resume|behavioral|coding), text, extra (optional JSON), ordinal.
+Return a JSON array where each element has keys: qtype (resume|behavioral|coding), text, extra (optional JSON), ordinal,
+references (2-4 short key points a strong answer would cover; used for scoring, never shown).
 
 Resume:
 {resume_text}
@@ -88,50 +95,32 @@ Job Description:
 {jd_text}
     """
 
-    # Use the llm to generate text. We assume llm.call or .generate style depending on provider wrapper.
-    try:
-        # LangChain-compatible: many wrappers can be called with llm(prompt) or llm.generate
-        if hasattr(llm, "generate") or hasattr(llm, "call") or hasattr(llm, "__call__"):
+    with timed_call("generate_questions_from_resume_and_jd") as timer:
+        # Routed by task policy (or the forced provider), hedged, with failover
+        try:
+            raw = invoke_llm(prompt, provider=provider, model=model, api_key=provider_api_key,
+                             task=QUESTION_GENERATION, input_size=len(resume_text) + len(jd_text),
+                             schema=QUESTION_PLAN)
+        except Exception:
             raw = None
-            try:
-                # try typical call interface
-                raw = llm(prompt)
-            except TypeError:
-                try:
-                    raw = llm.call(prompt)
-                except Exception:
-                    raw = llm.generate([prompt])  # some use generate
-                    # extract text
-                    if hasattr(raw, "generations"):
-                        raw = raw.generations[0][0].text
-            # raw may be a dict-like response or string
-            if isinstance(raw, (dict, list)):
-                # if llm returned structured result
-                raw_text = json.dumps(raw)
-            else:
-                raw_text = str(raw)
+
+        # No LLM reply (no provider, quota exhausted, timeouts): templated questions
+        if raw is None:
+            timer.fallback()
+            return templated("fallback")
+
+        # JSON/tool mode where the provider supports it, else the first schema-valid array in the text
+        data = raw.value
+        if data:
+            # ensure ordinal
+            for idx, item in enumerate(data):
+                if item.get("ordinal") is None:
+                    item["ordinal"] = idx
+                if "extra" not in item and "metadata" in item:
+                    item["extra"] = item.get("metadata")
+                item["extra"] = with_references(item.get("extra"), item.pop("references", None))
+            return data
         else:
-            raw_text = ""
-    except Exception as e:
-        raw_text = ""
-
-    # Try to extract JSON array
-    try:
-        import re
-        m = re.search(r"(\[.*\])", raw_text, re.S)
-        json_str = m.group(1) if m else raw_text
-        data = json.loads(json_str)
-        # ensure ordinal
-        for idx, item in enumerate(data):
-            if "ordinal" not in item:
-                item["ordinal"] = idx
-            if "extra" not in item and "metadata" in item:
-                item["extra"] = item.get("metadata")
-        return data
-    except Exception:
-        # fallback if parsing fails
-        return [
-            {"qtype":"resume","text":"Describe a key project from your resume.","extra":None,"ordinal":0},
-            {"qtype":"behavioral","text":"Tell me about a time you faced a challenge.","extra":None,"ordinal":1},
-            {"qtype":"coding","text":"Implement a function that reverses a string and explain complexity.","extra":None,"ordinal":2},
-        ]
+            # fallback if parsing fails
+            timer.parse_failure()
+            return templated("fallback")
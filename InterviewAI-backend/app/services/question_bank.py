@@ -0,0 +1,251 @@
+# app/services/question_bank.py
+"""
+Persistent bank of generated questions, reused across interviews.
+
+- Every question the LLM generates for a bankable qtype (intro, behavioral,
+  coding by default; resume questions are about one candidate and are never
+  reused) is stored with the JD/profile terms it was generated for.
+- Near-duplicates are detected with MinHash signatures of the question text
+  and LSH banding, so the bank doesn't fill up with rephrasings.
+- draw() returns the best-matching question for a qtype and profile that is
+  not a near-duplicate of anything already asked in the interview; callers
+  only go to the LLM on a miss.
+
+The table is the source of truth; each process keeps an in-memory index
+that picks up rows added by other workers every QUESTION_BANK_REFRESH_SECONDS.
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.question_bank import BankQuestion
+from app.services.local_scoring import tokenize, term_counts
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = np.uint64(4294967291)  # largest prime < 2**32: signatures fit in uint32
+_rng = np.random.RandomState(20241019)
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    tokens = tokenize(text)
+    shingles = set(tokens) | {a + " " + b for a, b in zip(tokens, tokens[1:])}
+    if not shingles:
+        return np.full(NUM_PERM, int(_PRIME), dtype=np.uint32)
+    h = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((h[:, None] * _A + _B) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two texts' shingle sets."""
+    return float(np.mean(a == b))
+
+
+def _bands(sig: np.ndarray):
+    for i in range(BANDS):
+        yield i, sig[i * ROWS:(i + 1) * ROWS].tobytes()
+
+
+@lru_cache(maxsize=256)
+def profile_features(resume_text: str, jd_text: str) -> FrozenSet[str]:
+    """Most frequent content terms of the JD (weighted x2) and resume."""
+    counts = term_counts(jd_text, weight=2) + term_counts(resume_text)
+    return frozenset(t for t, _ in counts.most_common(settings.QUESTION_BANK_PROFILE_FEATURES))
+
+
+@dataclass
+class BankEntry:
+    id: int
+    qtype: str
+    text: str
+    extra: Optional[str]
+    features: FrozenSet[str]
+    signature: np.ndarray
+    times_served: int = 0
+
+
+class QuestionBank:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[int, BankEntry] = {}
+        self._by_qtype: Dict[str, List[int]] = defaultdict(list)
+        self._lsh: Dict[tuple, set] = defaultdict(set)
+        self._max_id = 0  # refresh watermark: highest id _refresh has read (local inserts leave it alone)
+        self._refreshed_at = 0.0
+
+    @property
+    def qtypes(self) -> FrozenSet[str]:
+        return frozenset(q.strip() for q in settings.QUESTION_BANK_QTYPES.split(",") if q.strip())
+
+    def serves(self, qtype: str) -> bool:
+        return settings.QUESTION_BANK_ENABLED and qtype in self.qtypes
+
+    # ---------- index ----------
+    def _index(self, entry: BankEntry):
+        self._entries[entry.id] = entry
+        self._by_qtype[entry.qtype].append(entry.id)
+        for band in _bands(entry.signature):
+            self._lsh[band].add(entry.id)
+
+    def _refresh(self, force: bool = False):
+        if not force and time.monotonic() - self._refreshed_at < settings.QUESTION_BANK_REFRESH_SECONDS:
+            return
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(BankQuestion.id, BankQuestion.qtype, BankQuestion.text, BankQuestion.extra,
+                         BankQuestion.features, BankQuestion.minhash, BankQuestion.times_served)
+                .filter(BankQuestion.id > self._max_id)
+                .order_by(BankQuestion.id)
+                .all()
+            )
+        finally:
+            db.close()
+        with self._lock:
+            for r in rows:
+                if r.id not in self._entries:
+                    self._index(BankEntry(r.id, r.qtype, r.text, r.extra, frozenset((r.features or "").split()),
+                                          np.frombuffer(r.minhash, dtype=np.uint32), r.times_served or 0))
+                self._max_id = max(self._max_id, r.id)
+            self._refreshed_at = time.monotonic()
+
+    def near_duplicate(self, signature: np.ndarray) -> Optional[BankEntry]:
+        """Most similar banked question above the duplicate threshold (LSH candidates only)."""
+        with self._lock:
+            candidates = set()
+            for band in _bands(signature):
+                candidates |= self._lsh.get(band, set())
+            best, best_sim = None, settings.QUESTION_BANK_DUP_THRESHOLD
+            for cid in candidates:
+                sim = similarity(signature, self._entries[cid].signature)
+                if sim >= best_sim:
+                    best, best_sim = self._entries[cid], sim
+            return best
+
+    # ---------- public ----------
+    def near_duplicate_of(self, text: str, others: Iterable[str]) -> bool:
+        """True if `text` is a near-duplicate of any of `others` (e.g. already asked)."""
+        sig = minhash(text)
+        return any(similarity(sig, minhash(o)) >= settings.QUESTION_BANK_DUP_THRESHOLD for o in others if o)
+
+    def add(self, qtype: str, text: str, extra: Optional[str], features: Iterable[str]) -> Optional[int]:
+        """Bank a generated question; a near-duplicate just widens the existing entry's features."""
+        if not self.serves(qtype) or not text:
+            return None
+        try:
+            return self._add(qtype, text, extra, features)
+        except Exception as e:
+            # The bank is an optimisation: never fail question generation over it
+            print(f"question bank: add failed: {e}")
+            return None
+
+    def _add(self, qtype: str, text: str, extra: Optional[str], features: Iterable[str]) -> Optional[int]:
+        self._refresh()
+        if extra is not None and not isinstance(extra, str):
+            extra = json.dumps(extra)
+        features = frozenset(features)
+        signature = minhash(text)
+        db = SessionLocal()
+        try:
+            existing = self.near_duplicate(signature)
+            if existing is not None:
+                merged = existing.features | features
+                if merged != existing.features:
+                    db.execute(update(BankQuestion).where(BankQuestion.id == existing.id)
+                               .values(features=" ".join(sorted(merged))))
+                    db.commit()
+                    existing.features = merged
+                return existing.id
+            row = BankQuestion(qtype=qtype, text=text, extra=extra, features=" ".join(sorted(features)),
+                               minhash=signature.tobytes())
+            db.add(row)
+            db.commit()
+            with self._lock:
+                self._index(BankEntry(row.id, qtype, text, extra, features, signature))
+            return row.id
+        finally:
+            db.close()
+
+    def draw(self, qtype: str, features: Iterable[str], asked: Iterable[str] = (),
+             min_match: Optional[float] = None, exclude_ids: Iterable[int] = ()) -> Optional[BankEntry]:
+        """
+        Best banked question of `qtype` for a profile, never a near-duplicate
+        of an `asked` question. None on a miss (caller falls back to the LLM).
+        """
+        if not self.serves(qtype):
+            return None
+        try:
+            return self._draw(qtype, features, asked, min_match, exclude_ids)
+        except Exception as e:
+            print(f"question bank: draw failed: {e}")
+            return None
+
+    def _draw(self, qtype, features, asked, min_match, exclude_ids) -> Optional[BankEntry]:
+        self._refresh()
+        features = frozenset(features)
+        min_match = settings.QUESTION_BANK_MIN_MATCH if min_match is None else min_match
+        exclude_ids = set(exclude_ids)
+        asked_sigs = [minhash(t) for t in asked if t]
+        with self._lock:
+            ids = [i for i in self._by_qtype.get(qtype, []) if i not in exclude_ids]
+            if not ids:
+                return None
+            entries = [self._entries[i] for i in ids]
+        if asked_sigs:
+            sigs = np.stack([e.signature for e in entries])
+            asked_arr = np.stack(asked_sigs)
+            # (entries, asked) estimated Jaccard in one shot
+            repeated = ((sigs[:, None, :] == asked_arr[None, :, :]).mean(axis=2)
+                        >= settings.QUESTION_BANK_DUP_THRESHOLD).any(axis=1)
+            entries = [e for e, r in zip(entries, repeated) if not r]
+
+        scored = []
+        for e in entries:
+            match = len(e.features & features) / min(len(e.features), len(features)) if e.features and features else 0.0
+            if match >= min_match:
+                scored.append((match, -e.times_served, random.random(), e))
+        if not scored:
+            return None
+        best = max(scored, key=lambda s: s[:3])[3]
+        self._mark_served(best)
+        return best
+
+    def draw_many(self, qtype: str, features: Iterable[str], n: int, asked: Iterable[str] = ()) -> List[BankEntry]:
+        picked: List[BankEntry] = []
+        asked = list(asked)
+        while len(picked) < n:
+            entry = self.draw(qtype, features, asked=asked, exclude_ids=[p.id for p in picked])
+            if entry is None:
+                break
+            picked.append(entry)
+            asked.append(entry.text)
+        return picked
+
+    def _mark_served(self, entry: BankEntry):
+        entry.times_served += 1
+        db = SessionLocal()
+        try:
+            db.execute(update(BankQuestion).where(BankQuestion.id == entry.id)
+                       .values(times_served=BankQuestion.times_served + 1))
+            db.commit()
+        except Exception as e:
+            print(f"question bank: could not update times_served: {e}")
+        finally:
+            db.close()
+
+
+question_bank = QuestionBank()
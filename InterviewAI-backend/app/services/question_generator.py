@@ -1,36 +1,78 @@
 # app/services/question_generator.py
-from typing import Dict, Optional
-import json
-import re
-from app.services.llm_client import get_llm
+from typing import Dict, List, Optional
+from app.services.llm_router import invoke_llm
+from app.services.structured_output import ReplySchema, NEXT_QUESTION, FOLLOW_UP_QUESTION
+from app.services.question_bank import question_bank, profile_features
+from app.services.templated_questions import templated_question, under_load
+from app.utils.json_stream import parse_json_reply
+from app.services.model_routing import QUESTION_GENERATION, FOLLOW_UP
+from app.services.llm_metrics import timed_call, record_templated
 from app.models.content import Question, Answer
+from app.models.interview_session import with_references
 from app.config import settings
 
 
+def _default_credentials(provider: Optional[str], api_key: Optional[str], model: Optional[str]):
+    """Default api key + model from config for the given provider."""
+    if provider == "openai" and not api_key:
+        api_key = settings.OPENAI_API_KEY
+        model = model or "gpt-4o-mini"
+        # model = model or "gpt-3.5-turbo"
+
+    if provider == "gemini" and not api_key:
+        api_key = settings.GEMINI_API_KEY
+        # model = model or "gemini-pro"
+        model = model or "gemini-2.5-flash"
+    return api_key, model
+
+
+def extract_json_object(raw_text: str) -> Dict:
+    """First complete {...} in an LLM reply (models often wrap JSON in prose or fences)."""
+    return parse_json_reply(raw_text, "object")
+
+
+def _ask_llm_for_json(prompt: str, provider: Optional[str], api_key: Optional[str], model: Optional[str],
+                      task: Optional[str] = None, input_size: Optional[int] = None,
+                      call_site: str = "generate_next_question",
+                      schema: ReplySchema = NEXT_QUESTION) -> Optional[Dict]:
+    """Invoke the LLM for a `schema`-valid JSON object. None on any failure."""
+    with timed_call(call_site) as timer:
+        try:
+            # Routed by task unless a provider is forced; slow or failing providers are hedged/failed over.
+            # JSON/tool mode where the provider supports it, else parsed (and validated) from the text.
+            reply = invoke_llm(prompt, provider=provider, model=model, api_key=api_key,
+                               task=task, input_size=input_size, schema=schema)
+        except Exception as e:
+            print(f"LLM Exception: {e}")
+            timer.fallback()
+            return None
+
+        if reply.value is None:
+            print("⚠️ LLM parsing failed, fallback used:", (reply.content or "")[:200])
+            timer.parse_failure()
+            return None
+        return reply.value
+
+
 def generate_next_question(
     interview,
     resume_text: str,
     jd_text: str,
     step: int,
-    provider: str = "gemini",
+    provider: Optional[str] = None,
     api_key: Optional[str] = None,
     model: Optional[str] = None,
+    history: Optional[List[Dict]] = None,
 ) -> Dict:
     """
     Generate the next question for an interview based on step & history.
+    `history` ([{q:..., a:...}]) is taken from the hot session when given,
+    otherwise it is rebuilt from interview.questions.
     Returns: {"qtype":..., "text":..., "extra":..., "ordinal":...}
     """
 
     # Default provider + api key from config
-    if provider == "openai" and not api_key:
-        api_key = settings.OPENAI_API_KEY
-        model = model or "gpt-4o-mini"
-        # model = model or "gpt-3.5-turbo"
-
-    if provider == "gemini" and not api_key:
-        api_key = settings.GEMINI_API_KEY
-        # model = model or "gemini-pro"
-        model = model or "gemini-2.5-flash"
+    api_key, model = _default_credentials(provider, api_key, model)
 
     # Decide qtype progression
     if step == 0:
@@ -43,10 +85,24 @@ def generate_next_question(
         expected_type = "coding"
 
     # Collect history (Q&A so far)
-    history = []
-    for q in interview.questions:
-        ans = next((a for a in q.answers), None)
-        history.append({"q": q.text, "a": ans.user_text if ans else ""})
+    if history is None:
+        history = []
+        for q in interview.questions:
+            ans = next((a for a in q.answers), None)
+            history.append({"q": q.text, "a": ans.user_text if ans else ""})
+
+    # Reuse a banked question for this profile when there is a good, not-yet-asked match
+    asked = [h.get("q") for h in history]
+    if question_bank.serves(expected_type):
+        features = profile_features(resume_text or "", jd_text or "")
+        banked = question_bank.draw(expected_type, features, asked=asked)
+        if banked is not None:
+            return {"qtype": expected_type, "text": banked.text, "extra": banked.extra, "ordinal": step + 1}
+
+    # Shedding load: an instant question about this candidate's skills instead of queueing for the LLM
+    if under_load():
+        record_templated(expected_type, "load")
+        return {**templated_question(expected_type, resume_text, jd_text, asked=asked), "ordinal": step + 1}
 
     history_text = "\n".join(
         [f"Q{i}: {h['q']}\nA{i}: {h.get('a','')}" for i, h in enumerate(history)]
@@ -76,42 +132,64 @@ Rules:
   - qtype: one of [intro, resume, behavioral, coding]
   - text: the question
   - extra: optional metadata
+  - references: 2-4 short key points a strong answer would cover (used for scoring, never shown)
     """
 
-    try:
-        llm = get_llm(provider, api_key, model)
-    except Exception as e:
-        print(f"LLM Exception: {e}")
-        llm = None
+    q = _ask_llm_for_json(prompt, provider, api_key, model, task=QUESTION_GENERATION,
+                          input_size=len(resume_text) + len(jd_text) + len(history_text))
+    if q:
+        q["ordinal"] = step + 1
+        q["extra"] = with_references(q.get("extra"), q.pop("references", None))
+        if not q.get("qtype"):
+            q["qtype"] = expected_type
+        if question_bank.serves(q["qtype"]):
+            features = profile_features(resume_text or "", jd_text or "")
+            if asked and question_bank.near_duplicate_of(q["text"], asked):
+                # The model repeated itself: any unasked banked question of this type beats a repeat
+                banked = question_bank.draw(q["qtype"], features, asked=asked, min_match=0.0)
+                if banked is not None:
+                    return {"qtype": q["qtype"], "text": banked.text, "extra": banked.extra, "ordinal": step + 1}
+            question_bank.add(q["qtype"], q["text"], q.get("extra"), features)
+        return q
+
+    # Fallback: templated from the skills found locally in the resume/JD
+    record_templated(expected_type, "fallback")
+    return {**templated_question(expected_type, resume_text, jd_text, asked=asked), "ordinal": step + 1}
+
+
+def generate_follow_up_question(
+    question_text: str,
+    answer_text: str,
+    qtype: str,
+    step: int,
+    provider: Optional[str] = None,
+    api_key: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Dict:
+    """
+    Ask one probing follow-up on a shallow answer.
+    Only the last Q&A pair goes into the prompt, so this is a small, cheap call.
+    Returns: {"qtype":..., "text":..., "extra":..., "ordinal":...}
+    """
+    api_key, model = _default_credentials(provider, api_key, model)
 
-    if llm:
-        try:
-            # Always use invoke(), with safe fallback
-            raw = llm.invoke(prompt) if hasattr(llm, "invoke") else llm(prompt)
-            raw_text = getattr(raw, "content", None) or str(raw)
-
-            match = re.search(r"(\{.*\})", raw_text, re.S)
-            json_str = match.group(1) if match else raw_text
-            q = json.loads(json_str)
-
-            q["ordinal"] = step + 1
-            if "qtype" not in q:
-                q["qtype"] = expected_type
-            return q
-        except Exception as e:
-            print("⚠️ LLM parsing failed, fallback used:", e)
-
-    # Fallback deterministic
-    fallback_map = {
-        "intro": "Tell me about yourself.",
-        "resume": "Can you describe a project from your resume that you are proud of?",
-        "behavioral": "Tell me about a time you resolved a conflict at work.",
-        "coding": "Implement a function to reverse a string and explain its complexity.",
-    }
-
-    return {
-        "qtype": expected_type,
-        "text": fallback_map.get(expected_type, "Tell me something interesting about yourself."),
-        "extra": None,
-        "ordinal": step + 1,
-    }
+    prompt = f"""
+You are a professional interviewer. The candidate gave a shallow answer.
+
+Question ({qtype}):
+{question_text}
+
+Candidate answer:
+{answer_text or "(no answer)"}
+
+Ask ONE short follow-up question that makes the candidate go deeper
+(concrete examples, trade-offs, their own contribution).
+Response must be valid JSON object with keys:
+  - text: the follow-up question
+    """
+
+    q = _ask_llm_for_json(prompt, provider, api_key, model, task=FOLLOW_UP,
+                          input_size=len(question_text) + len(answer_text or ""),
+                          call_site="generate_follow_up_question", schema=FOLLOW_UP_QUESTION)
+    text = (q or {}).get("text") or "Could you go into more detail, with a concrete example from your own work?"
+    return {"qtype": qtype, "text": text, "extra": None, "ordinal": step + 1}
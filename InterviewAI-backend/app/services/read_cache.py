@@ -0,0 +1,74 @@
+# app/services/read_cache.py
+"""
+In-process LRU of serialized read responses for records that don't change
+once written (resumes, job descriptions, finished interviews' history).
+
+Entries hold the JSON body with its ETag / Last-Modified, so a repeat view is
+a dict lookup, and a revalidation (If-None-Match) is a 304 without touching
+the DB or re-serializing. Bounded by entry count and total body bytes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Hashable, Optional
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    last_modified: Optional[str]  # HTTP-date
+
+    @classmethod
+    def build(cls, body: bytes, last_modified: Optional[datetime] = None) -> "CachedBody":
+        # Weak: the identity, gzip and br encodings of the body (utils/compression.py) share it
+        etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        http_date = None
+        if last_modified is not None:
+            # Stored timestamps are naive UTC
+            http_date = format_datetime(last_modified.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True)
+        return cls(body, etag, http_date)
+
+
+class ReadCache:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: CachedBody) -> CachedBody:
+        if self.max_entries <= 0 or len(entry.body) > self.max_bytes:
+            return entry
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._data[key] = entry
+            self._bytes += len(entry.body)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted.body)
+        return entry
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+
+
+read_cache = ReadCache(settings.READ_CACHE_MAX_ENTRIES, settings.READ_CACHE_MAX_BYTES)
@@ -3,10 +3,6 @@ from typing import Optional
 import math
 
 
-# def score_answer(user_answer: str, ...):
-#     pass
-
-
 def score_text_answer(user_text: str, reference: Optional[str] = None) -> int:
     """
     Very simple heuristic scoring: length & presence of keywords (placeholder).
@@ -32,9 +28,16 @@ def aggregate_scores(tech_scores: list[int], behavioral_scores: list[int], codin
 
 
 # app/services/scoring.py
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List
+from concurrent.futures import ThreadPoolExecutor
 import json
-from app.services.llm_client import get_llm
+import random
+from app.config import settings
+from app.services.llm_router import invoke_llm
+from app.services.model_routing import SCORE
+from app.services.llm_metrics import timed_call, record_scoring, record_agreement
+from app.services.structured_output import SCORE_REPLY, BATCH_SCORE_REPLY
+from app.services.local_scoring import local_score
 
 
 def score_with_llm(
@@ -42,19 +45,18 @@ def score_with_llm(
     user_answer: str,
     qtype: str = "general",
     reference: Optional[str] = None,
-    provider: str = "gemini",
-    model: str = "gemini-2.5-flash"
-) -> Dict[str, int]:
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    fallback: bool = True,
+) -> Optional[int]:
     """
     Ask the LLM to evaluate the candidate's answer.
-    Returns a dict of scores like:
-      {"technical_score": 7, "behavioral_score": 5, "coding_score": 0, "overall_score": 6}
+    Returns an overall score 0-10 (Answer.score); if the LLM fails, a
+    word-count heuristic, or None when fallback=False.
     """
 
     if not user_answer or user_answer.strip() == "":
-        return {"technical_score": 0, "behavioral_score": 0, "coding_score": 0, "overall_score": 0}
-
-    llm = get_llm(provider=provider, model=model)
+        return 0
 
     prompt = f"""
     You are an expert interview evaluator. 
@@ -71,13 +73,165 @@ def score_with_llm(
     }}
     """
 
-    try:
-        response = llm.invoke(prompt)
-        text = response.content if hasattr(response, "content") else str(response)
-        scores = json.loads(text)
-        return  int(scores.get("score", 0))
-        
-    except Exception as e:
+    with timed_call("score_with_llm") as timer:
+        try:
+            # Model tier picked by the routing policy unless a provider is forced
+            response = invoke_llm(prompt, provider=provider, model=model,
+                                  task=SCORE, input_size=len(user_answer), schema=SCORE_REPLY)
+        except Exception:
+            response = None
+            timer.fallback()
+
+        if response is not None:
+            if response.value is not None:
+                return max(0, min(10, int(response.value["score"])))
+            timer.parse_failure()
+
+        if not fallback:
+            return None
         # fallback: simple heuristic
         base = min(10, max(1, len(user_answer.split()) // 10))
-        return base
\ No newline at end of file
+        return base
+
+
+_shadow_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="score-shadow")
+
+
+def _shadow_check(question_text: str, user_answer: str, qtype: str, reason: str, local: int):
+    llm = score_with_llm(question_text, user_answer, qtype=qtype, fallback=False)
+    if llm is not None:
+        record_agreement(qtype, reason, local, llm)
+
+
+def score_answer(
+    question_text: str,
+    user_answer: str,
+    qtype: str = "general",
+    profile: Optional[str] = None,
+    references: Optional[Iterable[str]] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    defer: Optional[bool] = None,
+) -> Optional[int]:
+    """
+    Common scoring entry point for text answers (settings.SCORING_MODE):
+      - "tiered": hashed n-gram scoring against the question, the resume/JD
+        profile and reference answers; clear-cut answers are settled locally,
+        borderline ones go to the LLM
+      - "llm": always the LLM;  "local": never the LLM
+    With `defer` (default settings.SCORING_DEFERRED) answers that would go
+    to the LLM return None instead; score_answers_batch scores them at the end.
+    """
+    mode = settings.SCORING_MODE
+    defer = settings.SCORING_DEFERRED if defer is None else defer
+    if mode == "llm":
+        if defer and user_answer and user_answer.strip():
+            record_scoring("deferred", "forced")
+            return None
+        record_scoring("llm", "forced")
+        return score_with_llm(question_text, user_answer, qtype=qtype, provider=provider, model=model)
+
+    references = list(references or [])
+    local = local_score(question_text, user_answer, profile=profile, references=references)
+    if defer and mode != "local" and not local.settled:
+        record_scoring("deferred", local.reason)
+        return None
+    if mode == "local" or local.settled:
+        record_scoring("local", local.reason)
+        if local.reason != "too_short" and random.random() < settings.SCORING_SHADOW_RATE:
+            _shadow_executor.submit(_shadow_check, question_text, user_answer, qtype, local.reason, local.score)
+        return local.score
+
+    score = score_with_llm(question_text, user_answer, qtype=qtype, reference="\n".join(references) or None,
+                           provider=provider, model=model, fallback=False)
+    if score is None:
+        # LLM unavailable: the local estimate beats the word-count heuristic
+        record_scoring("local", "llm_unavailable")
+        return local.score
+    record_scoring("llm", local.reason)
+    record_agreement(qtype, local.reason, local.score, score)
+    return score
+
+
+def _batch_prompt(items: List[Dict]) -> str:
+    blocks = "\n".join(
+        f"### Answer id={it['id']}\nQuestion type: {it.get('qtype') or 'general'}\n"
+        f"Question: {it['question']}\nCandidate Answer: {it['answer']}\n"
+        for it in items
+    )
+    return f"""
+    You are an expert interview evaluator.
+    Score each candidate answer below on its own, as an integer from 0 to 10.
+
+    Respond in strict JSON: an array with one element per answer,
+    [{{"id": <answer id>, "score": <int>}}, ...]
+
+{blocks}
+    """
+
+
+def _chunks(items: List[Dict]) -> List[List[Dict]]:
+    """Greedy packing under the per-prompt character budget and item cap."""
+    budget = settings.SCORING_BATCH_MAX_CHARS
+    chunks, current, size = [], [], 0
+    for it in items:
+        # One answer bigger than the whole budget still gets scored, truncated
+        it = dict(it, answer=it["answer"][:budget])
+        n = len(it["question"]) + len(it["answer"])
+        if current and (size + n > budget or len(current) >= settings.SCORING_BATCH_MAX_ITEMS):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(it)
+        size += n
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _score_chunk(chunk: List[Dict], provider: Optional[str], model: Optional[str]) -> Dict[int, int]:
+    prompt = _batch_prompt(chunk)
+    with timed_call("score_answers_batch") as timer:
+        try:
+            reply = invoke_llm(prompt, provider=provider, model=model, task=SCORE,
+                               input_size=sum(len(it["answer"]) for it in chunk), schema=BATCH_SCORE_REPLY)
+        except Exception:
+            timer.fallback()
+            return {}
+        if reply.value is None:
+            timer.parse_failure()
+            return {}
+    wanted = {it["id"] for it in chunk}
+    return {r["id"]: max(0, min(10, int(r["score"]))) for r in reply.value if r["id"] in wanted}
+
+
+def score_answers_batch(items: List[Dict], provider: Optional[str] = None,
+                        model: Optional[str] = None) -> Dict[int, int]:
+    """
+    Score many answers with as few LLM calls as the context allows.
+    items: [{"id", "question", "answer", "qtype"}]. Chunks are scored
+    concurrently; answers the LLM skipped (or a failed chunk) get the local
+    estimate. Returns {id: score} for every item.
+    """
+    scores: Dict[int, int] = {}
+    pending = []
+    for it in items:
+        if not (it.get("answer") or "").strip():
+            scores[it["id"]] = 0
+        else:
+            pending.append(it)
+    if not pending:
+        return scores
+
+    chunks = _chunks(pending)
+    workers = max(1, min(len(chunks), settings.SCORING_BATCH_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="score-batch") as pool:
+        for result in pool.map(lambda c: _score_chunk(c, provider, model), chunks):
+            scores.update(result)
+
+    for it in pending:
+        if it["id"] not in scores:
+            record_scoring("local", "batch_missing")
+            scores[it["id"]] = local_score(it["question"], it["answer"]).score
+        else:
+            record_scoring("llm", "batch")
+    return scores
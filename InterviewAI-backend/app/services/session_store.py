@@ -0,0 +1,181 @@
+# app/services/session_store.py
+"""
+Hot-session cache for active interviews.
+
+Writes go to the DB first (routers commit as before) and are then mirrored
+into the cache (write-through). Sessions are evicted when an interview ends
+or expires. Backends:
+  - "memory": per-process LRU (default). With several workers a cached
+              session can fall behind the DB; get_current_session catches that
+              before a step that depends on the question count.
+  - "redis":  shared across workers, keyed by interview id with a TTL
+  - "none":   disabled, always rebuilt from the DB
+"""
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.content import Interview, Question, Answer, Resume, JobDescription
+from app.models.interview_session import InterviewSession, extra_references
+
+
+class MemorySessionStore:
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._data: "OrderedDict[int, InterviewSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, interview_id: int) -> Optional[InterviewSession]:
+        with self._lock:
+            session = self._data.get(interview_id)
+            if session is not None:
+                self._data.move_to_end(interview_id)
+            return session
+
+    def put(self, session: InterviewSession):
+        with self._lock:
+            self._data[session.interview_id] = session
+            self._data.move_to_end(session.interview_id)
+            while len(self._data) > self.max_sessions:
+                self._data.popitem(last=False)
+
+    def delete(self, interview_id: int):
+        with self._lock:
+            self._data.pop(interview_id, None)
+
+
+class RedisSessionStore:
+    KEY_PREFIX = "interview_session:"
+
+    def __init__(self, url: str, default_ttl: int = 3600):
+        import redis  # optional: only needed for the shared backend
+
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+
+    def _key(self, interview_id: int) -> str:
+        return f"{self.KEY_PREFIX}{interview_id}"
+
+    def get(self, interview_id: int) -> Optional[InterviewSession]:
+        raw = self.client.get(self._key(interview_id))
+        return InterviewSession.from_dict(json.loads(raw)) if raw else None
+
+    def put(self, session: InterviewSession):
+        ttl = self.default_ttl
+        if session.expires_at:
+            ttl = max(1, int((session.expires_at - datetime.utcnow()).total_seconds()))
+        self.client.set(self._key(session.interview_id), json.dumps(session.to_dict()), ex=ttl)
+
+    def delete(self, interview_id: int):
+        self.client.delete(self._key(interview_id))
+
+
+class NullSessionStore:
+    def get(self, interview_id: int) -> Optional[InterviewSession]:
+        return None
+
+    def put(self, session: InterviewSession):
+        pass
+
+    def delete(self, interview_id: int):
+        pass
+
+
+def _build_store():
+    backend = (settings.SESSION_BACKEND or "memory").lower()
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("SESSION_BACKEND=redis requires REDIS_URL")
+        return RedisSessionStore(settings.REDIS_URL)
+    if backend == "none":
+        return NullSessionStore()
+    return MemorySessionStore(settings.SESSION_CACHE_MAX)
+
+
+session_store = _build_store()
+
+
+# ------------------------------
+# Load / write-through helpers
+# ------------------------------
+
+def load_session_from_db(interview: Interview, db: Session) -> InterviewSession:
+    """Build a session from the DB (cold path: reads resume/JD text once)."""
+    resume_text = ""
+    jd_text = ""
+    if interview.resume_id:
+        resume_text = db.query(Resume.raw_text).filter(Resume.id == interview.resume_id).scalar() or ""
+    if interview.job_description_id:
+        jd_text = db.query(JobDescription.jd_text).filter(JobDescription.id == interview.job_description_id).scalar() or ""
+
+    rows = (
+        db.query(Question.id, Question.text, Question.qtype, Question.extra)
+        .filter(Question.interview_id == interview.id)
+        .order_by(Question.ordinal)
+        .all()
+    )
+    answers = {
+        row.question_id: row
+        for row in db.query(Answer.question_id, Answer.user_text, Answer.score)
+        .filter(Answer.interview_id == interview.id)
+        .all()
+    }
+    session = InterviewSession(
+        interview_id=interview.id,
+        user_id=interview.user_id,
+        resume=resume_text,
+        jd=jd_text,
+        started_at=interview.started_at,
+        expires_at=interview.expires_at,
+        is_active=bool(interview.is_active),
+        mode=interview.mode or "adaptive",
+        # question_plan is deferred: only planned interviews pay for loading it
+        plan=json.loads(interview.question_plan) if interview.mode == "planned" and interview.question_plan else [],
+        plan_cursor=interview.plan_cursor or 0,
+    )
+    for qid, text, qtype, extra in rows:
+        session.add_question(qid, text, qtype, follow_up=bool(extra and '"follow_up_to"' in extra),
+                             references=extra_references(extra))
+        ans = answers.get(qid)
+        if ans:
+            session.record_answer(qid, ans.user_text or "", ans.score)
+    return session
+
+
+def get_session(interview: Interview, db: Session) -> InterviewSession:
+    """Cached session for `interview`, loading (and caching) it on a miss."""
+    session = session_store.get(interview.id)
+    if session is None:
+        session = load_session_from_db(interview, db)
+        if session.is_active:
+            session_store.put(session)
+    return session
+
+
+def get_current_session(interview: Interview, db: Session) -> InterviewSession:
+    """
+    get_session, checked against the DB: if another worker has added questions
+    since this copy was cached (memory backend, several workers), reload it
+    rather than generate a question for an ordinal that is already taken.
+    """
+    session = get_session(interview, db)
+    stored = db.query(func.max(Question.ordinal)).filter(Question.interview_id == interview.id).scalar() or 0
+    if stored != session.current_index:
+        session_store.delete(interview.id)
+        session = get_session(interview, db)
+    return session
+
+
+def save_session(session: InterviewSession):
+    session_store.put(session)
+
+
+def evict_sessions(interview_ids: Iterable[int]):
+    for interview_id in interview_ids:
+        session_store.delete(interview_id)
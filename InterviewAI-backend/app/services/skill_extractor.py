@@ -0,0 +1,222 @@
+# app/services/skill_extractor.py
+"""
+Local skill/technology extraction (no LLM).
+
+A curated dictionary of skills (canonical name, category, aliases) is
+compiled once into an Aho-Corasick automaton, so all aliases are matched in
+one linear pass over the text, whatever the dictionary size. Matches must
+sit on word boundaries ("java" does not match inside "javascript") and
+overlapping matches keep the longest ("react native" over "react").
+
+extract_profile() scans resume and JD together in a single pass and splits
+the hits by position; templated_questions.py turns the result into
+questions for the zero-LLM path.
+"""
+from collections import Counter, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# canonical name -> (category, aliases); aliases are matched case-insensitively.
+# Ambiguous words ("go", "r", "c", "express", "node", "rest") are only listed
+# in unambiguous forms.
+SKILLS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    # languages
+    "Python": ("language", ("python", "python3")),
+    "Java": ("language", ("java",)),
+    "JavaScript": ("language", ("javascript", "ecmascript", "es6")),
+    "TypeScript": ("language", ("typescript",)),
+    "C++": ("language", ("c++", "cpp")),
+    "C#": ("language", ("c#", "csharp")),
+    "Go": ("language", ("golang",)),
+    "Rust": ("language", ("rust",)),
+    "Kotlin": ("language", ("kotlin",)),
+    "Swift": ("language", ("swift",)),
+    "Ruby": ("language", ("ruby",)),
+    "PHP": ("language", ("php",)),
+    "Scala": ("language", ("scala",)),
+    "SQL": ("database", ("sql", "t-sql", "pl/sql")),
+    # frontend
+    "React": ("frontend", ("react", "react.js", "reactjs")),
+    "React Native": ("mobile", ("react native",)),
+    "Angular": ("frontend", ("angular", "angularjs")),
+    "Vue": ("frontend", ("vue", "vue.js", "vuejs")),
+    "Next.js": ("frontend", ("next.js", "nextjs")),
+    "Redux": ("frontend", ("redux",)),
+    "HTML": ("frontend", ("html", "html5")),
+    "CSS": ("frontend", ("css", "css3", "sass", "scss", "tailwind", "tailwindcss")),
+    # backend
+    "Node.js": ("backend", ("node.js", "nodejs")),
+    "Express": ("backend", ("express.js", "expressjs")),
+    "Django": ("backend", ("django",)),
+    "Flask": ("backend", ("flask",)),
+    "FastAPI": ("backend", ("fastapi",)),
+    "Spring Boot": ("backend", ("spring boot", "springboot", "spring framework")),
+    ".NET": ("backend", (".net", "asp.net", "dotnet")),
+    "Ruby on Rails": ("backend", ("rails", "ruby on rails")),
+    "REST APIs": ("backend", ("restful", "rest api", "rest apis")),
+    "GraphQL": ("backend", ("graphql",)),
+    "gRPC": ("backend", ("grpc",)),
+    "Microservices": ("backend", ("microservice", "microservices")),
+    # databases
+    "PostgreSQL": ("database", ("postgresql", "postgres")),
+    "MySQL": ("database", ("mysql", "mariadb")),
+    "MongoDB": ("database", ("mongodb", "mongo")),
+    "Redis": ("database", ("redis",)),
+    "Elasticsearch": ("database", ("elasticsearch", "opensearch")),
+    "Cassandra": ("database", ("cassandra",)),
+    "DynamoDB": ("database", ("dynamodb",)),
+    "SQLite": ("database", ("sqlite",)),
+    # data / ML
+    "Pandas": ("data", ("pandas",)),
+    "NumPy": ("data", ("numpy",)),
+    "Spark": ("data", ("spark", "pyspark", "apache spark")),
+    "Kafka": ("data", ("kafka", "apache kafka")),
+    "Airflow": ("data", ("airflow", "apache airflow")),
+    "ETL": ("data", ("etl", "elt", "data pipeline", "data pipelines")),
+    "Data Warehousing": ("data", ("data warehouse", "data warehousing", "snowflake", "bigquery", "redshift")),
+    "Machine Learning": ("ml", ("machine learning", "ml")),
+    "Deep Learning": ("ml", ("deep learning", "neural network", "neural networks")),
+    "PyTorch": ("ml", ("pytorch", "torch")),
+    "TensorFlow": ("ml", ("tensorflow", "keras")),
+    "scikit-learn": ("ml", ("scikit-learn", "sklearn")),
+    "NLP": ("ml", ("nlp", "natural language processing")),
+    "LLMs": ("ml", ("llm", "llms", "large language models", "langchain", "rag")),
+    "Computer Vision": ("ml", ("computer vision", "opencv")),
+    # cloud / devops
+    "AWS": ("cloud", ("aws", "amazon web services", "ec2", "s3", "lambda")),
+    "GCP": ("cloud", ("gcp", "google cloud")),
+    "Azure": ("cloud", ("azure",)),
+    "Docker": ("devops", ("docker", "containers", "containerization")),
+    "Kubernetes": ("devops", ("kubernetes", "k8s", "helm")),
+    "Terraform": ("devops", ("terraform", "infrastructure as code", "iac")),
+    "CI/CD": ("devops", ("ci/cd", "cicd", "continuous integration", "github actions", "jenkins", "gitlab ci")),
+    "Linux": ("devops", ("linux", "bash", "shell scripting")),
+    "Git": ("devops", ("git", "github", "gitlab")),
+    "Monitoring": ("devops", ("prometheus", "grafana", "observability", "datadog")),
+    # mobile
+    "Android": ("mobile", ("android",)),
+    "iOS": ("mobile", ("ios",)),
+    "Flutter": ("mobile", ("flutter", "dart")),
+    # testing / practices
+    "Unit Testing": ("testing", ("unit testing", "unit tests", "pytest", "junit", "jest", "tdd")),
+    "Test Automation": ("testing", ("selenium", "cypress", "playwright", "test automation")),
+    "System Design": ("practice", ("system design", "distributed systems", "scalability")),
+    "Data Structures & Algorithms": ("practice", ("data structures", "algorithms", "dsa")),
+    "Agile": ("practice", ("agile", "scrum", "kanban")),
+    "Security": ("practice", ("security", "oauth", "authentication", "owasp")),
+}
+
+
+def _boundary(ch: str) -> bool:
+    return not (ch.isalnum() or ch == "_")
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: goto/fail/output tables over lower-cased patterns."""
+
+    def __init__(self, patterns: Dict[str, str]):
+        # patterns: alias -> canonical
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]  # (pattern length, canonical)
+        for alias, canonical in patterns.items():
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(alias), canonical))
+
+        # BFS: fail links point at the longest proper suffix that is also a prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping, whole-word (start, end, canonical) matches; longest wins on overlap."""
+        lowered = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = []
+        state = 0
+        n = len(lowered)
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                after_ok = i + 1 == n or _boundary(lowered[i + 1])
+                for length, canonical in out[state]:
+                    start = i - length + 1
+                    # An alias ending in a symbol ("c++", "c#") is its own boundary
+                    if (start == 0 or _boundary(lowered[start - 1])) and (after_ok or _boundary(lowered[i])):
+                        hits.append((start, i + 1, canonical))
+
+        hits.sort(key=lambda h: (h[0], -(h[1] - h[0])))
+        kept, last_end = [], -1
+        for h in hits:
+            if h[0] >= last_end:
+                kept.append(h)
+                last_end = h[1]
+        return kept
+
+
+@lru_cache(maxsize=1)
+def _automaton() -> AhoCorasick:
+    return AhoCorasick({alias: canonical for canonical, (_, aliases) in SKILLS.items() for alias in aliases})
+
+
+def category(skill: str) -> str:
+    return SKILLS[skill][0] if skill in SKILLS else "general"
+
+
+def extract_skills(text: str) -> Counter:
+    """Canonical skill -> mention count."""
+    return Counter(canonical for _, _, canonical in _automaton().find(text or ""))
+
+
+@dataclass(frozen=True)
+class SkillProfile:
+    resume: Counter
+    jd: Counter
+
+    @property
+    def shared(self) -> List[str]:
+        """Skills on both sides, most emphasised by the JD first."""
+        return sorted(set(self.resume) & set(self.jd), key=lambda s: (-self.jd[s], -self.resume[s], s))
+
+    @property
+    def jd_only(self) -> List[str]:
+        """Skills the JD asks for that the resume does not mention."""
+        return sorted(set(self.jd) - set(self.resume), key=lambda s: (-self.jd[s], s))
+
+    @property
+    def resume_only(self) -> List[str]:
+        return sorted(set(self.resume) - set(self.jd), key=lambda s: (-self.resume[s], s))
+
+    def top(self, n: Optional[int] = None) -> List[str]:
+        """Most relevant skills overall: shared, then the JD's, then the resume's."""
+        return (self.shared + self.jd_only + self.resume_only)[:n]
+
+
+@lru_cache(maxsize=256)
+def extract_profile(resume_text: str, jd_text: str) -> SkillProfile:
+    """Resume and JD skills from one pass over both texts."""
+    resume_text = (resume_text or "").lower()  # lower() can change lengths; split on the lowered text
+    split = len(resume_text)
+    resume, jd = Counter(), Counter()
+    for start, _, canonical in _automaton().find(resume_text + "\n\n" + (jd_text or "")):
+        (resume if start < split else jd)[canonical] += 1
+    return SkillProfile(resume, jd)
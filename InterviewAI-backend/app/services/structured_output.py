@@ -0,0 +1,135 @@
+# app/services/structured_output.py
+"""
+Structured (JSON) replies from LLMs.
+
+invoke_llm(prompt, ..., schema=NEXT_QUESTION) returns a StructuredReply whose
+.value is the validated reply (plain dicts/lists) or None if the model did
+not produce one. Per provider, in order of preference
+(settings.LLM_STRUCTURED_OUTPUT):
+
+  - "native": the wrapper's with_structured_output (JSON mode / tool calling
+              for OpenAI, Gemini and Anthropic); the model cannot reply with prose.
+  - "stream": stream the reply through an IncrementalJSONParser and stop as
+              soon as a complete, schema-valid value has arrived.
+  - "off":    plain invoke, then the same parser over the full reply.
+
+Each mode falls back to the next one when the wrapper doesn't support it
+(the fake client only has invoke; a cassette client offers whatever the
+wrapped client, or the replayed recording, supports).
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.config import settings
+from app.schemas.llm import (NextQuestionReply, FollowUpReply, ScoreReply, ScoredAnswer, BatchScoreReply,
+                             PlannedQuestion, QuestionPlanReply)
+from app.utils.json_stream import IncrementalJSONParser
+
+
+@dataclass(frozen=True)
+class ReplySchema:
+    name: str
+    kind: str  # "object" | "array"
+    adapter: TypeAdapter = field(compare=False)
+    tool_model: type = field(compare=False)  # handed to with_structured_output
+    unwrap: Callable[[BaseModel], Any] = field(compare=False, default=lambda m: m)
+
+    def validate(self, value: Any) -> Any:
+        """Validate parsed JSON; returns plain python (only the fields the model set)."""
+        return self.adapter.dump_python(self.adapter.validate_python(value), exclude_unset=True)
+
+
+NEXT_QUESTION = ReplySchema("next_question", "object", TypeAdapter(NextQuestionReply), NextQuestionReply)
+FOLLOW_UP_QUESTION = ReplySchema("follow_up_question", "object", TypeAdapter(FollowUpReply), FollowUpReply)
+SCORE_REPLY = ReplySchema("score", "object", TypeAdapter(ScoreReply), ScoreReply)
+BATCH_SCORE_REPLY = ReplySchema("batch_score", "array", TypeAdapter(List[ScoredAnswer]), BatchScoreReply,
+                                unwrap=lambda m: m.scores)
+QUESTION_PLAN = ReplySchema("question_plan", "array", TypeAdapter(List[PlannedQuestion]), QuestionPlanReply,
+                            unwrap=lambda m: m.questions)
+
+
+class StructuredReply:
+    """Message-like (content / usage_metadata, for metrics) plus the validated .value."""
+
+    def __init__(self, value: Any, content: str, source: Any = None, mode: str = "off"):
+        self.value = value
+        self.content = content
+        self.mode = mode
+        self.usage_metadata = getattr(source, "usage_metadata", None)
+        self.response_metadata = getattr(source, "response_metadata", None) or {}
+
+
+def _text(message: Any) -> str:
+    content = getattr(message, "content", message)
+    if isinstance(content, list):  # Anthropic-style content blocks
+        return "".join(b.get("text", "") if isinstance(b, dict) else str(b) for b in content)
+    return content if isinstance(content, str) else str(content)
+
+
+def parse_reply(text: str, schema: ReplySchema) -> Any:
+    """Validated value from a full reply text, or None."""
+    parser = IncrementalJSONParser(schema.kind, schema.validate)
+    parser.feed(text)
+    return parser.value if parser.done else None
+
+
+def _native(llm: Any, prompt: str, schema: ReplySchema, cache: Optional[dict]) -> Optional[StructuredReply]:
+    runnable = cache.get(schema.name) if cache is not None else None
+    if runnable is None:
+        try:
+            runnable = llm.with_structured_output(schema.tool_model, include_raw=True)
+        except (NotImplementedError, AttributeError, TypeError, ValueError):
+            return None
+        if cache is not None:
+            cache[schema.name] = runnable
+    out = runnable.invoke(prompt)
+    raw = out.get("raw")
+    parsed = out.get("parsed")
+    if parsed is not None:
+        try:
+            value = schema.validate(schema.unwrap(parsed))
+            return StructuredReply(value, json.dumps(value), raw, "native")
+        except Exception:
+            pass
+    # Tool call missing or invalid: the model may still have put JSON in the text
+    text = _text(raw) if raw is not None else ""
+    return StructuredReply(parse_reply(text, schema), text, raw, "native")
+
+
+def _stream(llm: Any, prompt: str, schema: ReplySchema) -> StructuredReply:
+    parser = IncrementalJSONParser(schema.kind, schema.validate)
+    parts = []
+    usage = {}
+    stream = llm.stream(prompt)
+    try:
+        for chunk in stream:
+            text = _text(chunk)
+            parts.append(text)
+            for k, v in (getattr(chunk, "usage_metadata", None) or {}).items():
+                if isinstance(v, int):
+                    usage[k] = usage.get(k, 0) + v
+            if parser.feed(text):
+                break  # complete and valid: don't pay for the model's trailing prose
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+    source = type("StreamedMessage", (), {"usage_metadata": usage or None})()
+    return StructuredReply(parser.value if parser.done else None, "".join(parts), source, "stream")
+
+
+def structured_invoke(llm: Any, prompt: str, schema: ReplySchema, cache: Optional[dict] = None) -> StructuredReply:
+    """One structured call against one client (the router handles failover)."""
+    mode = settings.LLM_STRUCTURED_OUTPUT
+    if mode == "native" and hasattr(llm, "with_structured_output"):
+        reply = _native(llm, prompt, schema, cache)
+        if reply is not None:
+            return reply
+    if mode in ("native", "stream") and hasattr(llm, "stream"):
+        return _stream(llm, prompt, schema)
+    message = llm.invoke(prompt) if hasattr(llm, "invoke") else llm(prompt)
+    text = _text(message)
+    return StructuredReply(parse_reply(text, schema), text, message)
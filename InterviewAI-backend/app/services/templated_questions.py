@@ -0,0 +1,146 @@
+# app/services/templated_questions.py
+"""
+Zero-LLM questions: templates filled with the candidate's skills.
+
+Used when the LLM is unavailable or its reply can't be parsed, and — when
+settings.QUESTION_FAST_PATH_INFLIGHT is set — deliberately under load, when
+that many LLM calls are already in flight. Skills come from the local
+extractor (skill_extractor.extract_profile), so the questions are instant
+but still about this resume and this JD.
+"""
+import json
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from app.config import settings
+from app.services.llm_router import llm_router
+from app.services.skill_extractor import SkillProfile, category, extract_profile
+
+RESUME_TEMPLATES = {
+    "language": "Your resume mentions {skill}. What is the most complex thing you have built with it, "
+                "and which {skill} features made it easier or harder?",
+    "frontend": "You have worked with {skill}. How did you structure components and state in your largest "
+                "{skill} project, and how did you keep it fast?",
+    "backend": "Walk me through a service you built with {skill}: the API design, how you handled errors "
+               "and validation, and how it behaved under load.",
+    "database": "Tell me how you used {skill}: how you designed the data model, and a slow query or "
+                "bottleneck you tracked down.",
+    "data": "Describe a pipeline you built with {skill}. How did you handle bad or late data, and how did "
+            "you know it was working?",
+    "ml": "Tell me about your {skill} work: how you framed the problem, how you evaluated the results, and "
+          "what you would do differently now.",
+    "cloud": "How did you use {skill} in your projects? Walk me through the architecture and one cost or "
+             "reliability trade-off you made.",
+    "devops": "Describe how you used {skill}. What problem did it solve for your team, and what went wrong "
+              "along the way?",
+    "mobile": "Tell me about an app you built with {skill}: how you handled state, performance and releases.",
+    "testing": "How did you use {skill}? What did you choose to test, and what did it actually catch?",
+    "practice": "Your resume mentions {skill}. Give me a concrete example of applying it, and the outcome.",
+}
+GENERIC_RESUME = "Can you describe a project from your resume that you are proud of?"
+
+SKILL_GAP_BEHAVIORAL = ("This role uses {skill}, which isn't on your resume. Tell me about a time you had to "
+                        "get productive with an unfamiliar technology quickly. How did you go about it?")
+SKILL_BEHAVIORAL = "Tell me about a time a project involving {skill} did not go to plan. What happened, and what did you do?"
+GENERIC_BEHAVIORAL = [
+    "Tell me about a time you resolved a conflict at work.",
+    "Tell me about a time you had to deliver under a tight deadline. How did you prioritise?",
+    "Describe a piece of critical feedback you received and what you changed because of it.",
+    "Tell me about a mistake you made on a project and how you handled it.",
+]
+
+# (task, difficulty); prefixed with the candidate's main language when one is known
+CODING_TASKS = [
+    ("Implement a function that returns the first non-repeating character in a string.", "easy"),
+    ("Implement a function that groups a list of words into anagram groups.", "easy"),
+    ("Implement an LRU cache class with get and put in O(1).", "medium"),
+    ("Implement a function that merges overlapping intervals.", "medium"),
+    ("Implement a rate limiter that allows at most N calls per rolling minute per user.", "medium"),
+]
+SQL_TASK = ("Given tables orders(id, customer_id, total, created_at) and customers(id, name), write a SQL query "
+            "returning each customer's three most recent orders and their lifetime total.", "medium")
+GENERIC_CODING = "Implement a function to reverse a string and explain its complexity."
+
+
+def under_load() -> bool:
+    """True when enough LLM calls are in flight that new questions should be templated locally."""
+    limit = settings.QUESTION_FAST_PATH_INFLIGHT
+    return bool(limit) and llm_router.in_flight >= limit
+
+
+def _intro(profile: SkillProfile) -> Iterator[Tuple[str, Dict]]:
+    focus = profile.shared[:2] or profile.resume_only[:2]
+    if focus:
+        yield (f"Tell me about yourself, focusing on your experience with {' and '.join(focus)}.",
+               {"skills": focus})
+    yield "Tell me about yourself.", None
+
+
+def _resume(profile: SkillProfile) -> Iterator[Tuple[str, Dict]]:
+    for skill in profile.shared + profile.resume_only:
+        template = RESUME_TEMPLATES.get(category(skill))
+        if template:
+            yield template.format(skill=skill), {"skills": [skill]}
+    yield GENERIC_RESUME, None
+
+
+def _behavioral(profile: SkillProfile) -> Iterator[Tuple[str, Dict]]:
+    for skill in profile.jd_only[:1]:
+        yield SKILL_GAP_BEHAVIORAL.format(skill=skill), {"skills": [skill]}
+    for skill in profile.shared[:2]:
+        yield SKILL_BEHAVIORAL.format(skill=skill), {"skills": [skill]}
+    for text in GENERIC_BEHAVIORAL:
+        yield text, None
+
+
+def _coding(profile: SkillProfile) -> Iterator[Tuple[str, Dict]]:
+    languages = [s for s in profile.top() if category(s) == "language"]
+    language = languages[0] if languages else None
+    if "SQL" in profile.jd or "SQL" in profile.shared:
+        task, difficulty = SQL_TASK
+        yield task, {"difficulty": difficulty, "language": "SQL"}
+    for task, difficulty in CODING_TASKS:
+        text = f"In {language}, {task[0].lower()}{task[1:]}" if language else task
+        yield text + " Explain its time and space complexity.", {"difficulty": difficulty, "language": language}
+    yield GENERIC_CODING, {"difficulty": "easy"}
+
+
+CANDIDATES = {"intro": _intro, "resume": _resume, "behavioral": _behavioral, "coding": _coding}
+
+
+def templated_questions(qtype: str, resume_text: str, jd_text: str, n: int,
+                        asked: Iterable[str] = ()) -> List[Dict]:
+    """Up to `n` {"qtype", "text", "extra"} for `qtype`, skipping questions already `asked`."""
+    profile = extract_profile(resume_text or "", jd_text or "")
+    seen = {(a or "").strip().lower() for a in asked}
+    out = []
+    for text, extra in CANDIDATES.get(qtype, _intro)(profile):
+        if len(out) >= n:
+            break
+        if text.lower() in seen:
+            continue
+        seen.add(text.lower())
+        # "templated" keeps these out of the question bank, which is for LLM-generated questions
+        out.append({"qtype": qtype, "text": text, "extra": json.dumps(extra) if extra else None, "templated": True})
+    return out
+
+
+def templated_question(qtype: str, resume_text: str, jd_text: str, asked: Iterable[str] = ()) -> Dict:
+    """Best unasked templated question; repeats the most generic one if everything was asked."""
+    found = templated_questions(qtype, resume_text, jd_text, 1, asked)
+    if found:
+        return found[0]
+    return templated_questions(qtype, resume_text, jd_text, 99)[-1]
+
+
+def templated_plan(resume_text: str, jd_text: str, num_resume_q: int, num_behavioral: int,
+                   num_coding: int) -> List[Dict]:
+    """A whole question set (resume -> behavioral -> coding) with ordinals, as the LLM would return it."""
+    plan = []
+    for qtype, n in (("resume", num_resume_q), ("behavioral", num_behavioral), ("coding", num_coding)):
+        items = templated_questions(qtype, resume_text, jd_text, n)
+        # Short on distinct templates (e.g. no skills found): cycle through the ones we have
+        k = len(items)
+        plan += items + [dict(items[i % k]) for i in range(n - k)] if k else items
+    for i, item in enumerate(plan):
+        item["ordinal"] = i
+    return plan
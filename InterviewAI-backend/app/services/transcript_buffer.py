@@ -0,0 +1,119 @@
+# app/services/transcript_buffer.py
+"""
+Write-behind buffer for Transcript rows.
+
+Transcript segments arrive many per second per interview (interviewer and
+candidate turns, partial speech segments), so they are not committed one by
+one: append() queues them in memory and a daemon thread writes them with a
+single bulk INSERT when TRANSCRIPT_FLUSH_ROWS are pending or
+TRANSCRIPT_FLUSH_SECONDS have passed, whichever comes first.
+
+The buffer is bounded: once TRANSCRIPT_BUFFER_MAX rows are pending (e.g. the
+DB is slow), append() flushes in the caller instead of growing further. If
+the DB is down long enough for a failed batch to push it past the bound, the
+oldest rows are dropped; they are counted in `dropped` and logged.
+flush() is also called when an interview ends or expires, before transcript
+reads, and on shutdown (stop()), so nothing acknowledged is left behind.
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.content import Transcript
+
+
+class TranscriptBuffer:
+    def __init__(self, flush_rows: int, flush_seconds: float, max_rows: int):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_rows = max_rows
+        self._rows: List[Dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one bulk INSERT at a time keeps rows in arrival order
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0  # acknowledged rows lost because the DB stayed down past max_rows
+
+    def append(self, interview_id: int, speaker: str, text: str, created_at: Optional[datetime] = None) -> int:
+        """Queue one segment. Returns the number of rows pending."""
+        return self.extend([{"interview_id": interview_id, "speaker": speaker, "text": text,
+                             "created_at": created_at or datetime.utcnow()}])
+
+    def extend(self, rows: List[Dict]) -> int:
+        with self._lock:
+            self._rows.extend(rows)
+            pending = len(self._rows)
+        if pending >= self.max_rows or not self._thread:
+            self.flush()  # full (backpressure), or no flusher running: write through
+        elif pending >= self.flush_rows:
+            self._wake.set()
+        return pending
+
+    def pending(self, interview_id: Optional[int] = None) -> int:
+        with self._lock:
+            if interview_id is None:
+                return len(self._rows)
+            return sum(1 for r in self._rows if r["interview_id"] == interview_id)
+
+    def flush(self) -> int:
+        """Write everything pending in one bulk INSERT. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            db = SessionLocal()
+            try:
+                db.execute(insert(Transcript), rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                with self._lock:
+                    # Keep them for the next attempt, ahead of newer rows. Past the bound the
+                    # oldest rows (already acknowledged with 202) have to go: count them.
+                    pending = rows + self._rows
+                    dropped = max(0, len(pending) - self.max_rows)
+                    self._rows = pending[dropped:]
+                    self.dropped += dropped
+                    kept = len(self._rows)
+                print(f"Transcript flush failed, {kept} rows kept for retry"
+                      + (f", {dropped} oldest dropped ({self.dropped} in total)" if dropped else "") + f": {e}")
+                return 0
+            finally:
+                db.close()
+            return len(rows)
+
+    # ---------- background flusher ----------
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="transcript-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write out whatever is still pending."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Transcript flusher failed: {e}")
+
+
+transcript_buffer = TranscriptBuffer(settings.TRANSCRIPT_FLUSH_ROWS, settings.TRANSCRIPT_FLUSH_SECONDS,
+                                     settings.TRANSCRIPT_BUFFER_MAX)
@@ -0,0 +1,59 @@
+# app/utils/compression.py
+"""
+Response compression: brotli when the client accepts it and the optional
+`brotli` package is installed, gzip otherwise; bodies smaller than
+settings.RESPONSE_COMPRESSION_MIN_BYTES are sent as is. Every response
+carries exactly one Vary: Accept-Encoding, including small bodies and 304s,
+so caches keep the encodings apart.
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder
+
+try:
+    import brotli  # optional: br encoding
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int, **kwargs):
+        super().__init__(app, minimum_size, **kwargs)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        out = self._compressor.process(body)
+        return out + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6, brotli_quality: int = 4):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            send = _vary_on_encoding(send)
+        if scope["type"] == "http" and brotli is not None and "br" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality,
+                                        exclude_content_types=self.exclude_content_types)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _vary_on_encoding(send):
+    """Wrap `send` so the response start has Vary: Accept-Encoding once (Starlette only adds it when compressing)."""
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            vary = [v.strip() for v in headers.get("vary", "").split(",") if v.strip()]
+            if not any(v.lower() == "accept-encoding" for v in vary):
+                vary.append("Accept-Encoding")
+            headers["vary"] = ", ".join(dict.fromkeys(vary))
+        await send(message)
+    return wrapped
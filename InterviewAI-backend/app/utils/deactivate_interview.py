@@ -1,11 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import List
+from sqlalchemy import update
+from app.database import SessionLocal
 from app.models.content import Interview
+from app.services.history_and_scores import finalize_interview_scores
+from app.services.interview_jobs import cancel_jobs
+from app.services.session_store import evict_sessions
+from app.services.transcript_buffer import transcript_buffer
 from sqlalchemy.orm import Session
 
+# Finalizing can mean batched LLM scoring (settings.SCORING_DEFERRED), so it never
+# runs on the read paths that notice an expiry (status polls, /next, /answer, socket open).
+_finalizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interview-finalize")
+
+
+def _finalize(interview_ids: List[int]):
+    db = SessionLocal()
+    try:
+        finalize_interview_scores(interview_ids, db)
+    except Exception as e:
+        db.rollback()
+        print(f"Finalizing expired interviews {interview_ids} failed (the expiry sweeper retries): {e}")
+    finally:
+        db.close()
+    transcript_buffer.flush()
+
 
 def deactivate_if_expired(interview: Interview, db: Session):
-    """Helper: deactivate interview if it has expired"""
+    """Helper: deactivate interview if it has expired (scores are finalized in the background)"""
     if interview.is_active and interview.expires_at and datetime.utcnow() > interview.expires_at:
-        interview.is_active = False
+        # Conditional UPDATE: of concurrent requests (or the sweeper), only the one that
+        # flips the row hands it to the finalizer
+        claimed = db.execute(
+            update(Interview)
+            .where(Interview.id == interview.id, Interview.is_active.is_(True))
+            .values(is_active=False, ended_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
         db.commit()
+        cancel_jobs([interview.id])
+        evict_sessions([interview.id])
+        if claimed:
+            _finalizer.submit(_finalize, [interview.id])
         db.refresh(interview)
@@ -0,0 +1,139 @@
+# app/utils/google_certs.py
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import requests
+
+# requests and google-auth are imported on first use (cert fetch / sign-in), not
+# when the app boots: most workers never see a Google sign-in.
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+DEFAULT_MAX_AGE = 3600  # used when the key server sends no Cache-Control header
+MIN_REFRESH_DELAY = 30  # never hammer the key server, even with a tiny max-age
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: Optional[str], default: int = DEFAULT_MAX_AGE) -> int:
+    """Return the max-age (seconds) from a Cache-Control header, or `default`."""
+    if not cache_control:
+        return default
+    m = _MAX_AGE_RE.search(cache_control)
+    return int(m.group(1)) if m else default
+
+
+class _CachedResponse:
+    """Minimal google.auth.transport.Response backed by cached bytes."""
+
+    def __init__(self, data: bytes):
+        self.status = 200
+        self.headers = {"content-type": "application/json"}
+        self.data = data
+
+
+class GoogleCertCache:
+    """
+    Keeps Google's ID-token signing certificates in memory.
+
+    - Honors the key server's Cache-Control max-age.
+    - Uses one shared requests.Session (keep-alive to the key server),
+      created on the first fetch.
+    - Refreshes in a background thread `refresh_margin` seconds before expiry,
+      so sign-ins only pay for local signature verification.
+
+    `certs_url` can point at a local stand-in key server for tests.
+    """
+
+    def __init__(self, certs_url: str, refresh_margin: int = 300, session: Optional["requests.Session"] = None):
+        self.certs_url = certs_url
+        self.refresh_margin = refresh_margin
+        self._session = session
+        self._lock = threading.Lock()
+        self._data: Optional[bytes] = None
+        self._expires_at = 0.0
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    # -----------------
+    # Fetch / refresh
+    # -----------------
+    def _fetch(self) -> bytes:
+        resp = self.session.get(self.certs_url, timeout=10)
+        resp.raise_for_status()
+        max_age = parse_max_age(resp.headers.get("Cache-Control"))
+        self._data = resp.content
+        self._expires_at = time.monotonic() + max_age
+        self._schedule_refresh(max_age)
+        return self._data
+
+    def _schedule_refresh(self, max_age: int):
+        if self._timer:
+            self._timer.cancel()
+        delay = max(MIN_REFRESH_DELAY, max_age - self.refresh_margin)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            with self._lock:
+                self._fetch()
+        except Exception as e:
+            # Keep serving the old certs until they expire; retry shortly.
+            print(f"Google cert refresh failed: {e}")
+            self._schedule_refresh(MIN_REFRESH_DELAY + self.refresh_margin)
+
+    def get_raw(self) -> bytes:
+        """Cached certificate document, fetching synchronously only when missing or expired."""
+        data = self._data
+        if data is not None and time.monotonic() < self._expires_at:
+            return data
+        with self._lock:
+            if self._data is not None and time.monotonic() < self._expires_at:
+                return self._data
+            return self._fetch()
+
+    def invalidate(self):
+        with self._lock:
+            self._data = None
+            self._expires_at = 0.0
+
+    def close(self):
+        if self._timer:
+            self._timer.cancel()
+        if self._session is not None:
+            self._session.close()
+
+    # -----------------
+    # Verification
+    # -----------------
+    def __call__(self, url, method="GET", **kwargs):
+        """google.auth transport interface; only serves the cached cert document."""
+        return _CachedResponse(self.get_raw())
+
+    def verify(self, token: str, audience: Optional[str] = None) -> Dict:
+        """Same checks as id_token.verify_oauth2_token, against the cached certs."""
+        from google.auth import exceptions as google_exceptions
+        from google.oauth2 import id_token
+
+        id_info = id_token.verify_token(token, self, audience=audience, certs_url=self.certs_url)
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise google_exceptions.GoogleAuthError(f"Wrong issuer. 'iss' should be one of {GOOGLE_ISSUERS}")
+        return id_info
+
+
+google_cert_cache = GoogleCertCache(
+    settings.GOOGLE_CERTS_URL,
+    refresh_margin=settings.GOOGLE_CERTS_REFRESH_MARGIN_SECONDS,
+)
@@ -0,0 +1,96 @@
+# app/utils/json_stream.py
+import json
+from typing import Any, Callable, Optional
+
+
+class IncrementalJSONParser:
+    """
+    Find the first complete, valid JSON object (or array) in text that
+    arrives in chunks, e.g. a streamed LLM reply.
+
+    Brackets are matched as they arrive (string- and escape-aware), so the
+    value is available the moment its closing bracket is fed; callers can
+    stop streaming there instead of waiting for trailing prose. A candidate
+    that fails to parse or `validate` is dropped and scanning resumes after
+    its opening bracket, so stray braces in surrounding prose are skipped.
+    Unlike a greedy r"\{.*\}" this never spans two separate JSON values.
+    """
+
+    def __init__(self, kind: str = "object", validate: Optional[Callable[[Any], Any]] = None):
+        self.open, self.close = ("[", "]") if kind == "array" else ("{", "}")
+        self.validate = validate
+        self.value: Any = None
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._buf = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> bool:
+        """Add text; True once a valid value has been found (see .value)."""
+        if self.done or not chunk:
+            return self.done
+        self._buf += chunk
+        self._scan()
+        return self.done
+
+    def _reset(self, pos: int):
+        self._pos = pos
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _scan(self):
+        buf = self._buf
+        while self._pos < len(buf):
+            i = self._pos
+            self._pos += 1
+            if self._start is None:
+                if buf[i] == self.open:
+                    self._start, self._depth = i, 1
+                continue
+
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    start = self._start
+                    if self._accept(buf[start:i + 1]):
+                        return
+                    self._reset(start + 1)
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            value = json.loads(candidate)
+            if self.validate is not None:
+                value = self.validate(value)
+        except Exception as e:
+            self.error = e
+            return False
+        self.value = value
+        self.done = True
+        return True
+
+
+def parse_json_reply(text: str, kind: str = "object", validate: Optional[Callable[[Any], Any]] = None) -> Any:
+    """First valid JSON object/array in `text`; ValueError if there is none."""
+    parser = IncrementalJSONParser(kind, validate)
+    if not parser.feed(text):
+        raise ValueError(f"No valid JSON {kind} in reply" + (f": {parser.error}" if parser.error else ""))
+    return parser.value
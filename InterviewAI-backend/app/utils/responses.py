@@ -0,0 +1,110 @@
+# app/utils/responses.py
+"""
+JSON response helpers.
+
+  - OrjsonResponse: default response class for endpoints that return plain
+    dicts/lists (endpoints with a response_model are already serialized to
+    bytes by Pydantic, see main.py).
+  - model_response / fields=: sparse field selection, so clients can drop
+    large text fields (raw_text, jd_text, questions, ...) they don't need;
+    wants_field tells the query whether to load them at all.
+  - conditional_response: ETag / Last-Modified, 304 on If-None-Match
+    (or If-Modified-Since) for bodies from services/read_cache.py.
+"""
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import FrozenSet, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, create_model
+
+from app.services.read_cache import CachedBody
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return (e.g. 'id,title'), or fields to drop prefixed with '-' "
+                "(e.g. '-raw_text')",
+)
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Tuple[Optional[Set[str]], Optional[Set[str]]]:
+    """(include, exclude) for model_dump from a fields= value; 400 on unknown names."""
+    if not fields:
+        return None, None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [n.lstrip("-") for n in names if n.lstrip("-") not in schema.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    include = {n for n in names if not n.startswith("-")} or None
+    exclude = {n[1:] for n in names if n.startswith("-")} or None
+    return include, exclude
+
+
+def wants_field(schema: Type[BaseModel], fields: Optional[str], name: str) -> bool:
+    """Whether `name` survives the fields= selection, so a deferred column can be left unloaded."""
+    include, exclude = parse_fields(fields, schema)
+    return (include is None or name in include) and not (exclude and name in exclude)
+
+
+@lru_cache(maxsize=256)
+def _projection(schema: Type[BaseModel], keep: FrozenSet[str]) -> Type[BaseModel]:
+    """`schema` cut down to the `keep` fields, so validating from an ORM object only reads those attributes."""
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (f.annotation, f) for name, f in schema.model_fields.items() if name in keep},
+    )
+
+
+def model_json(schema: Type[BaseModel], obj, fields: Optional[str] = None) -> bytes:
+    include, exclude = parse_fields(fields, schema)
+    if include is not None or exclude is not None:
+        # Dropped fields are never read from `obj`: deferred columns and relationships stay unloaded
+        keep = frozenset(n for n in schema.model_fields
+                         if (include is None or n in include) and not (exclude and n in exclude))
+        schema = _projection(schema, keep)
+    return schema.model_validate(obj).model_dump_json().encode()
+
+
+def model_response(schema: Type[BaseModel], obj, fields: Optional[str] = None, status_code: int = 200) -> Response:
+    """Serialize `obj` through `schema` straight to JSON bytes, keeping only the requested fields."""
+    return Response(content=model_json(schema, obj, fields), media_type="application/json", status_code=status_code)
+
+
+def _not_modified(request: Request, entry: CachedBody) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since; weak comparison (RFC 9110 13.1.2)
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        return "*" in tags or entry.etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            return parsedate_to_datetime(entry.last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_response(request: Request, entry: CachedBody) -> Response:
+    """200 with the cached body, or 304 (no body) if the client's copy is current."""
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,177 @@
+# benchmarks/cold_start.py
+"""
+Cold-start profile and budget check for one app worker.
+
+Every run is a fresh interpreter, like a gunicorn worker being spawned:
+
+    import app.main  ->  startup events (TestClient lifespan)  ->  GET /
+
+It reports median/max import, startup and first-request times. It also runs
+one `python -X importtime` pass and shows where the import time goes: app
+modules by cumulative time, and third-party packages by their own time.
+
+It exits 1 when the median boot (import + startup) is over --budget-ms, or
+when a module that must load lazily (LAZY_MODULES) is already imported once
+app.main is. Meant for CI and for before/after comparisons:
+
+    cd InterviewAI-backend
+    python -m benchmarks.cold_start                      # report + default budget
+    python -m benchmarks.cold_start --runs 10 --budget-ms 1200 --top 25
+    python -m benchmarks.cold_start --json cold.json
+
+The database is a fresh SQLite file per run, so startup includes
+create_tables (DB_CREATE_TABLES_ON_STARTUP). Pass
+--env DB_CREATE_TABLES_ON_STARTUP=false to measure a worker whose schema is
+managed by Alembic.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Only the code paths that use these should import them (resume parsing, Judge0, Google sign-in)
+LAZY_MODULES = ["pdfplumber", "docx", "google.oauth2", "google.auth", "requests"]
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+loaded = sorted(m for m in {lazy!r} if m in sys.modules)
+from fastapi.testclient import TestClient
+t2 = time.perf_counter()
+with TestClient(app) as client:
+    t3 = time.perf_counter()
+    status = client.get("/").status_code
+    t4 = time.perf_counter()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "startup_ms": (t3 - t2) * 1000,
+                  "first_request_ms": (t4 - t3) * 1000, "status": status, "lazy_loaded": loaded}}))
+""".format(lazy=LAZY_MODULES)
+
+
+def worker_env(workdir: Path, extra):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{workdir / 'cold.db'}"
+    env["INTERVIEW_SWEEP_INTERVAL_SECONDS"] = "0"
+    env["PYTHONPATH"] = str(BACKEND_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    for key in ("OPENAI_API_KEY", "GEMINI_API_KEY", "ANTHROPIC_API_KEY"):
+        env.pop(key, None)
+    for item in extra:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def run_once(env, workdir: Path, importtime: bool = False):
+    """One fresh worker. Returns (timings dict, importtime stderr or None)."""
+    db = workdir / "cold.db"
+    if db.exists():
+        db.unlink()
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"worker failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = wall_ms
+    return timings, proc.stderr if importtime else None
+
+
+def parse_importtime(stderr: str):
+    """[(module, self_us, cumulative_us)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_profile(rows, top: int):
+    app_modules = sorted(((n, c) for n, _, c in rows if n == "app" or n.startswith("app.")),
+                         key=lambda r: -r[1])[:top]
+    packages = defaultdict(int)
+    for name, self_us, _ in rows:
+        if name != "app" and not name.startswith("app."):
+            packages[name.split(".")[0]] += self_us
+    third_party = sorted(packages.items(), key=lambda r: -r[1])[:top]
+    return {
+        "app_cumulative_ms": [(n, round(us / 1000, 1)) for n, us in app_modules],
+        "packages_self_ms": [(n, round(us / 1000, 1)) for n, us in third_party],
+    }
+
+
+def summarize(samples, key):
+    values = [s[key] for s in samples]
+    return {"median": round(statistics.median(values), 1), "max": round(max(values), 1)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh worker processes to time")
+    parser.add_argument("--budget-ms", type=float, default=1500.0,
+                        help="max median import + startup time; 0 disables the check")
+    parser.add_argument("--top", type=int, default=15, help="rows per import-time table")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the workers (repeatable)")
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="interview-cold-start-"))
+    env = worker_env(workdir, args.env)
+
+    run_once(env, workdir)  # warm the OS file cache and __pycache__ so runs are comparable
+    samples = [run_once(env, workdir)[0] for _ in range(args.runs)]
+    _, importtime = run_once(env, workdir, importtime=True)
+
+    for s in samples:
+        s["boot_ms"] = s["import_ms"] + s["startup_ms"]
+    report = {
+        "runs": args.runs,
+        "timings_ms": {key: summarize(samples, key)
+                       for key in ("import_ms", "startup_ms", "boot_ms", "first_request_ms", "process_ms")},
+        "lazy_loaded": sorted({m for s in samples for m in s["lazy_loaded"]}),
+        "import_profile": import_profile(parse_importtime(importtime), args.top),
+        "budget_ms": args.budget_ms or None,
+    }
+
+    print(f"cold start over {args.runs} fresh workers (median / max ms)")
+    for key, stats in report["timings_ms"].items():
+        print(f"  {key:<18} {stats['median']:>8.1f} / {stats['max']:.1f}")
+    print("\nslowest app modules (cumulative ms, one -X importtime run)")
+    for name, ms in report["import_profile"]["app_cumulative_ms"]:
+        print(f"  {ms:>8.1f}  {name}")
+    print("\nthird-party packages (own import time, ms)")
+    for name, ms in report["import_profile"]["packages_self_ms"]:
+        print(f"  {ms:>8.1f}  {name}")
+
+    failures = []
+    if report["lazy_loaded"]:
+        failures.append(f"imported at start-up but should load lazily: {', '.join(report['lazy_loaded'])}")
+    boot = report["timings_ms"]["boot_ms"]["median"]
+    if args.budget_ms and boot > args.budget_ms:
+        failures.append(f"median boot {boot:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    report["failures"] = failures
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+    print()
+    for f in failures:
+        print(f"FAIL: {f}")
+    if not failures:
+        print(f"OK: median boot {boot:.1f} ms" + (f" (budget {args.budget_ms:.0f} ms)" if args.budget_ms else ""))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
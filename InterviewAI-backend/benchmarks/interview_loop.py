@@ -0,0 +1,261 @@
+# benchmarks/interview_loop.py
+"""
+End-to-end load benchmark for the interview loop.
+
+Drives N simulated candidates concurrently through the whole flow against
+the in-process app (httpx ASGI transport, no network):
+
+    /resume/upload -> /job -> /interview/start -> (/answer + /next) x turns
+    -> /interview/{id}/end -> /history/{id}
+
+The LLM is the deterministic fake provider and code answers go to the local
+runner, so results measure our code, not provider variance. Output is JSON
+(per-endpoint p50/p95/p99, throughput, DB queries per call, peak RSS) meant
+to be diffed between commits:
+
+    cd InterviewAI-backend
+    python -m benchmarks.interview_loop --candidates 50 --turns 6 --out before.json
+    # ... change code ...
+    python -m benchmarks.interview_loop --candidates 50 --turns 6 --out after.json --compare before.json
+
+--cassette replays a recording of real provider traffic (CASSETTE_MODE=record,
+see app/services/cassette.py) instead of the fake LLM.
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_endpoint = contextvars.ContextVar("benchmark_endpoint", default=None)
+
+RESUME_TEXT = (
+    "Senior backend engineer. 6 years of Python, FastAPI and Django. Built event-driven "
+    "pipelines on Kafka and PostgreSQL, deployed on Kubernetes (AWS EKS). Led a team of 4, "
+    "cut p95 API latency by 40% with caching and query tuning. Some React and TypeScript.\n"
+) * 8
+JD_TEXT = (
+    "We are hiring a backend engineer to own our Python/FastAPI services. You will design "
+    "APIs, model data in PostgreSQL, run services on Kubernetes and mentor junior engineers. "
+    "Experience with Redis, observability (Prometheus) and CI/CD is a plus.\n"
+) * 4
+TEXT_ANSWER = (
+    "In my last role I owned the ingestion service. We had a p95 of 900ms, so I profiled it, "
+    "found N+1 queries in the ORM layer, batched them and added a Redis cache in front of the "
+    "hot reads. Latency dropped to 300ms and I wrote a runbook so the on-call could tune it."
+)
+CODE_ANSWER = "def first_unique(s):\n    from collections import Counter\n    c = Counter(s)\n    return next((ch for ch in s if c[ch] == 1), None)\nprint(first_unique('swiss'))\n"
+
+
+def configure_environment(args, workdir: Path):
+    """Must run before the app is imported: settings are read at import time."""
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["LLM_PROVIDER_CHAIN"] = "fake"
+    tiers = {"fast": "fake:fake-fast", "standard": "fake:fake-standard", "heavy": "fake:fake-heavy"}
+    os.environ["LLM_TIER_CHAINS"] = json.dumps(tiers)
+    os.environ["FAKE_LLM_LATENCY"] = args.llm_latency
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    if args.llm_histogram:
+        os.environ["FAKE_LLM_LATENCY_HISTOGRAM"] = str(Path(args.llm_histogram).resolve())
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.llm_error_rate)
+    os.environ["CODE_RUNNER_BACKEND"] = "local"
+    if args.cassette:
+        os.environ["CASSETTE_MODE"] = "replay"
+        os.environ["CASSETTE_PATH"] = str(Path(args.cassette).resolve())
+        os.environ["CASSETTE_REPLAY_TIMING"] = args.cassette_timing
+    os.environ["INTERVIEW_SWEEP_INTERVAL_SECONDS"] = "0"
+    for key in ("OPENAI_API_KEY", "GEMINI_API_KEY", "ANTHROPIC_API_KEY"):
+        os.environ.pop(key, None)
+    os.chdir(workdir)  # resume uploads land in ./uploads
+
+
+def percentile(samples, p):
+    if not samples:
+        return None
+    s = sorted(samples)
+    idx = min(len(s) - 1, max(0, int(round(p / 100.0 * (len(s) - 1)))))
+    return s[idx]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.queries = defaultdict(int)
+
+    def on_query(self, *args, **kwargs):
+        name = _endpoint.get()
+        if name:
+            self.queries[name] += 1
+
+    async def call(self, client, name, method, url, **kwargs):
+        _endpoint.set(name)
+        start = time.perf_counter()
+        try:
+            resp = await client.request(method, url, **kwargs)
+        finally:
+            self.latencies[name].append(time.perf_counter() - start)
+            _endpoint.set(None)
+        if resp.status_code >= 400:
+            self.errors[name] += 1
+            raise RuntimeError(f"{name} -> {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+
+
+async def run_candidate(client, rec: Recorder, idx: int, turns: int, mode: str):
+    resume = await rec.call(client, "POST /resume/upload", "POST", "/resume/upload",
+                            files={"file": (f"resume_{idx}.txt", RESUME_TEXT.encode())})
+    jd = await rec.call(client, "POST /job", "POST", "/job/",
+                        json={"title": "Backend Engineer", "jd_text": JD_TEXT})
+    interview = await rec.call(client, "POST /interview/start", "POST", "/interview/start",
+                               json={"resume_id": resume["id"], "job_description_id": jd["id"],
+                                     "timer_minutes": 30, "mode": mode})
+    iid = interview["id"]
+    question = interview["questions"][0]
+    q = {"question_id": question["id"], "qtype": question["qtype"]}
+
+    for _ in range(turns):
+        if q["qtype"] == "coding":
+            answer = {"question_id": q["question_id"], "is_coding": True, "code": CODE_ANSWER, "code_language": "python"}
+        else:
+            answer = {"question_id": q["question_id"], "user_text": TEXT_ANSWER}
+        await rec.call(client, "POST /interview/{id}/answer", "POST", f"/interview/{iid}/answer", json=answer)
+        q = await rec.call(client, "POST /interview/{id}/next", "POST", f"/interview/{iid}/next")
+
+    await rec.call(client, "POST /interview/{id}/end", "POST", f"/interview/{iid}/end")
+    await rec.call(client, "GET /history/{id}", "GET", f"/history/{iid}")
+
+
+async def run(args, app, rec: Recorder):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    limits = asyncio.Semaphore(args.concurrency)
+    failures = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            async with limits:
+                try:
+                    await run_candidate(client, rec, i, args.turns, args.mode)
+                except Exception as e:
+                    failures.append(str(e))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.candidates)))
+        wall = time.perf_counter() - start
+    return wall, failures
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def build_report(args, rec: Recorder, wall: float, failures):
+    endpoints = {}
+    total = 0
+    for name, samples in sorted(rec.latencies.items()):
+        total += len(samples)
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": rec.errors.get(name, 0),
+            "p50_ms": round(percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(percentile(samples, 95) * 1000, 3),
+            "p99_ms": round(percentile(samples, 99) * 1000, 3),
+            "db_queries_per_call": round(rec.queries.get(name, 0) / len(samples), 2),
+        }
+    return {
+        "commit": git_commit(),
+        "config": {
+            "candidates": args.candidates, "concurrency": args.concurrency, "turns": args.turns,
+            "mode": args.mode, "llm_latency": args.llm_latency, "llm_latency_ms": args.llm_latency_ms,
+            "llm_error_rate": args.llm_error_rate, "cassette": args.cassette,
+        },
+        "wall_seconds": round(wall, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / wall, 2) if wall else None,
+        "failed_candidates": len(failures),
+        "first_failures": failures[:5],
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        "endpoints": endpoints,
+    }
+
+
+def compare(report, baseline):
+    """Human-readable deltas against a previous report (stderr)."""
+    lines = [f"vs {baseline.get('commit')}: throughput {baseline.get('throughput_rps')} -> {report['throughput_rps']} rps"]
+    for name, cur in report["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if not old:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "db_queries_per_call"):
+            if old.get(key):
+                pct = (cur[key] - old[key]) / old[key] * 100
+                deltas.append(f"{key} {old[key]} -> {cur[key]} ({pct:+.1f}%)")
+        lines.append(f"  {name}: " + ", ".join(deltas))
+    print("\n".join(lines), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20, help="candidates in flight at once")
+    parser.add_argument("--turns", type=int, default=6, help="answer + next cycles per interview")
+    parser.add_argument("--mode", choices=["adaptive", "planned"], default="adaptive")
+    parser.add_argument("--llm-latency", choices=["fixed", "lognormal", "replay"], default="fixed")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-histogram", help="replay latencies from a [[le_seconds, cumulative_count], ...] file")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--cassette", help="replay LLM/Judge0 traffic from this cassette instead of the fake LLM")
+    parser.add_argument("--cassette-timing", choices=["original", "fast"], default="original")
+    parser.add_argument("--database-url", help="default: fresh SQLite file in a temp dir")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="previous JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    out_path = Path(args.out).resolve() if args.out else None
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    workdir = Path(tempfile.mkdtemp(prefix="interview-bench-"))
+    configure_environment(args, workdir)
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from sqlalchemy import event
+    from app.main import app
+    from app.database import create_tables, engine
+
+    create_tables()  # the ASGI transport doesn't run startup events
+
+    rec = Recorder()
+    event.listen(engine, "before_cursor_execute", rec.on_query)
+
+    wall, failures = asyncio.run(run(args, app, rec))
+    report = build_report(args, rec, wall, failures)
+
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if out_path:
+        out_path.write_text(payload + "\n")
+    else:
+        print(payload)
+    if baseline:
+        compare(report, baseline)
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
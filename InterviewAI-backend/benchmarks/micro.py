@@ -0,0 +1,318 @@
+# benchmarks/micro.py
+"""
+Microbenchmarks for the hot pure-CPU paths (pytest-benchmark style stats,
+no pytest needed):
+
+    parse_pdf / parse_docx / parse_file   generated resumes, 1-20 pages
+    calculate_scores / aggregate_scores   interviews with 5-200 answers
+    extract_json_object / extract_json_array
+                                          the JSON extraction used by
+                                          generate_next_question and
+                                          generate_questions_from_resume_and_jd
+    create_access_token / decode_token    jwt_handler
+
+Each case is calibrated so a round lasts at least --min-round-ms, then run
+for --max-time seconds (and at least --min-rounds rounds). Results can be
+saved as a named baseline and later runs compared against it:
+
+    cd InterviewAI-backend
+    python -m benchmarks.micro --save main
+    # ... change code ...
+    python -m benchmarks.micro --compare main            # table of median deltas
+    python -m benchmarks.micro --compare main -k parse_  # only matching cases
+
+Baselines live in benchmarks/baselines/<name>.json, with the commit, Python
+version and machine they were recorded on. They are machine specific, so
+compare runs from the same box. benchmarks/baselines/reference.json is a
+committed reference run (see its "machine" field): use it to sanity-check
+orders of magnitude, and save your own baseline for real before/after numbers.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+PAGES = (1, 2, 5, 10, 20)
+LINES_PER_PAGE = 48
+
+SKILLS = ["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Kafka", "Kubernetes", "AWS", "Docker",
+          "Terraform", "React", "TypeScript", "Go", "gRPC", "Airflow", "Spark", "Prometheus", "CI/CD"]
+VERBS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Owned", "Automated", "Scaled", "Shipped"]
+OBJECTS = ["the billing pipeline", "an event-driven ingestion service", "the public REST API",
+           "a multi-tenant search backend", "the on-call runbooks", "a feature-flag platform",
+           "the data warehouse ETL", "an internal SDK", "the auth service"]
+OUTCOMES = ["cutting p95 latency by {n}%", "serving {n}k requests per second", "saving ${n}k a year",
+            "reducing incidents by {n}%", "for {n} engineering teams", "with {n}% test coverage"]
+
+
+# ---------- corpus ----------
+def resume_lines(pages: int, seed: int = 0):
+    """Deterministic resume-like text, ~LINES_PER_PAGE lines per page."""
+    rng = random.Random(seed * 1000 + pages)
+    lines = ["Alex Candidate - Senior Software Engineer", "alex@example.com | +1 555 0100 | github.com/alex", ""]
+    job = 0
+    while len(lines) < pages * LINES_PER_PAGE:
+        job += 1
+        lines += ["", f"Company {job} - Software Engineer ({2024 - job} - {2025 - job})",
+                  "Skills: " + ", ".join(rng.sample(SKILLS, 6))]
+        for _ in range(rng.randint(4, 8)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, "
+                         + rng.choice(OUTCOMES).format(n=rng.randint(5, 90)))
+    return lines[: pages * LINES_PER_PAGE]
+
+
+def _pdf_escape(s: str) -> str:
+    return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace").decode("latin-1")
+
+
+def make_pdf(lines) -> bytes:
+    """Minimal text PDF (Helvetica, US Letter): enough for pdfplumber to lay out real pages."""
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 750 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in page]
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(lines) -> bytes:
+    import docx
+
+    doc = docx.Document()
+    for i, line in enumerate(lines):
+        if line:
+            doc.add_paragraph(line)
+        if i and i % LINES_PER_PAGE == 0:
+            doc.add_page_break()
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_interview(n_answers: int, seed: int = 0):
+    """Stand-in for an Interview with answers[].question.qtype / .score (what calculate_scores reads)."""
+    rng = random.Random(seed + n_answers)
+    answers = []
+    for _ in range(n_answers):
+        qtype = rng.choice(["resume", "behavioral", "coding"])
+        answers.append(SimpleNamespace(score=rng.choice([None] + list(range(11))),
+                                       question=SimpleNamespace(qtype=qtype)))
+    return SimpleNamespace(answers=answers)
+
+
+def llm_replies():
+    """Realistic replies: bare JSON, fenced JSON, and JSON wrapped in chatter."""
+    obj = {"qtype": "resume", "text": "Walk me through how you scaled the ingestion service past 10k rps.",
+           "extra": {"difficulty": "medium", "focus": ["Kafka", "PostgreSQL"]}}
+    arr = [{"qtype": q, "text": f"Question {i}: " + " ".join(OBJECTS), "extra": None, "ordinal": i}
+           for i, q in enumerate(["resume"] * 3 + ["behavioral"] * 2 + ["coding"] * 2)]
+    prose = "Sure! Here is the question you asked for, following the requested format.\n"
+    return {
+        "object_bare": json.dumps(obj),
+        "object_fenced": f"```json\n{json.dumps(obj, indent=2)}\n```",
+        "object_chatty": prose * 5 + json.dumps(obj, indent=2) + "\nLet me know if you need another one!",
+        "array_bare": json.dumps(arr),
+        "array_chatty": prose * 5 + "```json\n" + json.dumps(arr, indent=2) + "\n```\nGood luck with the interview.",
+    }
+
+
+# ---------- cases ----------
+def build_cases():
+    from app.services.parse_and_ai import parse_pdf, parse_docx, parse_file, extract_json_array
+    from app.services.question_generator import extract_json_object
+    from app.services.history_and_scores import calculate_scores
+    from app.services.scoring import aggregate_scores
+    from app.utils.jwt_handler import create_access_token, decode_token
+
+    cases = {}
+    for pages in PAGES:
+        lines = resume_lines(pages)
+        pdf, docx_bytes, txt = make_pdf(lines), make_docx(lines), "\n".join(lines).encode()
+        cases[f"parse_pdf[{pages}p]"] = lambda b=pdf: parse_pdf(b)
+        cases[f"parse_docx[{pages}p]"] = lambda b=docx_bytes: parse_docx(b)
+        cases[f"parse_file_txt[{pages}p]"] = lambda b=txt: parse_file("resume.txt", b)
+    cases["parse_file_pdf[5p]"] = lambda b=make_pdf(resume_lines(5)): parse_file("resume.pdf", b)
+
+    for n in (5, 20, 200):
+        interview = make_interview(n)
+        cases[f"calculate_scores[{n}]"] = lambda i=interview: calculate_scores(i, None)
+        by_type = {"resume": [], "behavioral": [], "coding": []}
+        for a in interview.answers:
+            by_type[a.question.qtype].append(a.score or 0)
+        cases[f"aggregate_scores[{n}]"] = lambda t=by_type: aggregate_scores(t["resume"], t["behavioral"], t["coding"])
+
+    for name, text in llm_replies().items():
+        fn = extract_json_array if name.startswith("array") else extract_json_object
+        cases[f"extract_json[{name}]"] = lambda f=fn, t=text: f(t)
+
+    claims = {"sub": "42", "email": "alex@example.com"}
+    token = create_access_token(claims)
+    cases["jwt_encode"] = lambda: create_access_token(claims)
+    cases["jwt_decode"] = lambda: decode_token(token)
+    return cases
+
+
+# ---------- runner ----------
+def measure(fn, min_rounds: int, max_time: float, min_round_s: float):
+    fn()  # warm-up
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_s or iterations >= 1 << 20:
+            break
+        iterations *= 2
+
+    samples = [elapsed / iterations]
+    deadline = time.perf_counter() + max_time
+    while len(samples) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - start) / iterations)
+
+    q = statistics.quantiles(samples, n=4) if len(samples) > 1 else [samples[0]] * 3
+    median = statistics.median(samples)
+    return {
+        "rounds": len(samples),
+        "iterations": iterations,
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "median": median,
+        "iqr": q[2] - q[0],
+        "ops": 1.0 / median if median else None,
+    }
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+def report(results, baseline=None, threshold: float = 10.0):
+    """Print a results table; with a baseline, add median deltas. Returns names that regressed."""
+    regressions = []
+    header = f"{'case':<34}{'median':>12}{'min':>12}{'stddev':>12}{'rounds':>8}"
+    if baseline:
+        header += f"{'baseline':>12}{'delta':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        row = f"{name:<34}{_fmt(r['median']):>12}{_fmt(r['min']):>12}{_fmt(r['stddev']):>12}{r['rounds']:>8}"
+        old = (baseline or {}).get(name)
+        if old:
+            pct = (r["median"] - old["median"]) / old["median"] * 100
+            flag = ""
+            if pct > threshold:
+                flag = " !"
+                regressions.append(name)
+            row += f"{_fmt(old['median']):>12}{pct:>+9.1f}%{flag}"
+        print(row)
+    if baseline:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {threshold:.0f}%")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def machine_info():
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", help="only run cases whose name contains this")
+    parser.add_argument("--min-rounds", type=int, default=5)
+    parser.add_argument("--max-time", type=float, default=1.0, help="seconds per case")
+    parser.add_argument("--min-round-ms", type=float, default=5.0)
+    parser.add_argument("--save", metavar="NAME", help="store results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baseline NAME (or a JSON path)")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold, percent")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any case regressed")
+    parser.add_argument("--json", help="also write raw results here")
+    args = parser.parse_args(argv)
+
+    # Nothing here touches the database, but importing the app creates an engine
+    os.environ["DATABASE_URL"] = "sqlite://"
+    sys.path.insert(0, str(BACKEND_DIR))
+    cases = build_cases()
+    if args.filter:
+        cases = {k: v for k, v in cases.items() if args.filter in k}
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = measure(fn, args.min_rounds, args.max_time, args.min_round_ms / 1000.0)
+
+    baseline = None
+    if args.compare:
+        path = Path(args.compare)
+        if not path.suffix:
+            path = BASELINE_DIR / f"{args.compare}.json"
+        saved = json.loads(path.read_text())
+        baseline = saved["results"]
+        if saved.get("machine") and saved["machine"] != machine_info():
+            print(f"note: baseline recorded on a different machine ({saved['machine'].get('platform')}, "
+                  f"{saved['machine'].get('cpu_count')} CPUs); deltas include hardware differences\n")
+    regressions = report(results, baseline, args.threshold)
+
+    payload = {"commit": git_commit(), "python": sys.version.split()[0], "machine": machine_info(),
+               "results": results}
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        (BASELINE_DIR / f"{args.save}.json").write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    if args.json:
+        Path(args.json).write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    return 1 if args.fail_on_regression and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
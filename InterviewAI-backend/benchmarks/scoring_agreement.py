@@ -0,0 +1,119 @@
+# benchmarks/scoring_agreement.py
+"""
+Agreement report: local (hashed n-gram) scores vs LLM scores.
+
+Runs the local scorer over answered text questions in the database and
+compares it with LLM scores, overall and per local decision (too_short,
+off_topic, matches_reference, borderline). The rows that matter when tuning
+settings.SCORING_LOCAL_* are the settled ones: their error is what tiered
+scoring costs, and their share is what it saves.
+
+    cd InterviewAI-backend
+    python -m benchmarks.scoring_agreement                  # vs stored Answer.score
+    python -m benchmarks.scoring_agreement --source llm     # re-score with the LLM now
+    python -m benchmarks.scoring_agreement --low-relevance 0.06 --min-words 10
+
+Stored scores are only a fair reference for answers scored with
+SCORING_MODE=llm (or borderline ones); --source llm re-asks the LLM.
+"""
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def summarize(pairs):
+    errors = [loc - ref for loc, ref in pairs]
+    if not errors:
+        return {"n": 0}
+    abs_err = [abs(e) for e in errors]
+    return {
+        "n": len(errors),
+        "mae": round(statistics.fmean(abs_err), 3),
+        "bias": round(statistics.fmean(errors), 3),  # > 0: local scores higher than the LLM
+        "exact": round(sum(e == 0 for e in abs_err) / len(errors), 3),
+        "within_1": round(sum(e <= 1 for e in abs_err) / len(errors), 3),
+        "within_2": round(sum(e <= 2 for e in abs_err) / len(errors), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["stored", "llm"], default="stored", help="reference scores")
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--min-words", type=int, help="override SCORING_LOCAL_MIN_WORDS")
+    parser.add_argument("--low-relevance", type=float, help="override SCORING_LOCAL_LOW_RELEVANCE")
+    parser.add_argument("--high-similarity", type=float, help="override SCORING_LOCAL_HIGH_SIMILARITY")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app.config import settings
+    from app.database import SessionLocal
+    from app.models.content import Answer, Question, Interview, Resume, JobDescription
+    from app.models.interview_session import extra_references
+    from app.services.local_scoring import local_score
+    from app.services.scoring import score_with_llm
+
+    for flag, name in (("min_words", "SCORING_LOCAL_MIN_WORDS"), ("low_relevance", "SCORING_LOCAL_LOW_RELEVANCE"),
+                       ("high_similarity", "SCORING_LOCAL_HIGH_SIMILARITY")):
+        if getattr(args, flag) is not None:
+            setattr(settings, name, getattr(args, flag))
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Question.text, Question.qtype, Question.extra, Answer.user_text, Answer.score,
+                     Resume.raw_text, JobDescription.jd_text)
+            .join(Answer, Answer.question_id == Question.id)
+            .join(Interview, Interview.id == Answer.interview_id)
+            .outerjoin(Resume, Resume.id == Interview.resume_id)
+            .outerjoin(JobDescription, JobDescription.id == Interview.job_description_id)
+            .filter(Answer.is_coding.isnot(True), Question.qtype != "coding")
+            .order_by(Answer.id.desc())
+            .limit(args.limit)
+            .all()
+        )
+    finally:
+        db.close()
+
+    by_reason = defaultdict(list)
+    for r in rows:
+        local = local_score(r.text, r.user_text or "", profile=f"{r.raw_text or ''}\n{r.jd_text or ''}",
+                            references=extra_references(r.extra))
+        if args.source == "llm":
+            ref = score_with_llm(r.text, r.user_text or "", qtype=r.qtype, fallback=False)
+        else:
+            ref = r.score
+        if ref is not None:
+            by_reason[local.reason].append((local.score, int(ref)))
+
+    all_pairs = [p for pairs in by_reason.values() for p in pairs]
+    settled = [p for reason, pairs in by_reason.items() if reason != "borderline" for p in pairs]
+    report = {
+        "source": args.source,
+        "thresholds": {
+            "min_words": settings.SCORING_LOCAL_MIN_WORDS,
+            "low_relevance": settings.SCORING_LOCAL_LOW_RELEVANCE,
+            "high_similarity": settings.SCORING_LOCAL_HIGH_SIMILARITY,
+        },
+        "answers": len(all_pairs),
+        "settled_locally_share": round(len(settled) / len(all_pairs), 3) if all_pairs else None,
+        "overall": summarize(all_pairs),
+        "settled": summarize(settled),
+        "by_reason": {reason: summarize(pairs) for reason, pairs in sorted(by_reason.items())},
+    }
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,6 @@
-from app.database import Base, engine
-from app.models import user  
-from app.models import content
+from app.database import create_tables
 
 
 print("Creating tables...")
-Base.metadata.create_all(bind=engine)
+create_tables()
 print("Done ✅")